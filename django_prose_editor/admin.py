@@ -0,0 +1,104 @@
+import re
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext, gettext_lazy as _
+
+from django_prose_editor.fields import ProseEditorField
+from django_prose_editor.replace import find_and_replace
+
+
+class FindAndReplaceForm(forms.Form):
+    find = forms.CharField(label=_("Find"), strip=False)
+    replace = forms.CharField(label=_("Replace with"), strip=False, required=False)
+    mode = forms.ChoiceField(
+        label=_("Search in"),
+        choices=[
+            ("all", _("Text and attributes")),
+            ("text", _("Text only")),
+            ("attributes", _("Attributes only")),
+        ],
+    )
+    regex = forms.BooleanField(label=_("Regular expression"), required=False)
+    ignore_case = forms.BooleanField(label=_("Ignore case"), required=False)
+    dry_run = forms.BooleanField(
+        label=_("Dry run"),
+        required=False,
+        initial=True,
+        help_text=_("Only count the matches without saving anything."),
+    )
+
+    def clean(self):
+        data = super().clean()
+        if data.get("regex") and data.get("find"):
+            try:
+                re.compile(data["find"])
+            except re.error as exc:
+                self.add_error("find", str(exc))
+        return data
+
+
+def find_and_replace_action(fields=None, *, description=None):
+    """
+    Return an admin action which replaces text or attribute values in the
+    prose editor fields of the selected objects
+
+    ``fields`` is an optional list of field names, all ``ProseEditorField``
+    fields of the model are used by default. The action asks for the search
+    string and the replacement on an intermediate page and supports dry runs.
+    Rows are processed in the current process.
+    """
+
+    @admin.action(
+        description=description or _("Find and replace in prose fields"),
+        permissions=["change"],
+    )
+    def find_and_replace_in_prose_fields(modeladmin, request, queryset):
+        model = modeladmin.model._meta.concrete_model
+        prose_fields = [
+            (model, field)
+            for field in model._meta.concrete_fields
+            if isinstance(field, ProseEditorField)
+            and (fields is None or field.name in fields)
+        ]
+        form = FindAndReplaceForm(request.POST if "apply" in request.POST else None)
+        if form.is_valid():
+            data = form.cleaned_data
+            stats = find_and_replace(
+                data["find"],
+                data["replace"],
+                fields=prose_fields,
+                queryset=queryset,
+                dry_run=data["dry_run"],
+                workers=0,
+                mode=data["mode"],
+                regex=data["regex"],
+                ignore_case=data["ignore_case"],
+            )
+            for path, field_stats in stats.items():
+                modeladmin.message_user(
+                    request,
+                    (gettext("Dry run: %s: %s") if data["dry_run"] else "%s: %s")
+                    % (path, field_stats),
+                    messages.INFO if data["dry_run"] else messages.SUCCESS,
+                )
+            return None
+
+        return TemplateResponse(
+            request,
+            "django_prose_editor/admin/find_and_replace.html",
+            {
+                **modeladmin.admin_site.each_context(request),
+                "title": _("Find and replace"),
+                "opts": modeladmin.model._meta,
+                "form": form,
+                "queryset": queryset,
+                "fields": [field.verbose_name for _model, field in prose_fields],
+                "action": request.POST.get("action"),
+                "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+            },
+        )
+
+    return find_and_replace_in_prose_fields
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class DjangoProseEditorConfig(AppConfig):
@@ -7,3 +8,14 @@ class DjangoProseEditorConfig(AppConfig):
     def ready(self):
         # Import system checks
         from . import checks  # noqa: F401, PLC0415
+
+        # Templates may render the importmap before any widget media has been
+        # used, the entries have to be registered early in this case.
+        if any(
+            "js_asset.context_processors.importmap"
+            in engine.get("OPTIONS", {}).get("context_processors", ())
+            for engine in settings.TEMPLATES
+        ):
+            from .widgets import register_importmap  # noqa: PLC0415
+
+            register_importmap()
@@ -0,0 +1,258 @@
+"""
+Content-addressed storage for prose editor content.
+
+Fields using blob storage store the content in a separate table keyed by the
+SHA-256 hash of the content and only keep a reference to the blob in their
+own column. Identical content is stored only once; blobs are reference
+counted and removed when they aren't referenced anymore.
+
+Usage::
+
+    class Article(models.Model):
+        content = ProseEditorField(
+            extensions={...},
+            sanitize=True,
+            blobs="app.ProseBlob",
+        )
+
+    class ProseBlob(AbstractProseBlob):
+        pass
+
+Model instances load blobs lazily when the field is accessed for the first
+time. Blobs are cached per process; since blobs are immutable the cache never
+contains stale data. References to blobs which don't exist raise
+:class:`MissingBlobError` instead of silently returning empty content.
+"""
+
+import hashlib
+import re
+
+from django.apps import apps
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.query_utils import DeferredAttribute
+from django.utils.translation import gettext_lazy as _
+
+from django_prose_editor.caching import LRUCache
+
+
+#: Process-wide cache of blob contents by hash, limited to 1000 blobs and
+#: 32 million characters in total.
+blob_cache = LRUCache(1000, max_length=32_000_000)
+
+_reference_re = re.compile(r"^sha256:([0-9a-f]{64})$")
+
+
+class MissingBlobError(LookupError):
+    """Raised when a referenced blob doesn't exist (anymore)."""
+
+
+class AbstractProseBlob(models.Model):
+    """Base class for blob models."""
+
+    hash = models.CharField(_("hash"), max_length=64, primary_key=True)
+    content = models.TextField(_("content"))
+    refcount = models.PositiveIntegerField(_("reference count"), default=0)
+
+    class Meta:
+        abstract = True
+        verbose_name = _("blob")
+        verbose_name_plural = _("blobs")
+
+    def __str__(self):
+        return self.hash
+
+
+def content_hash(content):
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def blob_hash(value):
+    """Return the hash if ``value`` is a blob reference, ``None`` otherwise."""
+    if isinstance(value, str) and (match := _reference_re.match(value)):
+        return match[1]
+    return None
+
+
+def _blob_model(blob_model):
+    return apps.get_model(blob_model) if isinstance(blob_model, str) else blob_model
+
+
+def load_blobs(blob_model, hashes):
+    """
+    Return a dictionary mapping hashes to contents using the cache
+
+    Hashes of blobs which don't exist are missing from the dictionary, see
+    :func:`load_blob` and :func:`resolve`.
+    """
+    result = {}
+    missing = []
+    for hash in dict.fromkeys(hashes):
+        if (content := blob_cache.get(hash)) is None:
+            missing.append(hash)
+        else:
+            result[hash] = content
+    if missing:
+        rows = (
+            _blob_model(blob_model)
+            ._default_manager.filter(hash__in=missing)
+            .values_list("hash", "content")
+        )
+        for hash, content in rows:
+            blob_cache.set(hash, content)
+            result[hash] = content
+    return result
+
+
+def _missing(blob_model, hash):
+    return MissingBlobError(
+        f"The blob {hash} referenced by {_blob_model(blob_model)._meta.label}"
+        " doesn't exist. Was it deleted using QuerySet.delete() or"
+        " rebuild_refcounts() while still in use?"
+    )
+
+
+def load_blob(blob_model, hash):
+    """Return the content of a single blob or raise :class:`MissingBlobError`."""
+    try:
+        return load_blobs(blob_model, [hash])[hash]
+    except KeyError:
+        raise _missing(blob_model, hash) from None
+
+
+def resolve(blob_model, values):
+    """
+    Replace blob references in the list of ``values`` with their contents
+
+    Useful for values fetched using ``values()`` or ``values_list()`` which
+    return the references stored in the database. Raises
+    :class:`MissingBlobError` if a referenced blob doesn't exist.
+    """
+    blobs = load_blobs(blob_model, filter(None, map(blob_hash, values)))
+    result = []
+    for value in values:
+        if (hash := blob_hash(value)) is None:
+            result.append(value)
+        elif hash in blobs:
+            result.append(blobs[hash])
+        else:
+            raise _missing(blob_model, hash)
+    return result
+
+
+def store(blob_model, content):
+    """
+    Store ``content`` if it isn't stored yet and return the reference which
+    is saved in the field's column
+
+    The reference count isn't changed, use :func:`acquire` for this.
+    """
+    hash = content_hash(content)
+    manager = _blob_model(blob_model)._default_manager
+    if blob_cache.get(hash) is None and not manager.filter(hash=hash).exists():
+        try:
+            with transaction.atomic(using=manager.db):
+                manager.create(hash=hash, content=content)
+        except IntegrityError:
+            pass  # Created concurrently
+    blob_cache.set(hash, content)
+    return f"sha256:{hash}"
+
+
+def acquire(blob_model, content):
+    """
+    Increment the reference count of the blob containing ``content``,
+    creating the blob if necessary
+    """
+    hash = content_hash(content)
+    manager = _blob_model(blob_model)._default_manager
+    with transaction.atomic(using=manager.db):
+        if not manager.filter(hash=hash).update(refcount=F("refcount") + 1):
+            try:
+                with transaction.atomic(using=manager.db):
+                    manager.create(hash=hash, content=content, refcount=1)
+            except IntegrityError:
+                # Created concurrently
+                manager.filter(hash=hash).update(refcount=F("refcount") + 1)
+    blob_cache.set(hash, content)
+
+
+def release(blob_model, hash):
+    """Decrement the reference count of a blob and delete unused blobs."""
+    manager = _blob_model(blob_model)._default_manager
+    with transaction.atomic(using=manager.db):
+        manager.filter(hash=hash, refcount__gt=0).update(refcount=F("refcount") - 1)
+        manager.filter(hash=hash, refcount=0).delete()
+
+
+def rebuild_refcounts(blob_model):
+    """
+    Recalculate the reference counts of all blobs and delete unused blobs
+
+    Reference counts are maintained when saving and deleting model instances.
+    Run this after bypassing ``save()`` and ``delete()``, e.g. when using
+    ``QuerySet.update()``, ``bulk_create()`` or ``QuerySet.delete()``.
+    """
+    from django_prose_editor.fields import prose_editor_fields  # noqa: PLC0415
+
+    blob_model = _blob_model(blob_model)
+    counts = {}
+    for model, field in prose_editor_fields():
+        if not field.blobs or _blob_model(field.blobs) is not blob_model:
+            continue
+        for value in model._default_manager.values_list(
+            field.attname, flat=True
+        ).iterator():
+            if hash := blob_hash(value):
+                counts[hash] = counts.get(hash, 0) + 1
+
+    manager = blob_model._default_manager
+    with transaction.atomic(using=manager.db):
+        for blob in manager.only("hash", "refcount").iterator():
+            if blob.hash not in counts:
+                blob.delete()
+            elif blob.refcount != counts[blob.hash]:
+                manager.filter(hash=blob.hash).update(refcount=counts[blob.hash])
+
+
+class _StoredReference(str):
+    # A reference loaded from the database. Strings assigned to the field
+    # are always content, even if they look like references.
+    __slots__ = ()
+
+
+def from_db_value(value):
+    """Mark blob references loaded from the database as such."""
+    return _StoredReference(value) if blob_hash(value) else value
+
+
+class _Reference:
+    # A not yet loaded blob
+    __slots__ = ("hash",)
+
+    def __init__(self, hash):
+        self.hash = hash
+
+
+class BlobDescriptor(DeferredAttribute):
+    """
+    Loads the blob referenced by the database column when the attribute is
+    accessed for the first time
+    """
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, _Reference):
+            value = load_blob(self.field.blobs, value.hash)
+            if self.field.content_class:
+                value = self.field.content_class(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        if isinstance(value, _StoredReference):
+            hash = blob_hash(value)
+            # Remember the stored reference so that it can be released later
+            instance.__dict__.setdefault("_prose_blobs", {})[self.field.attname] = hash
+            value = _Reference(hash)
+        instance.__dict__[self.field.attname] = value
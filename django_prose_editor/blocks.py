@@ -0,0 +1,53 @@
+"""
+Splitting of prose editor HTML into top-level blocks.
+"""
+
+import re
+
+
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+
+_tag_re = re.compile(
+    r"""<!--.*?-->|<(/?)([a-zA-Z][^\s/>]*)[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>""",
+    re.DOTALL,
+)
+
+
+def iter_blocks(html):
+    """
+    Yield the top-level blocks of the HTML, e.g. paragraphs, headings, lists
+    or tables
+
+    Joining the yielded strings returns the original HTML. Text and inline
+    elements at the top level are attached to the following block.
+    """
+    depth = 0
+    start = 0
+    for match in _tag_re.finditer(html):
+        closing, tag = match.groups()
+        if tag is None:
+            continue
+        if closing:
+            depth = max(depth - 1, 0)
+        elif tag.lower() not in VOID_ELEMENTS and not match[0].endswith("/>"):
+            depth += 1
+            continue
+        if depth == 0:
+            yield html[start : match.end()]
+            start = match.end()
+    if start < len(html):
+        yield html[start:]
@@ -0,0 +1,140 @@
+"""
+Caching of sanitization results.
+
+Results are keyed by a hash of the input HTML combined with a fingerprint of
+the sanitizer configuration. The cache consists of an in-process LRU tier and
+an optional tier using one of Django's cache backends so that results are
+shared between processes and servers.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+#: Default options, may be overridden using the
+#: ``DJANGO_PROSE_EDITOR_SANITIZE_CACHE`` setting.
+DEFAULT_OPTIONS = {
+    # Number of results kept in the in-process LRU cache, 0 to disable
+    "maxsize": 1000,
+    # Alias of a Django cache backend, None to disable
+    "backend": None,
+    # Timeout for the Django cache backend
+    "timeout": 3600,
+    # Documents larger than this (in characters) aren't cached
+    "max_length": 100_000,
+}
+
+
+def fingerprint(*parts):
+    """
+    Return a stable hash of the passed configuration parts
+
+    Sets are sorted so that the fingerprint doesn't depend on the iteration
+    order of sets. Functions and classes are represented by their qualified
+    name, other objects such as transforms by their class and their instance
+    attributes so that the fingerprint is the same in all processes.
+    """
+
+    def default(obj):
+        if isinstance(obj, set | frozenset):
+            return sorted(obj)
+        if isinstance(obj, type) or callable(obj) and hasattr(obj, "__qualname__"):
+            return f"{obj.__module__}.{obj.__qualname__}"
+        if hasattr(obj, "__dict__"):
+            cls = type(obj)
+            return [f"{cls.__module__}.{cls.__qualname__}", vars(obj)]
+        return repr(obj)
+
+    data = json.dumps(parts, default=default, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+class LRUCache:
+    """
+    A small thread-safe least recently used cache
+
+    ``maxsize`` limits the number of entries. ``max_length`` optionally limits
+    the total ``len()`` of the cached values as well, values longer than
+    ``max_length`` aren't cached at all.
+    """
+
+    def __init__(self, maxsize, *, max_length=None):
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self.length = 0
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            try:
+                self.data.move_to_end(key)
+            except KeyError:
+                return None
+            return self.data[key]
+
+    def set(self, key, value):
+        if self.max_length is None:
+            with self.lock:
+                self.data[key] = value
+                self.data.move_to_end(key)
+                while len(self.data) > self.maxsize:
+                    self.data.popitem(last=False)
+            return
+
+        length = len(value)
+        with self.lock:
+            if (previous := self.data.pop(key, None)) is not None:
+                self.length -= len(previous)
+            if length > self.max_length:
+                return
+            self.data[key] = value
+            self.length += length
+            while len(self.data) > self.maxsize or self.length > self.max_length:
+                self.length -= len(self.data.popitem(last=False)[1])
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.length = 0
+
+
+def cached_sanitizer(sanitize, config_fingerprint, options=None):
+    """
+    Wrap a sanitizer function with a cache
+
+    ``options`` is a dictionary containing a subset of the keys of
+    ``DEFAULT_OPTIONS``.
+    """
+    options = DEFAULT_OPTIONS | (options or {})
+    lru = LRUCache(options["maxsize"]) if options["maxsize"] else None
+    alias = options["backend"]
+    max_length = options["max_length"]
+    prefix = f"django-prose-editor:sanitize:{config_fingerprint}:"
+
+    def sanitize_cached(html):
+        if not html or len(html) > max_length:
+            return sanitize(html)
+
+        key = prefix + hashlib.sha256(html.encode()).hexdigest()
+        if lru and (result := lru.get(key)) is not None:
+            return result
+
+        if alias:
+            from django.core.cache import caches  # noqa: PLC0415
+
+            backend = caches[alias]
+            if (result := backend.get(key)) is None:
+                result = sanitize(html)
+                backend.set(key, result, options["timeout"])
+        else:
+            result = sanitize(html)
+
+        if lru:
+            lru.set(key, result)
+        return result
+
+    sanitize_cached.cache = lru
+    return sanitize_cached
@@ -0,0 +1,104 @@
+"""
+Static translation catalogs for the editor's JavaScript strings.
+
+The catalogs are generated from ``locale/*/LC_MESSAGES/djangojs.mo`` using
+the ``prose_compile_js_catalogs`` management command and shipped as static
+files, so editor pages don't need Django's ``JavaScriptCatalog`` view. The
+widget media contains the catalog for the active language.
+"""
+
+import json
+import struct
+from functools import cache
+from pathlib import Path
+
+from django.utils.translation import to_language
+
+
+LOCALE_DIR = Path(__file__).parent / "locale"
+CATALOG_DIR = Path(__file__).parent / "static" / "django_prose_editor" / "locale"
+
+_MO_MAGIC = 0x950412DE
+
+_TEMPLATE = """\
+// Generated by ./manage.py prose_compile_js_catalogs, do not edit.
+Object.assign((window.djangoProseEditorCatalog ||= {}), %s)
+"""
+
+
+def render_catalog(path):
+    """
+    Return the JavaScript source of the catalog for the ``djangojs.mo`` file
+    at ``path``
+
+    Only singular messages without a context are included since the editor
+    doesn't use plural forms or contexts.
+    """
+    catalog = {
+        msgid: msgstr
+        for msgid, msgstr in read_messages(path)
+        if msgid and msgstr and "\0" not in msgid and "\x04" not in msgid
+    }
+    return _TEMPLATE % json.dumps(catalog, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def read_messages(path):
+    """
+    Return the list of ``(msgid, msgstr)`` tuples of the UTF-8 encoded GNU
+    ``.mo`` file at ``path``
+
+    Plural forms are returned as stored: ``msgid`` and ``msgstr`` contain all
+    forms separated by NUL characters, a context is separated from
+    ``msgid`` by EOT.
+    """
+    data = Path(path).read_bytes()
+    for order in "<>":
+        if len(data) >= 20 and struct.unpack_from(f"{order}I", data)[0] == _MO_MAGIC:
+            break
+    else:
+        raise ValueError(f"{path} isn't a .mo file")
+
+    _revision, count, msgids, msgstrs = struct.unpack_from(f"{order}4I", data, 4)
+    messages = []
+    for index in range(count):
+        strings = []
+        for table in (msgids, msgstrs):
+            length, offset = struct.unpack_from(f"{order}2I", data, table + 8 * index)
+            strings.append(data[offset : offset + length].decode())
+        messages.append(tuple(strings))
+    return messages
+
+
+def compile_catalogs(locale_dir=LOCALE_DIR, catalog_dir=CATALOG_DIR):
+    """
+    Write the catalogs for all locales in ``locale_dir`` to ``catalog_dir``
+    and return the list of written paths
+    """
+    catalog_dir = Path(catalog_dir)
+    catalog_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for mo in sorted(Path(locale_dir).glob("*/LC_MESSAGES/djangojs.mo")):
+        path = catalog_dir / f"{to_language(mo.parents[1].name)}.js"
+        path.write_text(render_catalog(mo), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+@cache
+def _available_catalogs():
+    return {path.stem for path in CATALOG_DIR.glob("*.js")}
+
+
+def catalog_path(language):
+    """
+    Return the static path of the catalog for ``language`` (falling back to
+    the generic language for ``de-ch`` and friends) or ``None``
+    """
+    if not language:
+        return None
+    language = language.lower()
+    available = _available_catalogs()
+    for code in (language, language.split("-")[0]):
+        if code in available:
+            return f"django_prose_editor/locale/{code}.js"
+    return None
@@ -1,8 +1,10 @@
 from django.apps import apps
 from django.conf import settings
 from django.core.checks import Error, Warning, register
+from django.db import models
 
 from django_prose_editor.fields import ProseEditorField, _actually_empty
+from django_prose_editor.sanitizers import configured_backend
 
 
 @register()
@@ -237,3 +239,83 @@ def check_sanitization_enabled(app_configs, **kwargs):
                     )
 
     return warnings
+
+
+@register()
+def check_sanitizer_backend(app_configs, **kwargs):
+    """
+    Check that the configured sanitizer backend is safe for untrusted input.
+    """
+    try:
+        backend = configured_backend()
+    except ImportError:
+        # Reported when the backend is used
+        return []
+    if backend and not backend.untrusted_input:
+        return [
+            Warning(
+                f"The sanitizer backend {backend.name!r} isn't safe for"
+                " untrusted input.",
+                hint=(
+                    "Its output may be parsed differently by browsers. Only use"
+                    " it if all content is trusted, otherwise use nh3."
+                ),
+                obj=settings,
+                id="django_prose_editor.W005",
+            )
+        ]
+    return []
+
+
+@register()
+def check_revision_constraints(app_configs, **kwargs):
+    """
+    Check that revision models have a unique constraint on the revision number.
+    """
+    from django_prose_editor.revisions import AbstractProseRevision  # noqa: PLC0415
+
+    errors = []
+
+    # Get models to check based on provided app_configs or all models
+    models_to_check = []
+    if app_configs:
+        for app_config in app_configs:
+            models_to_check.extend(app_config.get_models())
+    else:
+        models_to_check = apps.get_models()
+
+    for model in models_to_check:
+        if not issubclass(model, AbstractProseRevision) or model._meta.proxy:
+            continue
+        parents = [
+            field
+            for field in model._meta.concrete_fields
+            if isinstance(field, models.ForeignKey)
+        ]
+        if len(parents) != 1:
+            # Reported when revisions are recorded
+            continue
+        fields = {parents[0].name, "field_name", "number"}
+        if not any(
+            isinstance(constraint, models.UniqueConstraint)
+            and constraint.condition is None
+            and set(constraint.fields) == fields
+            for constraint in model._meta.constraints
+        ) and not any(
+            set(fields_) == fields for fields_ in model._meta.unique_together
+        ):
+            errors.append(
+                Error(
+                    "This revision model doesn't have a unique constraint on"
+                    f" {parents[0].name!r}, 'field_name' and 'number'.",
+                    hint=(
+                        "Concurrent saves may otherwise store two revisions with"
+                        " the same number. Add a UniqueConstraint to the model's"
+                        " Meta.constraints."
+                    ),
+                    obj=model,
+                    id="django_prose_editor.E010",
+                )
+            )
+
+    return errors
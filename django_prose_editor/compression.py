@@ -0,0 +1,136 @@
+"""
+Compressed submission of large prose field values.
+
+When compression is enabled for a field the editor compresses values longer
+than ``threshold`` characters using the browser's ``CompressionStream`` when
+the form is submitted and sends them as a ``data:`` URL containing the
+gzipped HTML. The form field decompresses them again, refusing values which
+are larger than ``max_size`` bytes once decompressed and values which would
+make the total size of all values decompressed from the same request exceed
+``max_request_size`` bytes.
+
+Enable compression per field using ``compress=True`` (or a dictionary of
+options) or for all fields using the ``DJANGO_PROSE_EDITOR_COMPRESS``
+setting.
+"""
+
+import base64
+import binascii
+import zlib
+from contextlib import suppress
+
+from django.conf import settings
+
+
+#: Default options, may be overridden using the ``DJANGO_PROSE_EDITOR_COMPRESS``
+#: setting or the ``compress`` argument of the fields.
+DEFAULT_OPTIONS = {
+    # Values shorter than this (in characters) are submitted as-is
+    "threshold": 64 * 1024,
+    # Maximum size of a decompressed value in bytes
+    "max_size": 10 * 1024 * 1024,
+    # Maximum total size of all values decompressed from one request in bytes
+    "max_request_size": 32 * 1024 * 1024,
+}
+
+#: Prefix of compressed values
+PREFIX = "data:application/gzip;base64,"
+
+
+class ContentTooLargeError(ValueError):
+    pass
+
+
+class RequestTooLargeError(ContentTooLargeError):
+    """The total size of the values decompressed from a request is too large"""
+
+
+class UndecompressedValue(str):
+    """
+    A submitted compressed value which couldn't be decompressed by the
+    widget, ``error`` is the exception raised by :func:`decompress`
+    """
+
+    def __new__(cls, value, error):
+        instance = super().__new__(cls, value)
+        instance.error = error
+        return instance
+
+
+def compression_options(argument=None):
+    """
+    Return the compression options for the ``compress`` argument of a field
+    or ``None`` if compression is disabled
+
+    ``None`` uses the ``DJANGO_PROSE_EDITOR_COMPRESS`` setting.
+    """
+    if argument is None:
+        argument = getattr(settings, "DJANGO_PROSE_EDITOR_COMPRESS", False)
+    if not argument:
+        return None
+    return DEFAULT_OPTIONS | ({} if argument is True else argument)
+
+
+def is_compressed(value):
+    return isinstance(value, str) and value.startswith(PREFIX)
+
+
+def decompress(value, *, max_size=DEFAULT_OPTIONS["max_size"]):
+    """
+    Return the HTML contained in a compressed value
+
+    The data is inflated incrementally so that no more than ``max_size``
+    bytes are ever produced. Raises ``ContentTooLargeError`` if the value is
+    larger and ``ValueError`` if the value cannot be decoded.
+    """
+    html = _inflate(value, max_size)
+    try:
+        return html.decode()
+    except UnicodeDecodeError as exc:
+        raise ValueError(f"Invalid UTF-8 data: {exc}") from exc
+
+
+def decompress_submitted(data, value, options):
+    """
+    Return the HTML contained in the compressed ``value`` submitted in
+    ``data`` (usually ``request.POST``) using the compression ``options``
+
+    The decompressed sizes are added up on ``data`` so that the total size
+    of all values decompressed from the same request stays below
+    ``max_request_size``. Dictionaries which don't support attributes are
+    only limited per value.
+    """
+    used = getattr(data, "_prose_editor_decompressed", 0)
+    max_size = min(options["max_size"], options["max_request_size"] - used)
+    try:
+        html = _inflate(value, max(max_size, 0))
+    except ContentTooLargeError as exc:
+        if max_size < options["max_size"]:
+            raise RequestTooLargeError(
+                f"The decompressed values exceed {options['max_request_size']} bytes"
+            ) from exc
+        raise
+    with suppress(AttributeError):
+        data._prose_editor_decompressed = used + len(html)
+    try:
+        return html.decode()
+    except UnicodeDecodeError as exc:
+        raise ValueError(f"Invalid UTF-8 data: {exc}") from exc
+
+
+def _inflate(value, max_size):
+    try:
+        data = base64.b64decode(value.removeprefix(PREFIX), validate=True)
+    except binascii.Error as exc:
+        raise ValueError(f"Invalid base64 data: {exc}") from exc
+
+    inflater = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        html = inflater.decompress(data, max_size + 1)
+    except zlib.error as exc:
+        raise ValueError(f"Invalid gzip data: {exc}") from exc
+    if len(html) > max_size or inflater.unconsumed_tail:
+        raise ContentTooLargeError(f"The decompressed value exceeds {max_size} bytes")
+    if not inflater.eof:
+        raise ValueError("Truncated gzip data")
+    return html
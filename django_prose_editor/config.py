@@ -12,6 +12,82 @@ from django.conf import settings
 from django.utils.module_loading import import_string
 
 
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} objects are immutable")
+
+
+class FrozenConfig(dict):
+    """
+    An immutable dictionary
+
+    Configurations are shared between all copies of form fields and widgets
+    (Django copies them for every form instance), so they must not be
+    changed after creating the field. Copying returns the same object.
+    """
+
+    __slots__ = ("_hash",)
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(self.items()))
+            return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list):
+    """An immutable list, see :class:`FrozenConfig`"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+
+def freeze_config(config):
+    """
+    Return an immutable copy of the configuration with all nested
+    dictionaries and lists frozen
+
+    Already frozen configurations are returned as-is.
+    """
+    if isinstance(config, FrozenConfig | FrozenList):
+        return config
+    if isinstance(config, dict):
+        return FrozenConfig(
+            {key: freeze_config(value) for key, value in config.items()}
+        )
+    if isinstance(config, list):
+        return FrozenList(freeze_config(value) for value in config)
+    if isinstance(config, tuple):
+        return tuple(freeze_config(value) for value in config)
+    return config
+
+
 def add_tags_and_attributes(shared_config, tags, attributes):
     # Add tags to the config
     shared_config["tags"].update(tags)
@@ -101,7 +177,18 @@ def process_figure(config, shared_config):
     # Prepare tags and attributes
     tags = ["figure", "figcaption", "img"]
     attributes = {
-        "img": ["src", "alt", "width", "height"],
+        "img": [
+            "src",
+            "alt",
+            "width",
+            "height",
+            # Responsive images, see django_prose_editor.images.ResponsiveImages.
+            # srcset isn't allowed since it contains URLs which aren't checked
+            # like src; it is generated when rendering.
+            "sizes",
+            "loading",
+            "decoding",
+        ],
         "figure": ["class"],
     }
 
@@ -114,7 +201,18 @@ def process_image(config, shared_config):
     # Prepare tags and attributes
     tags = ["img"]
     attributes = {
-        "img": ["src", "alt", "width", "height"],
+        "img": [
+            "src",
+            "alt",
+            "width",
+            "height",
+            # Responsive images, see django_prose_editor.images.ResponsiveImages.
+            # srcset isn't allowed since it contains URLs which aren't checked
+            # like src; it is generated when rendering.
+            "sizes",
+            "loading",
+            "decoding",
+        ],
     }
 
     # Add tags and attributes to the shared config
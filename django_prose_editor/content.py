@@ -0,0 +1,72 @@
+"""
+String values of ``ProseEditorField`` with lazily derived data.
+
+Pass ``content_class=True`` (or a subclass of :class:`ProseContent`) to
+``ProseEditorField`` and values loaded from the database are
+:class:`ProseContent` instances instead of plain strings::
+
+    article.content.text
+    article.content.excerpt(20)
+    article.content.outline
+    article.content.word_count
+    article.content.links
+"""
+
+from functools import cached_property
+
+from django.utils.text import Truncator
+
+from django_prose_editor.stats import parse_content
+
+
+class ProseContent(str):
+    """
+    A string containing the HTML of a prose field
+
+    The text, outline, word count and links are computed when they are
+    accessed for the first time using a single parse of the HTML and cached
+    on the instance. Instances can be used wherever a string is expected;
+    string operations return plain strings.
+    """
+
+    # No weak reference slot; the instance dictionary holding the cached
+    # values is only allocated when the first property is accessed.
+    __slots__ = ("__dict__",)
+
+    def __reduce__(self):
+        # Don't pickle the cached values
+        return (type(self), (str(self),))
+
+    @cached_property
+    def _parsed(self):
+        return parse_content(self)
+
+    @cached_property
+    def text(self):
+        """The whitespace-normalized text content"""
+        return " ".join("".join(self._parsed.parts).split())
+
+    @cached_property
+    def word_count(self):
+        return len(self.text.split())
+
+    @cached_property
+    def outline(self):
+        """A list of ``(level, text)`` tuples of all headings"""
+        return self._parsed.headings
+
+    @cached_property
+    def links(self):
+        """A list of the targets of all links"""
+        return self._parsed.links
+
+    @cached_property
+    def _excerpts(self):
+        return {}
+
+    def excerpt(self, words=10, truncate=" ..."):
+        """Return the first ``words`` words of the text"""
+        key = (words, truncate)
+        if key not in self._excerpts:
+            self._excerpts[key] = Truncator(self.text).words(words, truncate=truncate)
+        return self._excerpts[key]
@@ -0,0 +1,84 @@
+"""
+Streaming export of prose content, e.g. for search indexers.
+
+Rows are fetched in chunks using ``QuerySet.iterator()`` and the HTML is
+converted to plain text (and optionally an outline of headings) in a pool of
+worker processes. At most two chunks are in flight at any time, so memory
+usage doesn't depend on the size of the tables.
+"""
+
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from django_prose_editor.fields import prose_editor_fields
+from django_prose_editor.stats import parse_content
+
+
+def convert(html, *, outline=False):
+    """
+    Return a dictionary containing the ``text`` and optionally the
+    ``outline`` (a list of ``{"level": ..., "text": ...}`` dictionaries) of
+    the HTML
+    """
+    parser = parse_content(html)
+    row = {"text": " ".join("".join(parser.parts).split())}
+    if outline:
+        row["outline"] = [
+            {"level": level, "text": text} for level, text in parser.headings
+        ]
+    return row
+
+
+def _convert_chunk(chunk, outline):
+    return [convert(html, outline=outline) for _pk, html in chunk]
+
+
+def export_rows(labels=(), *, outline=False, chunk_size=500, workers=None):
+    """
+    Yield a dictionary for every non-empty ``ProseEditorField`` value
+
+    The dictionaries contain the ``model`` label, the ``pk``, the ``field``
+    name, the ``html``, the ``text`` and the ``outline`` if ``outline`` is
+    true. ``workers`` is the number of worker processes; the default uses one
+    per CPU, ``0`` converts the HTML in the current process.
+    """
+    pool = (
+        ProcessPoolExecutor(workers)
+        if workers is None or workers > 0
+        else nullcontext()
+    )
+    with pool as executor:
+        for model, field in prose_editor_fields(labels):
+            info = {"model": model._meta.label, "field": field.name}
+
+            # Convert the next chunk while the current chunk is being yielded
+            pending = deque()
+            for chunk in field.iter_values(chunk_size=chunk_size):
+                pending.append(
+                    (chunk, executor.submit(_convert_chunk, chunk, outline))
+                    if executor
+                    else (chunk, None)
+                )
+                if len(pending) > 1:
+                    yield from _rows(info, *pending.popleft(), outline)
+            while pending:
+                yield from _rows(info, *pending.popleft(), outline)
+
+
+def _rows(info, chunk, future, outline):
+    converted = future.result() if future else _convert_chunk(chunk, outline)
+    for (pk, html), row in zip(chunk, converted, strict=True):
+        yield info | {"pk": pk, "html": html} | row
+
+
+def export_jsonl(labels=(), **kwargs):
+    """
+    Yield the rows of :func:`export_rows` as lines of JSON
+
+    The lines can be written to a file or used as the content of a
+    ``StreamingHttpResponse``.
+    """
+    for row in export_rows(labels, **kwargs):
+        yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
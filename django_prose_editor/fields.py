@@ -1,16 +1,36 @@
 import re
+from itertools import islice
 
 from django import forms
-from django.contrib.admin import widgets
+from django.conf import settings
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.utils.html import strip_tags
 from django.utils.text import Truncator
-
+from django.utils.translation import gettext_lazy as _
+
+from django_prose_editor.caching import cached_sanitizer, fingerprint
+from django_prose_editor.compression import (
+    ContentTooLargeError,
+    RequestTooLargeError,
+    UndecompressedValue,
+    compression_options,
+    decompress,
+    is_compressed,
+)
 from django_prose_editor.config import (
     allowlist_from_extensions,
     expand_extensions,
+    freeze_config,
 )
-from django_prose_editor.widgets import AdminProseEditorWidget, ProseEditorWidget
+from django_prose_editor.content import ProseContent
+from django_prose_editor.images import add_image_dimensions
+from django_prose_editor.profiling import measure
+from django_prose_editor.sanitizers import get_backend
+from django_prose_editor.stats import content_statistics
+from django_prose_editor.transforms import TransformPipeline
 
 
 def _actually_empty(x):
@@ -29,19 +49,70 @@ def _identity(x):
     return x
 
 
-def create_sanitizer(extensions):
-    """Create a sanitizer function based on extension configuration."""
-    try:
-        import nh3  # noqa: PLC0415
-    except ImportError:
-        raise ImportError(
-            "You need to install nh3 to use automatic sanitization. "
-            "Install django-prose-editor[sanitize] or pip install nh3"
-        )
+_BLOCK_TAGS = (
+    "blockquote|div|figcaption|figure|h[1-6]|hr|li|ol|p|pre|table|tbody|td|th"
+    "|thead|tr|ul"
+)
+_canonical_res = [
+    # Whitespace after closing block tags
+    (re.compile(rf"(</(?:{_BLOCK_TAGS})>)\s+"), r"\1"),
+    # Whitespace between a tag and an opening or closing block tag (except
+    # when closing preformatted text)
+    (re.compile(rf"(>)\s+(?=<(?!/pre)/?(?:{_BLOCK_TAGS})[\s/>])"), r"\1"),
+    # Self-closing void elements
+    (re.compile(r"<(br|hr|img)([^>]*?)\s*/>"), r"<\1\2>"),
+]
+
+
+def _canonical(html):
+    """
+    Return a canonical representation of the HTML which is only used to
+    detect changes
+
+    This is a cheap normalization which ignores differences which are
+    introduced by re-serializing the HTML in the editor and by submitting
+    textareas (line endings, non-breaking spaces, insignificant whitespace
+    between blocks, self-closing tags, empty paragraphs).
+    """
+    html = (html or "").replace("\r\n", "\n").replace("\xa0", "&nbsp;").strip()
+    for regex, replacement in _canonical_res:
+        html = regex.sub(replacement, html)
+    return _actually_empty(html)
+
+
+def create_sanitizer(extensions, *, transforms=None, cache=None):
+    """
+    Create a sanitizer function based on extension configuration.
 
-    nh3_kwargs = allowlist_from_extensions(expand_extensions(extensions))
-    cleaner = nh3.Cleaner(**nh3_kwargs)
-    return lambda html: _actually_empty(cleaner.clean(html))
+    ``transforms`` is an optional list of
+    :class:`~django_prose_editor.transforms.Transform` instances which are
+    applied to the sanitized HTML.
+
+    ``cache`` enables caching of sanitization results. Pass ``True`` to use
+    the defaults or a dictionary of options, see
+    :mod:`django_prose_editor.caching`. The default is taken from the
+    ``DJANGO_PROSE_EDITOR_SANITIZE_CACHE`` setting.
+
+    The HTML is cleaned using nh3 or the configured backend, see
+    :mod:`django_prose_editor.sanitizers`.
+    """
+    allowlist = allowlist_from_extensions(expand_extensions(extensions))
+    backend = get_backend(allowlist)
+    cleaner = backend(allowlist)
+    pipeline = TransformPipeline(transforms or ())
+
+    def sanitize(html):
+        return pipeline(_actually_empty(cleaner(html)))
+
+    if cache is None:
+        cache = getattr(settings, "DJANGO_PROSE_EDITOR_SANITIZE_CACHE", False)
+    if cache:
+        return cached_sanitizer(
+            sanitize,
+            fingerprint(backend.name, backend.version(), allowlist, transforms),
+            None if cache is True else cache,
+        )
+    return sanitize
 
 
 def _create_sanitizer(argument, config):
@@ -83,12 +154,39 @@ class ProseEditorField(models.TextField):
         config: Dictionary mapping extension names to their configuration
         preset: Optional JavaScript preset name to override the default
         sanitize: Whether to enable sanitization or a custom sanitizer function
+        stats_field: Optional name of a ``JSONField`` on the same model which
+            receives the content statistics whenever the value is saved
+        transforms: Optional list of transforms applied after sanitization
+        revisions: Optional revision model (or its label) which receives a new
+            revision whenever the content changes, see
+            :mod:`django_prose_editor.revisions`
+        image_dimensions: Add missing ``width`` and ``height`` attributes to
+            images when saving. ``True`` uses the default storage, a string
+            the storage with this alias
+        blobs: Optional blob model (or its label) which stores the content
+            while the column only contains a reference, see
+            :mod:`django_prose_editor.blobs`
+        compress: Compress large values in the browser when submitting the
+            form, ``True`` or a dictionary of options, see
+            :mod:`django_prose_editor.compression`
+        content_class: Return values loaded from the database as
+            :class:`~django_prose_editor.content.ProseContent` instances
+            (``True``) or instances of the given subclass
     """
 
     def __init__(self, *args, **kwargs):
-        self.config = kwargs.pop("config", {})
+        config = kwargs.pop("config", {})
+        self.stats_field = kwargs.pop("stats_field", None)
+        self.revisions = kwargs.pop("revisions", None)
+        self.image_dimensions = kwargs.pop("image_dimensions", False)
+        self.blobs = kwargs.pop("blobs", None)
+        self.compress = kwargs.pop("compress", None)
+        content_class = kwargs.pop("content_class", None)
+        self.content_class = ProseContent if content_class is True else content_class
+        self.transform = TransformPipeline(kwargs.pop("transforms", ()))
         if extensions := kwargs.pop("extensions", None):
-            self.config["extensions"] = extensions
+            config = config | {"extensions": extensions}
+        self.config = freeze_config(config)
 
         if "extensions" in self.config:
             # Normal mode
@@ -105,12 +203,165 @@ class ProseEditorField(models.TextField):
         super().__init__(*args, **kwargs)
 
     def clean(self, value, instance):
-        return self.sanitize(super().clean(value, instance))
+        value = super().clean(value, instance)
+        with measure("sanitize"):
+            return self.transform(self.sanitize(value))
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if self.image_dimensions and value:
+            value = add_image_dimensions(value, storage=self._image_storage())
+            setattr(model_instance, self.attname, value)
+        if self.stats_field:
+            setattr(model_instance, self.stats_field, content_statistics(value))
+        if self.blobs:
+            return self._store_blob(model_instance, value)
+        return value
+
+    def _store_blob(self, model_instance, value):
+        # Returns the reference stored in the column. Reference counts are
+        # updated in the post_save handler because pre_save may be called
+        # more than once per save.
+        from django_prose_editor import blobs  # noqa: PLC0415
+
+        hash = blobs.content_hash(value) if value else None
+        model_instance.__dict__.setdefault("_prose_blobs_pending", {})[self.attname] = (
+            hash,
+            value,
+        )
+        if not hash:
+            return value
+        if hash != model_instance.__dict__.get("_prose_blobs", {}).get(self.attname):
+            blobs.store(self.blobs, value)
+        return f"sha256:{hash}"
+
+    def _update_blob_references(self, instance, created, **kwargs):
+        from django_prose_editor import blobs  # noqa: PLC0415
+
+        pending = instance.__dict__.get("_prose_blobs_pending", {})
+        if (entry := pending.pop(self.attname, None)) is None:
+            return  # The field hasn't been saved
+        hash, value = entry
+        stored = instance.__dict__.setdefault("_prose_blobs", {})
+        previous = None if created else stored.get(self.attname)
+        if hash != previous:
+            if hash:
+                blobs.acquire(self.blobs, value)
+            if previous:
+                blobs.release(self.blobs, previous)
+        stored[self.attname] = hash
+
+    def _release_blob(self, instance, **kwargs):
+        from django_prose_editor import blobs  # noqa: PLC0415
+
+        stored = instance.__dict__.get("_prose_blobs", {})
+        if previous := stored.pop(self.attname, None):
+            blobs.release(self.blobs, previous)
+
+    def iter_values(self, queryset=None, *, chunk_size=500):
+        """
+        Yield lists of up to ``chunk_size`` ``(pk, value)`` tuples for all
+        non-empty values of this field, ordered by primary key
+
+        Blob references are replaced by their content.
+        """
+        if queryset is None:
+            queryset = self.model._default_manager.all()
+        rows = (
+            queryset.exclude(**{self.attname: ""})
+            .exclude(**{f"{self.attname}__isnull": True})
+            .order_by("pk")
+            .values_list("pk", self.attname)
+            .iterator(chunk_size=chunk_size)
+        )
+        while chunk := list(islice(rows, chunk_size)):
+            pks, values = zip(*chunk, strict=True)
+            yield list(zip(pks, self.resolve_values(list(values)), strict=True))
+
+    def resolve_values(self, values):
+        """
+        Return the list of ``values`` fetched using ``values()`` or
+        ``values_list()`` with blob references replaced by their content
+        """
+        if not self.blobs:
+            return values
+        from django_prose_editor import blobs  # noqa: PLC0415
+
+        return blobs.resolve(self.blobs, values)
+
+    def get_db_converters(self, connection):
+        converters = super().get_db_converters(connection)
+        if self.content_class and not self.blobs:
+            # Blobs are wrapped by the descriptor when they are loaded
+            converters.append(self._to_content)
+        elif self.blobs:
+            converters.append(self._to_reference)
+        return converters
+
+    def _to_reference(self, value, expression, connection):
+        from django_prose_editor import blobs  # noqa: PLC0415
+
+        return blobs.from_db_value(value)
+
+    def _to_content(self, value, expression, connection):
+        return value if value is None else self.content_class(value)
+
+    def _image_storage(self):
+        if isinstance(self.image_dimensions, str):
+            from django.core.files.storage import storages  # noqa: PLC0415
+
+            return storages[self.image_dimensions]
+        return None
+
+    def check(self, **kwargs):
+        return [*super().check(**kwargs), *self._check_stats_field()]
+
+    def _check_stats_field(self):
+        if not self.stats_field:
+            return []
+        try:
+            field = self.model._meta.get_field(self.stats_field)
+        except FieldDoesNotExist:
+            field = None
+        if not isinstance(field, models.JSONField):
+            return [
+                checks.Error(
+                    f"The stats_field '{self.stats_field}' must refer to a JSONField on the same model.",
+                    hint="Add a JSONField(null=True, editable=False) to the model or remove the stats_field argument.",
+                    obj=self,
+                    id="django_prose_editor.E009",
+                )
+            ]
+        return []
 
     def contribute_to_class(self, cls, name, **kwargs):
         """Add a ``get_*_excerpt`` method to models which returns a
         de-HTML-ified excerpt of the contents of this field"""
+        if self.blobs:
+            from django_prose_editor.blobs import BlobDescriptor  # noqa: PLC0415
+
+            self.descriptor_class = BlobDescriptor
         super().contribute_to_class(cls, name, **kwargs)
+        if self.blobs and not cls._meta.abstract:
+            post_save.connect(
+                self._update_blob_references,
+                sender=cls,
+                weak=False,
+                dispatch_uid=f"django_prose_editor.blobs.save.{cls._meta.label}.{name}",
+            )
+            post_delete.connect(
+                self._release_blob,
+                sender=cls,
+                weak=False,
+                dispatch_uid=f"django_prose_editor.blobs.delete.{cls._meta.label}.{name}",
+            )
+        if self.revisions and not cls._meta.abstract:
+            post_save.connect(
+                self._record_revision,
+                sender=cls,
+                weak=False,
+                dispatch_uid=f"django_prose_editor.revisions.{cls._meta.label}.{name}",
+            )
         setattr(
             cls,
             f"get_{name}_excerpt",
@@ -119,6 +370,12 @@ class ProseEditorField(models.TextField):
             ).words(words, truncate=truncate),
         )
 
+    def _record_revision(self, instance, **kwargs):
+        if not kwargs.get("raw"):
+            from django_prose_editor.revisions import record_revision  # noqa: PLC0415
+
+            record_revision(instance, self.attname, self.revisions)
+
     def deconstruct(self):
         name, _path, args, kwargs = super().deconstruct()
         return (name, "django.db.models.TextField", args, kwargs)
@@ -128,6 +385,7 @@ class ProseEditorField(models.TextField):
             "config": self.config,
             "form_class": ProseEditorFormField,
             "preset": self.preset,
+            "compress": self.compress,
         } | kwargs
         return super().formfield(**defaults)
 
@@ -140,13 +398,40 @@ def _is(widget, widget_class):
     )
 
 
+class _DefaultWidget:
+    """
+    Return the ``ProseEditorWidget`` class when accessed
+
+    The widgets module (and the admin's widgets module) are imported when the
+    first form field is instantiated and not when importing this module.
+    """
+
+    def __get__(self, instance, owner):
+        from django_prose_editor.widgets import ProseEditorWidget  # noqa: PLC0415
+
+        return ProseEditorWidget
+
+
 class ProseEditorFormField(forms.CharField):
-    widget = ProseEditorWidget
+    widget = _DefaultWidget()
+    default_error_messages = {  # noqa: RUF012
+        "compressed": _("The submitted content could not be decompressed."),
+        "too_large": _(
+            "The submitted content is too large (more than %(max_size)s bytes)."
+        ),
+        "request_too_large": _(
+            "The submitted contents are too large in total (more than"
+            " %(max_size)s bytes)."
+        ),
+    }
 
     def __init__(self, *args, **kwargs):
-        self.config = kwargs.pop("config", {})
+        config = kwargs.pop("config", {})
+        self.compress = compression_options(kwargs.pop("compress", None))
+        self.transform = TransformPipeline(kwargs.pop("transforms", ()))
         if extensions := kwargs.pop("extensions", None):
-            self.config["extensions"] = extensions
+            config = config | {"extensions": extensions}
+        self.config = freeze_config(config)
 
         if "extensions" in self.config:
             # Normal mode
@@ -160,12 +445,19 @@ class ProseEditorFormField(forms.CharField):
             self.sanitize = kwargs.pop("sanitize", _identity)
             self.preset = kwargs.pop("preset", "default")
 
+        from django.contrib.admin.widgets import AdminTextareaWidget  # noqa: PLC0415
+
+        from django_prose_editor.widgets import (  # noqa: PLC0415
+            AdminProseEditorWidget,
+            ProseEditorWidget,
+        )
+
         widget = kwargs.get("widget")
 
         # We don't know if widget is set, and if it is, we do not know if it is
         # a class or an instance of the widget. The following if statement
         # should take all possibilities into account.
-        if widget and _is(widget, widgets.AdminTextareaWidget):
+        if widget and _is(widget, AdminTextareaWidget):
             kwargs["widget"] = AdminProseEditorWidget
         elif not widget or not _is(widget, ProseEditorWidget):
             kwargs["widget"] = ProseEditorWidget
@@ -173,6 +465,72 @@ class ProseEditorFormField(forms.CharField):
         super().__init__(*args, **kwargs)
         self.widget.config = self.config
         self.widget.preset = self.preset
+        self.widget.compress = self.compress
+
+    def to_python(self, value):
+        if self.compress and is_compressed(value):
+            # Values the widget couldn't decompress or which have been
+            # submitted using other widgets
+            try:
+                if isinstance(value, UndecompressedValue):
+                    raise value.error
+                value = decompress(value, max_size=self.compress["max_size"])
+            except RequestTooLargeError as exc:
+                raise ValidationError(
+                    self.error_messages["request_too_large"],
+                    code="request_too_large",
+                    params={"max_size": self.compress["max_request_size"]},
+                ) from exc
+            except ContentTooLargeError as exc:
+                raise ValidationError(
+                    self.error_messages["too_large"],
+                    code="too_large",
+                    params={"max_size": self.compress["max_size"]},
+                ) from exc
+            except ValueError as exc:
+                raise ValidationError(
+                    self.error_messages["compressed"], code="compressed"
+                ) from exc
+        return super().to_python(value)
 
     def clean(self, value):
-        return self.sanitize(super().clean(value))
+        value = super().clean(value)
+        with measure("sanitize"):
+            return self.transform(self.sanitize(value))
+
+    def has_changed(self, initial, data):
+        if self.disabled:
+            return False
+        return _canonical(initial) != _canonical(data)
+
+
+def prose_editor_fields(labels=()):
+    """
+    Return a list of ``(model, field)`` tuples for all ``ProseEditorField``
+    instances of concrete models
+
+    ``labels`` optionally restricts the models to the given app labels or
+    ``app_label.ModelName`` model labels. Unknown labels raise ``LookupError``.
+    """
+    from django.apps import apps  # noqa: PLC0415
+
+    if labels:
+        models_to_check = {}
+        for label in labels:
+            if "." in label:
+                model = apps.get_model(label)
+                models_to_check[model] = None
+            else:
+                models_to_check.update(
+                    dict.fromkeys(apps.get_app_config(label).get_models())
+                )
+    else:
+        models_to_check = apps.get_models()
+
+    return [
+        (model, field)
+        for model in models_to_check
+        if not model._meta.proxy
+        for field in model._meta.concrete_fields
+        if isinstance(field, ProseEditorField)
+    ]
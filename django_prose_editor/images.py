@@ -0,0 +1,340 @@
+"""
+Intrinsic image dimensions for prose editor content.
+
+Images without ``width`` and ``height`` attributes cause layout shifts when
+the page is rendered. :func:`add_image_dimensions` resolves the ``src`` of
+those images against a storage, reads only the header of the image files to
+determine their dimensions and adds the missing attributes.
+
+PNG, GIF, JPEG and WebP images are supported. Other files (SVGs, external
+URLs etc.) are left alone.
+"""
+
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
+
+from django.core.exceptions import SuspiciousOperation
+
+from django_prose_editor.caching import LRUCache
+from django_prose_editor.transforms import Transform, TransformPipeline
+
+
+#: Maximum number of threads used for reading image headers.
+MAX_WORKERS = 8
+
+#: Dimensions by storage and URL. Unknown dimensions aren't cached since the
+#: file may be uploaded or fixed later.
+dimensions_cache = LRUCache(10_000)
+
+# JPEG start of frame markers (excluding DHT, JPG and DAC)
+_SOF_MARKERS = {*range(0xC0, 0xD0)} - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_orientation(segment):
+    # Returns the EXIF orientation stored in an APP1 segment or None
+    if segment[:6] != b"Exif\0\0":
+        return None
+    tiff = segment[6:]
+    endian = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if endian is None or len(tiff) < 8:
+        return None
+    offset = struct.unpack(f"{endian}I", tiff[4:8])[0]
+    if len(tiff) < offset + 2:
+        return None
+    count = struct.unpack(f"{endian}H", tiff[offset : offset + 2])[0]
+    for i in range(count):
+        entry = tiff[offset + 2 + i * 12 : offset + 14 + i * 12]
+        if len(entry) < 12:
+            break
+        tag, _type, _count, value = struct.unpack(f"{endian}HHIH", entry[:10])
+        if tag == 0x0112:
+            return value
+    return None
+
+
+def _jpeg_size(fp):
+    orientation = None
+    while True:
+        byte = fp.read(1)
+        while byte == b"\xff":
+            byte = fp.read(1)  # Fill bytes
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in {0x01, *range(0xD0, 0xD9)}:
+            continue  # Markers without segment
+        length = fp.read(2)
+        if len(length) < 2:
+            return None
+        segment = fp.read(struct.unpack(">H", length)[0] - 2)
+        if marker in _SOF_MARKERS:
+            if len(segment) < 5:
+                return None
+            height, width = struct.unpack(">HH", segment[1:5])
+            # Orientations 5-8 rotate the image by 90 degrees
+            if orientation in {5, 6, 7, 8}:
+                width, height = height, width
+            return width, height
+        if marker == 0xE1 and orientation is None:
+            orientation = _jpeg_orientation(segment)
+        # Skip to the next marker
+        if fp.read(1) != b"\xff":
+            return None
+
+
+class _Prefixed:
+    # A file-like object returning the already read bytes first
+    def __init__(self, prefix, fp):
+        self.prefix = prefix
+        self.fp = fp
+
+    def read(self, size):
+        data, self.prefix = self.prefix[:size], self.prefix[size:]
+        if len(data) < size:
+            data += self.fp.read(size - len(data))
+        return data
+
+
+def read_image_size(fp):
+    """
+    Return the ``(width, height)`` of the image in the binary file object
+    ``fp`` or ``None`` if the format isn't recognized
+
+    Only the header of the file is read.
+    """
+    head = fp.read(30)
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+        return struct.unpack(">II", head[16:24])
+    if head[:6] in {b"GIF87a", b"GIF89a"}:
+        return struct.unpack("<HH", head[6:10])
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        chunk = head[12:16]
+        if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+            width, height = struct.unpack("<HH", head[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L" and head[20:21] == b"\x2f":
+            bits = int.from_bytes(head[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return (
+                int.from_bytes(head[24:27], "little") + 1,
+                int.from_bytes(head[27:30], "little") + 1,
+            )
+        return None
+    if head[:2] == b"\xff\xd8":
+        # Replay the bytes after the start of image marker
+        return _jpeg_size(_Prefixed(head[2:], fp))
+    return None
+
+
+def storage_name(src, storage):
+    """
+    Return the name of the file in ``storage`` referenced by the URL ``src``
+    or ``None`` if the URL doesn't point to the storage
+    """
+    if not src:
+        return None
+    base_url = storage.base_url if hasattr(storage, "base_url") else storage.url("")
+    url = urlsplit(src)
+    if urlsplit(base_url).netloc:
+        src = src.split("?")[0].split("#")[0]
+    elif url.scheme or url.netloc:
+        # The storage uses relative URLs, absolute URLs point elsewhere
+        return None
+    else:
+        src = url.path
+    if not base_url or not src.startswith(base_url):
+        return None
+    return unquote(src.removeprefix(base_url)) or None
+
+
+def _storage_key(storage):
+    # Identifies the storage including its configuration, the same URL may
+    # point to different files in different storages
+    cls = storage.__class__
+    deconstruct = getattr(storage, "deconstruct", None)
+    return repr(
+        (
+            f"{cls.__module__}.{cls.__qualname__}",
+            deconstruct() if deconstruct else None,
+            getattr(storage, "location", None),
+            getattr(storage, "base_url", None),
+        )
+    )
+
+
+def cache_dimensions(src, size, *, storage):
+    """Remember the ``(width, height)`` of the image ``src`` in ``storage``."""
+    dimensions_cache.set((_storage_key(storage), src), tuple(size))
+
+
+def _read_dimensions(src, storage):
+    if (name := storage_name(src, storage)) is None:
+        return ()
+    try:
+        with storage.open(name, "rb") as fp:
+            return tuple(read_image_size(fp) or ())
+    except (OSError, ValueError, SuspiciousOperation):
+        return ()
+
+
+def image_dimensions(srcs, *, storage=None):
+    """
+    Return a dictionary mapping image URLs to ``(width, height)`` tuples
+
+    URLs which do not point to the storage (the default storage by default)
+    or whose dimensions cannot be determined are omitted. Uncached images are
+    read in a thread pool; only successful lookups are cached.
+    """
+    if storage is None:
+        from django.core.files.storage import default_storage  # noqa: PLC0415
+
+        storage = default_storage
+
+    result = {}
+    missing = []
+    storage_key = _storage_key(storage)
+    for src in dict.fromkeys(srcs):
+        if size := dimensions_cache.get((storage_key, src)):
+            result[src] = size
+        else:
+            missing.append(src)
+
+    if len(missing) > 1:
+        with ThreadPoolExecutor(min(len(missing), MAX_WORKERS)) as executor:
+            sizes = list(
+                executor.map(lambda src: _read_dimensions(src, storage), missing)
+            )
+    else:
+        sizes = [_read_dimensions(src, storage) for src in missing]
+
+    for src, size in zip(missing, sizes, strict=True):
+        if size:
+            dimensions_cache.set((storage_key, src), size)
+            result[src] = size
+    return result
+
+
+class ImageDimensions(Transform):
+    """
+    Add ``width`` and ``height`` attributes to images using a dictionary
+    mapping URLs to dimensions
+
+    If only one of the attributes is present the other one is calculated
+    using the aspect ratio of the image.
+    """
+
+    tags = ("img",)
+
+    def __init__(self, dimensions):
+        self.dimensions = dimensions
+
+    def element(self, element):
+        attrs = element.attrs
+        if not (size := self.dimensions.get(attrs.get("src"))):
+            return
+        width, height = size
+        if not attrs.get("width") and not attrs.get("height"):
+            attrs["width"], attrs["height"] = str(width), str(height)
+        elif not attrs.get("height") and attrs["width"].isdigit() and width:
+            attrs["height"] = str(round(int(attrs["width"]) * height / width))
+        elif not attrs.get("width") and attrs["height"].isdigit() and height:
+            attrs["width"] = str(round(int(attrs["height"]) * width / height))
+
+
+class _MissingDimensions(Transform):
+    # Collects the URLs of images without width or height
+    tags = ("img",)
+
+    def __init__(self):
+        self.srcs = []
+
+    def element(self, element):
+        attrs = element.attrs
+        if attrs.get("src") and not (attrs.get("width") and attrs.get("height")):
+            self.srcs.append(attrs["src"])
+
+
+def add_image_dimensions(html, *, storage=None):
+    """
+    Add missing ``width`` and ``height`` attributes to images in the HTML
+
+    Images pointing to other locations than the storage are left alone.
+    """
+    if not html or "<img" not in html:
+        return html
+    collect = _MissingDimensions()
+    TransformPipeline([collect])(html)
+    if not collect.srcs or not (
+        dimensions := image_dimensions(collect.srcs, storage=storage)
+    ):
+        return html
+    return TransformPipeline([ImageDimensions(dimensions)])(html)
+
+
+#: Default options for :class:`ResponsiveImages`, may be overridden using the
+#: ``DJANGO_PROSE_EDITOR_RESPONSIVE_IMAGES`` setting.
+RESPONSIVE_IMAGES_DEFAULTS = {
+    # Widths of the generated thumbnails
+    "widths": (480, 960, 1440),
+    # Value of the sizes attribute
+    "sizes": "100vw",
+    # Callable (or its dotted path) receiving the image URL and a width and
+    # returning the URL of a thumbnail or None
+    "thumbnail": None,
+}
+
+
+class ResponsiveImages(Transform):
+    """
+    Add ``srcset``, ``sizes``, ``loading="lazy"`` and ``decoding="async"`` to
+    images
+
+    Thumbnail URLs are produced by the ``thumbnail`` callable, e.g. using
+    your favorite thumbnailing library. Thumbnails wider than the ``width``
+    attribute of the image aren't added since they wouldn't be sharper than
+    the original. Images which already have a ``srcset`` (sanitized content
+    doesn't) only get the ``loading`` and ``decoding`` attributes.
+    """
+
+    tags = ("img",)
+
+    def __init__(self, *, widths=None, sizes=None, thumbnail=None):
+        from django.conf import settings  # noqa: PLC0415
+
+        options = RESPONSIVE_IMAGES_DEFAULTS | getattr(
+            settings, "DJANGO_PROSE_EDITOR_RESPONSIVE_IMAGES", {}
+        )
+        self.widths = sorted(widths or options["widths"])
+        self.sizes = sizes or options["sizes"]
+        self.thumbnail = thumbnail or options["thumbnail"]
+
+    def thumbnail_url(self, src, width):
+        if isinstance(self.thumbnail, str):
+            from django.utils.module_loading import import_string  # noqa: PLC0415
+
+            self.thumbnail = import_string(self.thumbnail)
+        return self.thumbnail(src, width) if self.thumbnail else None
+
+    def element(self, element):
+        attrs = element.attrs
+        attrs.setdefault("loading", "lazy")
+        attrs.setdefault("decoding", "async")
+        if not (src := attrs.get("src")) or attrs.get("srcset"):
+            return
+
+        width = attrs.get("width") or ""
+        intrinsic = int(width) if width.isdigit() else None
+        candidates = [
+            f"{url} {w}w"
+            for w in self.widths
+            if intrinsic is None or w < intrinsic
+            if (url := self.thumbnail_url(src, w))
+        ]
+        if not candidates:
+            return
+        if intrinsic:
+            candidates.append(f"{src} {intrinsic}w")
+        attrs["srcset"] = ", ".join(candidates)
+        attrs.setdefault("sizes", self.sizes)
@@ -0,0 +1,291 @@
+"""
+Bulk import of HTML into ``ProseEditorField`` columns.
+
+Records are read as a stream from JSONL files, CSV files or directories of
+HTML files. The HTML is normalized and sanitized using the allowlist of the
+target field's extensions in a pool of worker processes and the rows are
+written using ``bulk_create`` in transactions of ``batch_size`` rows.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.apps import apps
+from django.db import transaction
+
+from django_prose_editor.fields import ProseEditorField, create_sanitizer
+
+
+#: Maximum size of CSV fields in characters; the default of the csv module
+#: (128 KiB) is too small for long documents.
+CSV_FIELD_SIZE_LIMIT = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class InvalidRecord:
+    """A record which couldn't be read, counted as rejected with ``reason``"""
+
+    reason: str
+
+
+def read_jsonl(path):
+    """
+    Yield a dictionary for every line of a JSONL file
+
+    Lines which aren't valid JSON objects yield :class:`InvalidRecord`
+    instances instead of aborting the import.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield InvalidRecord("invalid JSON")
+                continue
+            yield (
+                record
+                if isinstance(record, dict)
+                else InvalidRecord("not a JSON object")
+            )
+
+
+def read_csv(path, *, field_size_limit=None):
+    """
+    Yield a dictionary for every row of a CSV file with a header row
+
+    Fields may contain up to ``field_size_limit`` characters
+    (``CSV_FIELD_SIZE_LIMIT`` by default).
+    """
+    # The limit is global, restore it when done
+    previous = csv.field_size_limit(field_size_limit or CSV_FIELD_SIZE_LIMIT)
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+    finally:
+        csv.field_size_limit(previous)
+
+
+def read_directory(path, *, key, pattern="**/*.html", filename_key=None):
+    """
+    Yield a dictionary for every HTML file in a directory
+
+    The content is stored under ``key``; the path of the file relative to the
+    directory without its suffix is stored under ``filename_key`` if given.
+    """
+    path = Path(path)
+    for file in sorted(path.glob(pattern)):
+        if file.is_file():
+            record = {key: file.read_text(encoding="utf-8")}
+            if filename_key:
+                record[filename_key] = str(file.relative_to(path).with_suffix(""))
+            yield record
+
+
+def read_source(path, *, key, format=None, filename_key=None):
+    """
+    Return an iterator of records for a JSONL file, a CSV file or a
+    directory of HTML files, using the suffix to detect the format if
+    ``format`` isn't given
+    """
+    path = Path(path)
+    format = format or ("html" if path.is_dir() else path.suffix.lstrip(".").lower())
+    if format == "html":
+        return read_directory(path, key=key, filename_key=filename_key)
+    if format in {"jsonl", "ndjson"}:
+        return read_jsonl(path)
+    if format == "csv":
+        return read_csv(path)
+    raise ValueError(f"Unknown import format {format!r}")
+
+
+def resolve_field(target):
+    """Return the ``ProseEditorField`` for ``app_label.ModelName.field``."""
+    if isinstance(target, ProseEditorField):
+        return target
+    label, _, name = target.rpartition(".")
+    field = apps.get_model(label)._meta.get_field(name)
+    if not isinstance(field, ProseEditorField):
+        raise TypeError(f"{target} isn't a ProseEditorField")
+    return field
+
+
+@dataclass
+class ImportStats:
+    #: Number of records read
+    read: int = 0
+    #: Number of rows created
+    imported: int = 0
+    #: Records without content or whose content was removed completely
+    rejected: int = 0
+    #: Records whose content was modified by the sanitizer
+    modified: int = 0
+    #: Number of characters removed by the sanitizer
+    removed: int = 0
+    seconds: float = 0.0
+    #: Reasons for rejections and their counts
+    reasons: dict = field(default_factory=dict)
+
+    @property
+    def throughput(self):
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def reject(self, reason):
+        self.rejected += 1
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def __str__(self):
+        lines = [
+            (
+                f"{self.read} records read, {self.imported} imported,"
+                f" {self.rejected} rejected, {self.modified} modified by the"
+                f" sanitizer ({self.removed} characters removed)."
+            ),
+            f"{self.seconds:.1f}s, {self.throughput:.0f} records/s.",
+        ]
+        lines.extend(
+            f"Rejected ({reason}): {count}" for reason, count in self.reasons.items()
+        )
+        return "\n".join(lines)
+
+
+def normalize(html):
+    """Normalize line endings and surrounding whitespace."""
+    return html.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+# The sanitizer of worker processes
+_sanitize = None
+
+
+def _init_worker(extensions, transforms):
+    global _sanitize  # noqa: PLW0603
+    _sanitize = create_sanitizer(extensions, transforms=transforms)
+
+
+def _sanitize_batch(values, sanitize=None):
+    sanitize = sanitize or _sanitize
+    return [sanitize(normalize(value)) if value else "" for value in values]
+
+
+def _batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_records(
+    records,
+    target,
+    *,
+    key=None,
+    batch_size=1000,
+    workers=None,
+    ignore_conflicts=False,
+):
+    """
+    Import an iterable of dictionaries into the model of the target field
+
+    ``target`` is a ``ProseEditorField`` or its ``app_label.ModelName.field``
+    path. The HTML is taken from ``key`` (the field name by default); all
+    other keys of the records which are names of model fields are passed to
+    the model as well. The HTML is sanitized using the extensions of the
+    field in ``workers`` processes (one per CPU by default, ``0`` sanitizes
+    in the current process). :class:`InvalidRecord` instances are counted as
+    rejected. Returns :class:`ImportStats`.
+    """
+    prose_field = resolve_field(target)
+    if "extensions" not in prose_field.config:
+        raise ValueError(f"{prose_field} has to be configured using extensions")
+
+    model = prose_field.model
+    key = key or prose_field.name
+    names = {f.name for f in model._meta.concrete_fields} | {
+        f.attname for f in model._meta.concrete_fields
+    }
+    stats = ImportStats()
+    start = time.perf_counter()
+
+    if workers == 0:
+        sanitize = create_sanitizer(
+            prose_field.config["extensions"],
+            transforms=prose_field.transform.transforms,
+        )
+        executor = None
+        in_flight = 0
+    else:
+        in_flight = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(
+            workers,
+            initializer=_init_worker,
+            initargs=(
+                prose_field.config["extensions"],
+                prose_field.transform.transforms,
+            ),
+        )
+
+    def write(batch, sanitized):
+        if executor:
+            sanitized = sanitized.result()
+        objects = []
+        for record, html in zip(batch, sanitized, strict=True):
+            if isinstance(record, InvalidRecord):
+                stats.reject(record.reason)
+                continue
+            original = normalize(record.get(key) or "")
+            if not original:
+                stats.reject("no content")
+                continue
+            if not html:
+                stats.reject("empty after sanitization")
+                continue
+            if html != original:
+                stats.modified += 1
+                stats.removed += max(0, len(original) - len(html))
+            values = {
+                name: value
+                for name, value in record.items()
+                if name in names and name != key
+            }
+            objects.append(model(**values, **{prose_field.attname: html}))
+        with transaction.atomic(using=model._default_manager.db):
+            created = model._default_manager.bulk_create(
+                objects, ignore_conflicts=ignore_conflicts
+            )
+        stats.imported += len(created)
+
+    try:
+        # Sanitize upcoming batches while the current batch is being written
+        pending = deque()
+        for batch in _batches(records, batch_size):
+            stats.read += len(batch)
+            values = [
+                "" if isinstance(record, InvalidRecord) else record.get(key) or ""
+                for record in batch
+            ]
+            if executor:
+                pending.append((batch, executor.submit(_sanitize_batch, values)))
+            else:
+                pending.append((batch, _sanitize_batch(values, sanitize)))
+            if len(pending) > in_flight:
+                write(*pending.popleft())
+        while pending:
+            write(*pending.popleft())
+    finally:
+        if executor:
+            executor.shutdown()
+
+    stats.seconds = time.perf_counter() - start
+    return stats
@@ -0,0 +1,153 @@
+"""
+Bulk validation of links in stored prose content.
+
+Links are extracted from all ``ProseEditorField`` values, deduplicated and
+checked concurrently using asyncio and a pooled ``httpx`` client with a limit
+on the number of concurrent requests per host. Results are cached using one
+of Django's cache backends so that repeated runs only check new or expired
+links.
+
+``httpx`` is an optional dependency (``pip install django-prose-editor[links]``).
+"""
+
+import asyncio
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import chain
+from urllib.parse import urljoin, urlsplit
+
+from django.core.cache import caches
+
+from django_prose_editor.fields import prose_editor_fields
+from django_prose_editor.stats import parse_content
+
+
+#: Default options for :func:`check_links`.
+DEFAULT_OPTIONS = {
+    # Maximum number of concurrent requests
+    "concurrency": 20,
+    # Maximum number of concurrent requests per host
+    "per_host": 2,
+    # Timeout per request in seconds
+    "timeout": 10,
+    # Time to live of cached results in seconds, 0 to disable caching
+    "ttl": 86400,
+    # Alias of the Django cache backend
+    "backend": "default",
+}
+
+
+@dataclass(frozen=True)
+class LinkResult:
+    url: str
+    status: int | None = None
+    error: str = ""
+
+    @property
+    def ok(self):
+        return not self.error and self.status is not None and self.status < 400
+
+
+@dataclass(frozen=True)
+class LinkLocation:
+    model: str
+    pk: object
+    field: str
+
+
+def collect_links(labels=(), *, base_url=None, chunk_size=500):
+    """
+    Return a dictionary mapping URLs to lists of :class:`LinkLocation`
+    instances
+
+    Only ``http`` and ``https`` URLs are returned. Relative URLs are resolved
+    against ``base_url`` if given and skipped otherwise. Rows are fetched in
+    chunks of ``chunk_size``.
+    """
+    links = defaultdict(list)
+    for model, field in prose_editor_fields(labels):
+        rows = chain.from_iterable(field.iter_values(chunk_size=chunk_size))
+        for pk, html in rows:
+            urls = {}
+            for href in parse_content(html).links:
+                url = urlsplit(urljoin(base_url, href) if base_url else href)
+                if url.scheme in {"http", "https"} and url.netloc:
+                    urls[url._replace(fragment="").geturl()] = None
+            location = LinkLocation(model._meta.label, pk, field.name)
+            for url in urls:
+                links[url].append(location)
+    return dict(links)
+
+
+def _cache_key(url):
+    return f"django-prose-editor:link:{hashlib.sha256(url.encode()).hexdigest()}"
+
+
+async def _check_links(urls, options):
+    import httpx  # noqa: PLC0415
+
+    limits = httpx.Limits(
+        max_connections=options["concurrency"],
+        max_keepalive_connections=options["concurrency"],
+    )
+    # Requests wait here instead of waiting for a connection from the pool,
+    # where they would count against the timeout
+    semaphore = asyncio.Semaphore(options["concurrency"])
+    hosts = defaultdict(lambda: asyncio.Semaphore(options["per_host"]))
+
+    async def check(client, url):
+        async with hosts[urlsplit(url).netloc.lower()], semaphore:
+            try:
+                response = await client.head(url)
+                if response.status_code in {403, 405, 501}:
+                    # Some servers do not support HEAD requests
+                    async with client.stream("GET", url) as response:
+                        pass
+            except httpx.HTTPError as exc:
+                return LinkResult(url, error=str(exc) or type(exc).__name__)
+            return LinkResult(url, status=response.status_code)
+
+    async with httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(options["timeout"], pool=None),
+        follow_redirects=True,
+        headers={"User-Agent": "django-prose-editor link checker"},
+    ) as client:
+        return await asyncio.gather(*(check(client, url) for url in urls))
+
+
+def check_links(urls, **options):
+    """
+    Check URLs concurrently and return a dictionary mapping URLs to
+    :class:`LinkResult` instances
+
+    ``options`` override the ``DEFAULT_OPTIONS``. Cached results are used
+    if available. Only responses are cached, transport errors and timeouts
+    are retried the next time.
+    """
+    options = DEFAULT_OPTIONS | options
+    urls = list(dict.fromkeys(urls))
+    cache = caches[options["backend"]] if options["ttl"] else None
+
+    results = {}
+    if cache:
+        cached = cache.get_many([_cache_key(url) for url in urls])
+        for url in urls:
+            if (result := cached.get(_cache_key(url))) is not None:
+                results[url] = LinkResult(url, *result)
+
+    if missing := [url for url in urls if url not in results]:
+        checked = asyncio.run(_check_links(missing, options))
+        results |= {result.url: result for result in checked}
+        if cache:
+            cache.set_many(
+                {
+                    _cache_key(result.url): (result.status, result.error)
+                    for result in checked
+                    if not result.error
+                },
+                options["ttl"],
+            )
+
+    return results
@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from django_prose_editor.links import DEFAULT_OPTIONS, check_links, collect_links
+
+
+class Command(BaseCommand):
+    help = (
+        "Check all links in ProseEditorField values concurrently and report"
+        " broken links per model, primary key and field."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            metavar="app_label[.ModelName]",
+            help="Restrict the check to the given apps or models.",
+        )
+        parser.add_argument(
+            "--base-url",
+            help="Resolve relative links against this URL instead of skipping them.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_OPTIONS["concurrency"],
+            help="Maximum number of concurrent requests.",
+        )
+        parser.add_argument(
+            "--per-host",
+            type=int,
+            default=DEFAULT_OPTIONS["per_host"],
+            help="Maximum number of concurrent requests per host.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=DEFAULT_OPTIONS["timeout"],
+            help="Timeout per request in seconds.",
+        )
+        parser.add_argument(
+            "--ttl",
+            type=int,
+            default=DEFAULT_OPTIONS["ttl"],
+            help="Cache results for this many seconds, 0 disables the cache.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="report_all",
+            help="Report working links too.",
+        )
+
+    def handle(self, *, labels, base_url, report_all, **options):
+        try:
+            import httpx  # noqa: F401, PLC0415
+        except ImportError as exc:
+            raise CommandError(
+                "The link checker requires httpx, install it using"
+                " 'pip install django-prose-editor[links]'."
+            ) from exc
+
+        try:
+            links = collect_links(labels, base_url=base_url)
+        except LookupError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(f"Checking {len(links)} distinct links...")
+        results = check_links(
+            links,
+            concurrency=options["concurrency"],
+            per_host=options["per_host"],
+            timeout=options["timeout"],
+            ttl=options["ttl"],
+        )
+
+        broken = 0
+        for url, locations in links.items():
+            result = results[url]
+            if result.ok and not report_all:
+                continue
+            broken += not result.ok
+            status = result.error or result.status
+            for location in locations:
+                line = f"{location.model} pk={location.pk} {location.field}: {url} ({status})"
+                self.stdout.write(
+                    line if result.ok else self.style.ERROR(line),
+                )
+
+        self.stdout.write(
+            f"{len(links)} links checked, {broken} broken.",
+            self.style.ERROR if broken else self.style.SUCCESS,
+        )
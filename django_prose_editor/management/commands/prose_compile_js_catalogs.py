@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from django_prose_editor.catalogs import CATALOG_DIR, LOCALE_DIR, compile_catalogs
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile the djangojs.mo files of django-prose-editor into static"
+        " JavaScript catalogs. Run compilemessages first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--locale-dir",
+            default=LOCALE_DIR,
+            help="Directory containing the locales (default: the package's).",
+        )
+        parser.add_argument(
+            "--output",
+            default=CATALOG_DIR,
+            help="Directory receiving the catalogs (default: the package's).",
+        )
+
+    def handle(self, *, locale_dir, output, **options):
+        for path in compile_catalogs(locale_dir, output):
+            self.stdout.write(f"Wrote {path}")
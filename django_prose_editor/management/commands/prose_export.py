@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from django_prose_editor.export import export_jsonl
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the content of ProseEditorFields as JSON lines containing the"
+        " HTML, the plain text and optionally an outline of the headings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            metavar="app_label[.ModelName]",
+            help="Restrict the export to the given apps or models.",
+        )
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="Write the export to this file instead of the standard output.",
+        )
+        parser.add_argument(
+            "--outline",
+            action="store_true",
+            help="Include an outline of the headings.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of rows fetched and converted at once.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes, 0 converts in the current process.",
+        )
+
+    def handle(self, *, labels, output, **options):
+        lines = export_jsonl(
+            labels,
+            outline=options["outline"],
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+        )
+        try:
+            if output:
+                with open(output, "w", encoding="utf-8") as f:
+                    f.writelines(lines)
+            else:
+                for line in lines:
+                    self.stdout.write(line, ending="")
+        except LookupError as exc:
+            raise CommandError(str(exc)) from exc
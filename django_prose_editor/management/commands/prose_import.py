@@ -0,0 +1,81 @@
+import csv
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+
+from django_prose_editor.importer import import_records, read_source, resolve_field
+
+
+class Command(BaseCommand):
+    help = (
+        "Import HTML from a JSONL file, a CSV file or a directory of HTML files"
+        " into a ProseEditorField, sanitizing it in a process pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "target",
+            metavar="app_label.ModelName.field",
+            help="The ProseEditorField receiving the HTML.",
+        )
+        parser.add_argument(
+            "source",
+            help="A .jsonl or .csv file or a directory containing .html files.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "csv", "html"],
+            help="Format of the source, detected using the suffix by default.",
+        )
+        parser.add_argument(
+            "--key",
+            help="Key of the records containing the HTML, defaults to the field name.",
+        )
+        parser.add_argument(
+            "--filename-field",
+            help="Model field receiving the file name when importing a directory.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows sanitized and written per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes, 0 sanitizes in the current process.",
+        )
+        parser.add_argument(
+            "--ignore-conflicts",
+            action="store_true",
+            help="Skip rows violating unique constraints instead of failing.",
+        )
+
+    def handle(self, *, target, source, **options):
+        try:
+            field = resolve_field(target)
+        except (LookupError, FieldDoesNotExist, TypeError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        key = options["key"] or field.name
+        try:
+            records = read_source(
+                source,
+                key=key,
+                format=options["format"],
+                filename_key=options["filename_field"],
+            )
+            stats = import_records(
+                records,
+                field,
+                key=key,
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                ignore_conflicts=options["ignore_conflicts"],
+            )
+        except (OSError, ValueError, csv.Error) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(str(stats))
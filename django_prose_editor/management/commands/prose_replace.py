@@ -0,0 +1,106 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_prose_editor.replace import DEFAULT_ATTRIBUTES, MODES, find_and_replace
+
+
+class Command(BaseCommand):
+    help = (
+        "Replace text or attribute values in all ProseEditorField values."
+        " Only the text between tags and the values of link and image"
+        " attributes are searched, the markup itself is never changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("find", help="The string (or pattern) to search for.")
+        parser.add_argument("replace", help="The replacement.")
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            metavar="app_label[.ModelName]",
+            help="Restrict the replacement to the given apps or models.",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=MODES,
+            default="all",
+            help="Replace in text and attributes (default), only text or only attributes.",
+        )
+        parser.add_argument(
+            "--attribute",
+            action="append",
+            dest="attributes",
+            metavar="tag.attribute",
+            help=(
+                "Attribute searched in attributes mode, may be given several times."
+                " Defaults to "
+                + ", ".join(
+                    f"{tag}.{name}"
+                    for tag, names in DEFAULT_ATTRIBUTES.items()
+                    for name in names
+                )
+                + "."
+            ),
+        )
+        parser.add_argument(
+            "--regex",
+            action="store_true",
+            help="Treat the search string as a regular expression.",
+        )
+        parser.add_argument(
+            "--ignore-case",
+            action="store_true",
+            help="Search case-insensitively.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the number of matches per field.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of rows processed and written per chunk.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes, 0 processes rows in the current process.",
+        )
+
+    def handle(self, *, find, replace, labels, attributes, **options):
+        if attributes:
+            parsed = {}
+            for attribute in attributes:
+                tag, _sep, name = attribute.partition(".")
+                if not tag or not name:
+                    raise CommandError(f"Invalid attribute {attribute!r}, use tag.name")
+                parsed.setdefault(tag.lower(), []).append(name.lower())
+            attributes = parsed
+
+        try:
+            stats = find_and_replace(
+                find,
+                replace,
+                labels=labels,
+                dry_run=options["dry_run"],
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+                mode=options["mode"],
+                regex=options["regex"],
+                ignore_case=options["ignore_case"],
+                attributes=attributes,
+            )
+        except (LookupError, ValueError, re.error) as exc:
+            raise CommandError(str(exc)) from exc
+
+        for path, field_stats in stats.items():
+            self.stdout.write(f"{path}: {field_stats}")
+        total = sum(field_stats.matches for field_stats in stats.values())
+        if options["dry_run"]:
+            self.stdout.write(f"Dry run, {total} matches found, nothing changed.")
+        else:
+            self.stdout.write(f"{total} matches replaced.")
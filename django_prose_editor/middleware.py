@@ -0,0 +1,107 @@
+import logging
+import re
+
+from django.utils.html import escape
+
+from django_prose_editor.profiling import TIMINGS, collect_timings
+from django_prose_editor.widgets import shared_config_scope
+
+
+logger = logging.getLogger("django_prose_editor.timing")
+
+
+class ServerTimingMiddleware:
+    """
+    Report the time spent in prose sanitization, widget config serialization
+    and media assembly using the ``Server-Timing`` response header
+
+    The timings are also logged to the ``django_prose_editor.timing`` logger
+    at the ``INFO`` level with the timings available as ``prose_timings`` on
+    the log record.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_timings() as timings:
+            response = self.get_response(request)
+
+        if timings:
+            metrics = [
+                f'prose-{name};dur={seconds * 1000:.2f};desc="{TIMINGS.get(name, name)} ({count}x)"'
+                for name, (seconds, count) in timings.items()
+            ]
+            if existing := response.get("Server-Timing"):
+                metrics.insert(0, existing)
+            response["Server-Timing"] = ", ".join(metrics)
+
+            prose_timings = {
+                name: {"ms": round(seconds * 1000, 2), "count": count}
+                for name, (seconds, count) in timings.items()
+            }
+            logger.info(
+                "Prose editor timings for %s %s: %s",
+                request.method,
+                request.path,
+                prose_timings,
+                extra={"prose_timings": prose_timings},
+            )
+
+        return response
+
+
+_html_page_re = re.compile(
+    rb"^\s*(?:<!--.*?-->\s*)*<(?:!doctype\s+html|html)[\s>]", re.IGNORECASE | re.DOTALL
+)
+
+
+def _is_html_page(response):
+    return (
+        not response.streaming
+        and response.get("Content-Type", "").startswith("text/html")
+        and _html_page_re.match(response.content) is not None
+    )
+
+
+class SharedConfigMiddleware:
+    """
+    Emit each distinct prose editor widget configuration only once per
+    response instead of once per textarea
+
+    Only complete HTML documents reference the configurations. In other
+    responses such as HTML fragments the references are replaced with the
+    configurations again, since the script elements they refer to may be
+    rendered elsewhere. Responses which are already encoded (e.g. by
+    ``GZipMiddleware``) or which cannot be decoded using their charset are
+    left alone, so the middleware has to be listed after ``GZipMiddleware``.
+
+    See :func:`django_prose_editor.widgets.shared_config_scope`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with shared_config_scope() as emitted:
+            response = self.get_response(request)
+
+        if (
+            not emitted
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or _is_html_page(response)
+        ):
+            return response
+
+        charset = response.charset
+        try:
+            content = response.content.decode(charset)
+        except (LookupError, UnicodeDecodeError):
+            return response
+        for config_id, data in emitted.items():
+            content = content.replace(f'="#{config_id}"', f'="{escape(data)}"')
+        response.content = content.encode(charset)
+        if response.has_header("Content-Length"):
+            response["Content-Length"] = str(len(response.content))
+        return response
@@ -0,0 +1,73 @@
+"""
+Lightweight timing instrumentation for prose editor work.
+
+Timings are only collected while :func:`collect_timings` is active, e.g.
+inside :class:`django_prose_editor.middleware.ServerTimingMiddleware`.
+Otherwise :func:`measure` does nothing except for a context variable lookup.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+
+#: Descriptions of the collected timings.
+TIMINGS = {
+    "sanitize": "Prose sanitization",
+    "widget": "Prose widget config serialization",
+    "media": "Prose widget media assembly",
+}
+
+_timings = ContextVar("django_prose_editor_timings", default=None)
+
+
+@contextmanager
+def collect_timings():
+    """
+    Collect timings of the wrapped code
+
+    Yields a dictionary mapping timing names to ``[seconds, count]`` lists
+    which is filled while the context manager is active.
+    """
+    timings = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+class _Measure:
+    __slots__ = ("name", "start", "timings")
+
+    def __init__(self, name, timings):
+        self.name = name
+        self.timings = timings
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *args):
+        timing = self.timings.setdefault(self.name, [0.0, 0])
+        timing[0] += perf_counter() - self.start
+        timing[1] += 1
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args):
+        pass
+
+
+_noop = _Noop()
+
+
+def measure(name):
+    """Return a context manager adding the time spent to timing ``name``."""
+    if (timings := _timings.get()) is None:
+        return _noop
+    return _Measure(name, timings)
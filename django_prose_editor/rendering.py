@@ -0,0 +1,224 @@
+"""
+Rendering of stored prose content with optional transforms and caching.
+"""
+
+import asyncio
+import hashlib
+import secrets
+from functools import lru_cache
+from html import unescape
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.html import escape, strip_tags
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+from django_prose_editor.blocks import iter_blocks
+from django_prose_editor.caching import fingerprint
+from django_prose_editor.transforms import (
+    AddLinkRel,
+    HeadingIds,
+    LazyImages,
+    NormalizeNbsp,
+    TransformPipeline,
+)
+
+
+#: Transforms which can be referenced by name when rendering. Additional
+#: transforms can be added using the ``DJANGO_PROSE_EDITOR_RENDER_TRANSFORMS``
+#: setting which maps names to transform classes or their dotted paths.
+RENDER_TRANSFORMS = {
+    "noopener": AddLinkRel,
+    "lazy_images": LazyImages,
+    "heading_ids": HeadingIds,
+    "nbsp": NormalizeNbsp,
+    "responsive_images": "django_prose_editor.images.ResponsiveImages",
+}
+
+#: Default options, may be overridden using the
+#: ``DJANGO_PROSE_EDITOR_RENDER_CACHE`` setting. Set the setting to ``False``
+#: to disable caching.
+DEFAULT_CACHE_OPTIONS = {
+    "backend": "default",
+    "timeout": 86400,
+}
+
+
+def render_transforms():
+    return RENDER_TRANSFORMS | getattr(
+        settings, "DJANGO_PROSE_EDITOR_RENDER_TRANSFORMS", {}
+    )
+
+
+@lru_cache(maxsize=64)
+def _pipeline(names):
+    transforms = render_transforms()
+    if unknown := [name for name in names if name not in transforms]:
+        raise ValueError(f"Unknown render transforms: {', '.join(unknown)}")
+    return TransformPipeline(
+        (import_string(cls) if isinstance(cls, str) else cls)()
+        for cls in (transforms[name] for name in names)
+    )
+
+
+def _clear_pipelines(*, setting, **kwargs):
+    # Transforms read their options from the settings when instantiated
+    if setting.startswith("DJANGO_PROSE_EDITOR_"):
+        _pipeline.cache_clear()
+
+
+setting_changed.connect(_clear_pipelines)
+
+
+def _render(html, transforms, excerpt):
+    if excerpt:
+        text = unescape(strip_tags(html))
+        return escape(Truncator(text).words(excerpt, truncate=" ..."))
+    return mark_safe(_pipeline(transforms)(html))
+
+
+def render_prose(html, *, transforms=(), excerpt=None):
+    """
+    Render stored prose content
+
+    ``transforms`` is a sequence of names of render transforms (see
+    ``RENDER_TRANSFORMS``). If ``excerpt`` is a number of words a plain text
+    excerpt is returned instead. The result is memoized in the Django cache
+    using a hash of the content and the render options as the key; the
+    options include the classes and the configuration of the transforms, e.g.
+    the resolved ``DJANGO_PROSE_EDITOR_RESPONSIVE_IMAGES`` setting, but not
+    the names they are registered under. Without transforms and excerpt the
+    content is returned as-is without touching the cache.
+
+    The content isn't sanitized again; only use this with content which has
+    been sanitized when saving.
+    """
+    if not html:
+        return ""
+
+    transforms = tuple(transforms)
+    if not transforms and not excerpt:
+        return mark_safe(html)
+    options = fingerprint(_pipeline(transforms).transforms, excerpt)
+    digest = hashlib.sha256(html.encode()).hexdigest()
+    key = f"django-prose-editor:render:{options}:{digest}"
+    return memoize(key, lambda: _render(html, transforms, excerpt))
+
+
+def memoize(key, render):
+    """
+    Return the safe string cached under ``key``, calling ``render`` to
+    produce it on cache misses
+
+    Uses the cache configured by ``DJANGO_PROSE_EDITOR_RENDER_CACHE``.
+    """
+    options = getattr(settings, "DJANGO_PROSE_EDITOR_RENDER_CACHE", {})
+    if options is False:
+        return render()
+
+    options = DEFAULT_CACHE_OPTIONS | options
+    cache = caches[options["backend"]]
+    if (result := cache.get(key)) is None:
+        result = render()
+        cache.set(key, str(result), options["timeout"])
+    return mark_safe(result)
+
+
+#: Default minimum size of the chunks yielded when streaming.
+STREAM_CHUNK_SIZE = 16384
+
+
+def stream_prose(html, *, transforms=(), chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Render stored prose content incrementally
+
+    Yields chunks consisting of one or more top-level blocks (paragraphs,
+    headings, lists, tables etc.) of at least ``chunk_size`` characters
+    (except for the last chunk). The named ``transforms`` are applied chunk by
+    chunk while sharing their state, so the joined chunks are the same as the
+    output of :func:`render_prose`. Nothing is cached.
+    """
+    if not html:
+        return
+    pipeline = _pipeline(tuple(transforms))
+    state = {}
+    parts = []
+    size = 0
+    for block in iter_blocks(html):
+        parts.append(block)
+        size += len(block)
+        if size >= chunk_size:
+            # Chunks always consist of whole blocks, so transforming them
+            # together is the same as transforming each block
+            yield pipeline("".join(parts), state)
+            parts, size = [], 0
+    if parts:
+        yield pipeline("".join(parts), state)
+
+
+async def astream_prose(html, **kwargs):
+    """
+    Asynchronous variant of :func:`stream_prose`
+
+    Control is returned to the event loop after every chunk.
+    """
+    for chunk in stream_prose(html, **kwargs):
+        yield chunk
+        await asyncio.sleep(0)
+
+
+def streaming_prose_response(
+    request,
+    template_name,
+    context,
+    html,
+    *,
+    transforms=(),
+    context_name="prose",
+    asynchronous=False,
+    **kwargs,
+):
+    """
+    Return a ``StreamingHttpResponse`` rendering ``template_name`` with the
+    prose content streamed in place of the ``context_name`` variable
+
+    The template is rendered once with a placeholder. The part before the
+    placeholder is sent immediately, followed by the rendered blocks of the
+    content and the rest of the template. The variable has to be output
+    exactly once by the template. Pass ``asynchronous=True`` when serving the
+    response using ASGI.
+    """
+    marker = f"<!--prose-{secrets.token_hex(16)}-->"
+    content = render_to_string(
+        template_name, {**context, context_name: mark_safe(marker)}, request
+    )
+    if (count := content.count(marker)) != 1:
+        raise ImproperlyConfigured(
+            f"The template {template_name!r} has to output the"
+            f" {context_name!r} variable exactly once, not {count} times."
+        )
+    head, _marker, tail = content.partition(marker)
+
+    if asynchronous:
+
+        async def stream():
+            yield head
+            async for chunk in astream_prose(html, transforms=transforms):
+                yield chunk
+            yield tail
+
+    else:
+
+        def stream():
+            yield head
+            yield from stream_prose(html, transforms=transforms)
+            yield tail
+
+    kwargs.setdefault("content_type", "text/html; charset=utf-8")
+    return StreamingHttpResponse(stream(), **kwargs)
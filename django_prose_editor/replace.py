@@ -0,0 +1,337 @@
+"""
+Find and replace in ``ProseEditorField`` values.
+
+Replacements are tag-aware: Text is only replaced between tags and attribute
+values only in the attributes listed in ``attributes``, so a replacement can
+never break the markup. The rows of each field are streamed in chunks,
+processed in a pool of worker processes and only changed rows are written
+using ``bulk_update``. Written values are sanitized and transformed like
+values saved through forms.
+
+Usage::
+
+    from django_prose_editor.replace import find_and_replace
+
+    stats = find_and_replace(
+        "https://old.example.com/",
+        "https://www.example.com/",
+        mode="attributes",
+        dry_run=True,
+    )
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from html import escape, unescape
+
+from django.db import transaction
+
+from django_prose_editor.fields import prose_editor_fields
+from django_prose_editor.images import add_image_dimensions
+from django_prose_editor.stats import content_statistics
+from django_prose_editor.transforms import Transform, TransformPipeline
+
+
+#: Replace in text and attributes, only in text or only in attributes
+MODES = ("all", "text", "attributes")
+
+#: Attributes searched by default per tag
+DEFAULT_ATTRIBUTES = {
+    "a": ("href", "title"),
+    "img": ("src", "alt", "title"),
+}
+
+
+class ReplaceText(Transform):
+    """Replace matches of ``pattern`` in the text between tags."""
+
+    def __init__(self, pattern, replacement):
+        self.pattern = pattern
+        self.replacement = replacement
+        self.matches = 0
+
+    def text(self, data):
+        text, count = self.pattern.subn(self.replacement, unescape(data))
+        if not count:
+            return data
+        self.matches += count
+        return escape(text, quote=False).replace("\xa0", "&nbsp;")
+
+
+class ReplaceAttributes(Transform):
+    """Replace matches of ``pattern`` in the values of the given attributes."""
+
+    def __init__(self, pattern, replacement, attributes):
+        self.pattern = pattern
+        self.replacement = replacement
+        self.attributes = attributes
+        self.tags = tuple(attributes)
+        self.matches = 0
+
+    def element(self, element):
+        for name in self.attributes[element.tag]:
+            if value := element.attrs.get(name):
+                value, count = self.pattern.subn(self.replacement, value)
+                if count:
+                    self.matches += count
+                    element.attrs[name] = value
+
+
+class Replacer:
+    """
+    Callable returning the HTML with all replacements applied and the number
+    of replaced matches
+
+    ``find`` is a literal string unless ``regex`` is set, in which case
+    ``replace`` may contain group references such as ``\\1``.
+    """
+
+    def __init__(
+        self,
+        find,
+        replace,
+        *,
+        mode="all",
+        regex=False,
+        ignore_case=False,
+        attributes=None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, use one of {MODES}")
+        if not find:
+            raise ValueError("The search string must not be empty")
+
+        pattern = re.compile(
+            find if regex else re.escape(find), re.IGNORECASE if ignore_case else 0
+        )
+        replacement = replace if regex else lambda match: replace
+        self.transforms = []
+        if mode != "attributes":
+            self.transforms.append(ReplaceText(pattern, replacement))
+        if mode != "text":
+            self.transforms.append(
+                ReplaceAttributes(
+                    pattern,
+                    replacement,
+                    DEFAULT_ATTRIBUTES if attributes is None else attributes,
+                )
+            )
+        self.pipeline = TransformPipeline(self.transforms)
+
+    def __call__(self, html):
+        for transform in self.transforms:
+            transform.matches = 0
+        html = self.pipeline(html)
+        return html, sum(transform.matches for transform in self.transforms)
+
+
+@dataclass
+class ReplaceStats:
+    #: Number of rows with a non-empty value
+    rows: int = 0
+    #: Number of rows containing at least one match
+    changed: int = 0
+    #: Number of replaced matches
+    matches: int = 0
+
+    def __str__(self):
+        return (
+            f"{self.matches} matches in {self.changed} of {self.rows} rows"
+            if self.rows
+            else "No rows"
+        )
+
+
+_replacer = None
+
+
+def _init_worker(options):
+    global _replacer  # noqa: PLW0603
+    _replacer = Replacer(**options)
+
+
+def _replace_chunk(values):
+    return [_replacer(value) for value in values]
+
+
+def _write(field, rows, replace):
+    """
+    Write the replaced values of ``rows``, a list of ``(pk, value, html)``
+    tuples where ``value`` is the value the replacement has been applied to
+
+    Must be called in a transaction. The rows are locked and values which
+    have been changed in the meantime are replaced again using ``replace``
+    instead of being overwritten.
+    """
+    model = field.model
+    attname = field.attname
+    update_fields = [attname]
+    if field.stats_field:
+        update_fields.append(field.stats_field)
+
+    locked = list(
+        model._default_manager.select_for_update()
+        .filter(pk__in=[pk for pk, _value, _html in rows])
+        .values_list("pk", attname)
+    )
+    current = dict(
+        zip(
+            [pk for pk, _value in locked],
+            field.resolve_values([value for _pk, value in locked]),
+            strict=True,
+        )
+    )
+    values = {}
+    for pk, value, html in rows:
+        if not (current_value := current.get(pk)):
+            continue  # Deleted or emptied in the meantime
+        replaced = html
+        if current_value != value:
+            replaced, matches = replace(current_value)
+            if not matches:
+                continue
+        values[pk] = field.transform(field.sanitize(replaced))
+
+    if field.blobs or field.revisions:
+        # Blob references and revisions are maintained by signal handlers,
+        # image dimensions and statistics are added by pre_save
+        for instance in model._default_manager.filter(pk__in=values):
+            setattr(instance, attname, values[instance.pk])
+            instance.save(update_fields=update_fields)
+        return
+
+    objects = []
+    storage = field._image_storage()
+    for pk, value in values.items():
+        html = value
+        if field.image_dimensions and html:
+            html = add_image_dimensions(html, storage=storage)
+        instance = model(pk=pk, **{attname: html})
+        if field.stats_field:
+            setattr(instance, field.stats_field, content_statistics(html))
+        objects.append(instance)
+    model._default_manager.bulk_update(objects, update_fields)
+
+
+def replace_in_field(
+    field,
+    options,
+    *,
+    queryset=None,
+    dry_run=False,
+    chunk_size=500,
+    executor=None,
+    in_flight=1,
+):
+    """
+    Apply the replacement configured by ``options`` (the keyword arguments of
+    :class:`Replacer`) to all values of ``field`` and return
+    :class:`ReplaceStats`
+
+    ``executor`` is an optional ``ProcessPoolExecutor`` whose workers have
+    been initialized using ``_init_worker``, ``in_flight`` the number of
+    chunks submitted ahead. Changed rows are sanitized, transformed and
+    written in one transaction per chunk unless ``dry_run`` is set. The
+    statistics describe the values as they were read.
+    """
+    stats = ReplaceStats()
+    replacer = None if executor else Replacer(**options)
+
+    def replace(html):
+        # Values changed concurrently are replaced in this process
+        nonlocal replacer
+        if replacer is None:
+            replacer = Replacer(**options)
+        return replacer(html)
+
+    def process(chunk, results):
+        if executor:
+            results = results.result()
+        changed = []
+        for (pk, value), (html, matches) in zip(chunk, results, strict=True):
+            if matches:
+                stats.matches += matches
+                changed.append((pk, value, html))
+        stats.changed += len(changed)
+        if changed and not dry_run:
+            with transaction.atomic(using=field.model._default_manager.db):
+                _write(field, changed, replace)
+
+    # Process upcoming chunks while the results of the current chunk are
+    # being written
+    pending = deque()
+    for chunk in field.iter_values(queryset, chunk_size=chunk_size):
+        stats.rows += len(chunk)
+        values = [value for _pk, value in chunk]
+        if executor:
+            pending.append((chunk, executor.submit(_replace_chunk, values)))
+        else:
+            pending.append((chunk, [replacer(value) for value in values]))
+        if len(pending) > (in_flight if executor else 0):
+            process(*pending.popleft())
+    while pending:
+        process(*pending.popleft())
+    return stats
+
+
+def find_and_replace(
+    find,
+    replace,
+    *,
+    labels=(),
+    fields=None,
+    queryset=None,
+    dry_run=False,
+    chunk_size=500,
+    workers=None,
+    **options,
+):
+    """
+    Replace ``find`` with ``replace`` in all ``ProseEditorField`` values
+
+    The fields are restricted to the apps or models in ``labels`` or to the
+    list of ``(model, field)`` tuples in ``fields``. ``queryset`` restricts
+    the rows. The remaining keyword arguments (``mode``, ``regex``,
+    ``ignore_case`` and ``attributes``) are passed to :class:`Replacer`.
+    Values are processed in ``workers`` processes (one per CPU by default,
+    ``0`` processes them in the current process).
+
+    Returns a dictionary mapping ``app_label.ModelName.field`` to
+    :class:`ReplaceStats`.
+    """
+    options = {"find": find, "replace": replace, **options}
+    Replacer(**options)  # Validate the options before starting any workers
+
+    if fields is None:
+        fields = prose_editor_fields(labels)
+    if queryset is not None:
+        model = queryset.model._meta.concrete_model
+        fields = [(m, field) for m, field in fields if m is model]
+
+    in_flight = workers or os.cpu_count() or 1
+    executor = (
+        None
+        if workers == 0
+        else ProcessPoolExecutor(
+            in_flight, initializer=_init_worker, initargs=(options,)
+        )
+    )
+    try:
+        return {
+            f"{model._meta.label}.{field.name}": replace_in_field(
+                field,
+                options,
+                queryset=queryset,
+                dry_run=dry_run,
+                chunk_size=chunk_size,
+                executor=executor,
+                in_flight=in_flight,
+            )
+            for model, field in fields
+        }
+    finally:
+        if executor:
+            executor.shutdown()
@@ -0,0 +1,272 @@
+"""
+Revision history for prose editor content.
+
+Revisions are stored as block-level deltas against the previous revision.
+Every ``snapshot_interval`` revisions (or when a delta wouldn't be smaller
+than the content itself) a full snapshot is stored instead, which bounds the
+work required to reconstruct a revision.
+
+Usage::
+
+    class Article(models.Model):
+        content = ProseEditorField(
+            extensions={...},
+            sanitize=True,
+            revisions="app.ArticleRevision",
+        )
+
+    class ArticleRevision(AbstractProseRevision):
+        article = models.ForeignKey(
+            Article, on_delete=models.CASCADE, related_name="revisions"
+        )
+
+        class Meta(AbstractProseRevision.Meta):
+            constraints = (
+                models.UniqueConstraint(
+                    fields=["article", "field_name", "number"],
+                    name="unique_article_revision_number",
+                ),
+            )
+"""
+
+import json
+from difflib import SequenceMatcher
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+from django.utils.translation import gettext_lazy as _
+
+from django_prose_editor.blocks import iter_blocks
+from django_prose_editor.rendering import memoize
+
+
+#: Default number of revisions after which a full snapshot is stored.
+SNAPSHOT_INTERVAL = 20
+
+#: Number of attempts when concurrent saves try to record the same revision.
+RECORD_ATTEMPTS = 3
+
+
+def compute_delta(old_blocks, new_blocks):
+    """
+    Return a JSON-serializable list of operations transforming the list of
+    blocks ``old_blocks`` into ``new_blocks``
+
+    Operations are ``["=", count]`` (keep blocks), ``["-", count]`` (skip
+    blocks) and ``["+", [block, ...]]`` (insert blocks).
+    """
+    delta = []
+    matcher = SequenceMatcher(None, old_blocks, new_blocks, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append(["=", i2 - i1])
+            continue
+        if tag in {"delete", "replace"}:
+            delta.append(["-", i2 - i1])
+        if tag in {"insert", "replace"}:
+            delta.append(["+", new_blocks[j1:j2]])
+    return delta
+
+
+def apply_delta(blocks, delta):
+    """Apply a delta created by :func:`compute_delta` to a list of blocks."""
+    result = []
+    position = 0
+    for op, value in delta:
+        if op == "=":
+            result.extend(blocks[position : position + value])
+            position += value
+        elif op == "-":
+            position += value
+        else:
+            result.extend(value)
+    return result
+
+
+def _parent_field(revision_model):
+    fields = [
+        field
+        for field in revision_model._meta.concrete_fields
+        if isinstance(field, models.ForeignKey)
+    ]
+    if len(fields) != 1:
+        raise ImproperlyConfigured(
+            f"{revision_model._meta.label} must have exactly one foreign key"
+            " pointing to the model with the ProseEditorField."
+        )
+    return fields[0]
+
+
+class AbstractProseRevision(models.Model):
+    """
+    Base class for revision models
+
+    Subclasses have to add exactly one foreign key pointing to the model
+    containing the ``ProseEditorField`` and a unique constraint on this
+    foreign key, ``field_name`` and ``number``.
+    """
+
+    field_name = models.CharField(_("field name"), max_length=100)
+    number = models.PositiveIntegerField(_("number"))
+    # NULL marks delta revisions, an empty string is a snapshot of empty content
+    snapshot = models.TextField(_("snapshot"), null=True, blank=True)  # noqa: DJ001
+    delta = models.JSONField(_("delta"), null=True, blank=True)
+    created_at = models.DateTimeField(_("created at"), default=timezone.now)
+
+    class Meta:
+        abstract = True
+        ordering = ("field_name", "number")
+        verbose_name = _("revision")
+        verbose_name_plural = _("revisions")
+
+    def __str__(self):
+        return f"{self.field_name} #{self.number}"
+
+    def siblings(self):
+        """Return all revisions of the same object and field."""
+        parent = _parent_field(type(self))
+        return type(self)._default_manager.filter(
+            **{parent.attname: getattr(self, parent.attname)},
+            field_name=self.field_name,
+        )
+
+    def chain(self):
+        """
+        Return the revisions from the latest snapshot up to and including
+        this revision
+        """
+        if not hasattr(self, "_chain"):
+            if self.snapshot is not None:
+                self._chain = [self]
+            else:
+                siblings = self.siblings()
+                start = (
+                    siblings.filter(number__lt=self.number, snapshot__isnull=False)
+                    .order_by("-number")
+                    .values_list("number", flat=True)
+                    .first()
+                )
+                self._chain = [
+                    *siblings.filter(
+                        number__gte=start, number__lt=self.number
+                    ).order_by("number"),
+                    self,
+                ]
+        return self._chain
+
+    def get_content(self):
+        """Reconstruct the content of this revision."""
+        if not hasattr(self, "_content"):
+            blocks = []
+            for revision in self.chain():
+                if revision.snapshot is not None:
+                    blocks = list(iter_blocks(revision.snapshot))
+                else:
+                    blocks = apply_delta(blocks, revision.delta)
+            self._content = "".join(blocks)
+        return self._content
+
+
+def record_revision(instance, field_name, revision_model, *, snapshot_interval=None):
+    """
+    Store a new revision of ``instance.<field_name>`` if the content changed
+    since the latest revision
+
+    Returns the new revision or ``None``. The unique constraint on the number
+    of revisions makes concurrent saves fail; recording the revision is
+    retried on top of the revision which has been stored in the meantime.
+    """
+    if isinstance(revision_model, str):
+        revision_model = apps.get_model(revision_model)
+    snapshot_interval = snapshot_interval or SNAPSHOT_INTERVAL
+    for attempt in range(RECORD_ATTEMPTS):
+        try:
+            return _record_revision(
+                instance, field_name, revision_model, snapshot_interval
+            )
+        except IntegrityError:
+            if attempt == RECORD_ATTEMPTS - 1:
+                raise
+
+
+def _record_revision(instance, field_name, revision_model, snapshot_interval):
+    parent = _parent_field(revision_model)
+    content = getattr(instance, field_name) or ""
+
+    # select_for_update() only locks existing revisions, the unique constraint
+    # catches concurrent inserts of the next revision
+    with transaction.atomic(using=revision_model._default_manager.db):
+        latest = (
+            revision_model._default_manager.select_for_update()
+            .filter(**{parent.name: instance}, field_name=field_name)
+            .order_by("-number")
+            .first()
+        )
+        revision = revision_model(
+            **{parent.name: instance},
+            field_name=field_name,
+            number=latest.number + 1 if latest else 1,
+        )
+
+        if latest is None:
+            revision.snapshot = content
+        else:
+            previous = latest.get_content()
+            if previous == content:
+                return None
+
+            chain = latest.chain()
+            delta = compute_delta(
+                list(iter_blocks(previous)), list(iter_blocks(content))
+            )
+            if revision.number - chain[0].number >= snapshot_interval or len(
+                json.dumps(delta)
+            ) >= len(content):
+                revision.snapshot = content
+            else:
+                revision.delta = delta
+
+        revision.save()
+        revision._content = content
+        return revision
+
+
+def revision_diff(old, new):
+    """
+    Return HTML showing the block-level differences between two revisions
+
+    Removed blocks are wrapped in ``<del class="prose-diff">``, added blocks in
+    ``<ins class="prose-diff">``. The result is cached.
+    """
+
+    def render():
+        old_blocks = list(iter_blocks(old.get_content()))
+        new_blocks = list(iter_blocks(new.get_content()))
+        parts = []
+        matcher = SequenceMatcher(None, old_blocks, new_blocks, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                parts.extend(mark_safe(block) for block in new_blocks[j1:j2])
+                continue
+            if tag in {"delete", "replace"}:
+                parts.append(
+                    format_html(
+                        '<del class="prose-diff">{}</del>',
+                        mark_safe("".join(old_blocks[i1:i2])),
+                    )
+                )
+            if tag in {"insert", "replace"}:
+                parts.append(
+                    format_html(
+                        '<ins class="prose-diff">{}</ins>',
+                        mark_safe("".join(new_blocks[j1:j2])),
+                    )
+                )
+        return format_html_join("", "{}", ((part,) for part in parts))
+
+    key = f"django-prose-editor:revision-diff:{old._meta.label_lower}:{old.pk}:{new.pk}"
+    return memoize(key, render)
@@ -1,21 +1,21 @@
 from copy import deepcopy
 
 from django_prose_editor.fields import ProseEditorField, _actually_empty
+from django_prose_editor.sanitizers import DEFAULT_ATTRIBUTES, get_backend
 
 
-def _nh3_sanitizer():
-    import nh3  # noqa: PLC0415
-
-    attributes = deepcopy(nh3.ALLOWED_ATTRIBUTES)
+def _default_sanitizer():
+    attributes = deepcopy(DEFAULT_ATTRIBUTES)
     attributes["a"].add("target")
     attributes["ol"] |= {"start", "type"}
 
-    cleaner = nh3.Cleaner(attributes=attributes)
-    return lambda x: _actually_empty(cleaner.clean(x))
+    allowlist = {"attributes": attributes}
+    cleaner = get_backend(allowlist)(allowlist)
+    return lambda x: _actually_empty(cleaner(x))
 
 
 class SanitizedProseEditorField(ProseEditorField):
     def __init__(self, *args, **kwargs):
         if "sanitize" not in kwargs:
-            kwargs["sanitize"] = _nh3_sanitizer()
+            kwargs["sanitize"] = _default_sanitizer()
         super().__init__(*args, **kwargs)
@@ -0,0 +1,1039 @@
+"""
+Sanitizer backends.
+
+The allowlist generated by
+:func:`~django_prose_editor.config.allowlist_from_extensions` uses the
+keyword arguments of ``nh3.Cleaner``. Backends compile such an allowlist into
+a sanitizer:
+
+- ``nh3``: The recommended and by far the fastest backend. Supports all
+  options of ``nh3.Cleaner``.
+- ``lxml``: Parses the HTML using lxml (libxml2) and filters the tree in
+  Python. libxml2 doesn't build HTML5 trees, its output may contain nesting
+  which browsers parse differently (for example paragraphs inside
+  paragraphs). Only use it for trusted input.
+- ``python``: Parses the HTML using the standard library's ``html.parser``.
+  Slowest, but works without compiled dependencies.
+
+The ``lxml`` and ``python`` backends implement the options used by the
+extensions and serialize the result the same way nh3 does. They do not
+implement the full HTML5 tree construction algorithm though: The output is
+identical for the well-formed HTML produced by the editor, misnested markup
+may be repaired differently.
+
+nh3 is used unless a backend is configured using the
+``DJANGO_PROSE_EDITOR_SANITIZER_BACKEND`` setting (a backend name or the
+dotted path of a :class:`SanitizerBackend` subclass).
+"""
+
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+class SanitizerBackend:
+    """
+    Base class for sanitizer backends
+
+    Instances are created with the allowlist and sanitize HTML when called.
+    """
+
+    #: Name used in the ``DJANGO_PROSE_EDITOR_SANITIZER_BACKEND`` setting
+    name = None
+    #: Allowlist options supported by the backend
+    options = frozenset()
+    #: Whether the output is safe to use for untrusted input
+    untrusted_input = True
+
+    @classmethod
+    def available(cls):
+        return True
+
+    @classmethod
+    def version(cls):
+        return ""
+
+    @classmethod
+    def supports(cls, allowlist):
+        return set(allowlist) <= cls.options
+
+    def __init__(self, allowlist):
+        self.allowlist = allowlist
+
+    def __call__(self, html):
+        raise NotImplementedError
+
+
+class Nh3Backend(SanitizerBackend):
+    name = "nh3"
+    options = frozenset(
+        {
+            "tags",
+            "clean_content_tags",
+            "attributes",
+            "attribute_filter",
+            "strip_comments",
+            "link_rel",
+            "generic_attribute_prefixes",
+            "tag_attribute_values",
+            "set_tag_attribute_values",
+            "url_schemes",
+            "allowed_classes",
+            "filter_style_properties",
+            "url_relative",
+            "id_prefix",
+        }
+    )
+
+    @classmethod
+    def available(cls):
+        try:
+            import nh3  # noqa: F401, PLC0415
+        except ImportError:
+            return False
+        return True
+
+    @classmethod
+    def version(cls):
+        import nh3  # noqa: PLC0415
+
+        return nh3.__version__
+
+    def __init__(self, allowlist):
+        import nh3  # noqa: PLC0415
+
+        super().__init__(allowlist)
+        self.cleaner = nh3.Cleaner(**allowlist)
+
+    def __call__(self, html):
+        return self.cleaner.clean(html)
+
+
+# The defaults of ammonia, the library behind nh3
+DEFAULT_TAGS = frozenset(
+    [
+        "a",
+        "abbr",
+        "acronym",
+        "area",
+        "article",
+        "aside",
+        "b",
+        "bdi",
+        "bdo",
+        "blockquote",
+        "br",
+        "caption",
+        "center",
+        "cite",
+        "code",
+        "col",
+        "colgroup",
+        "data",
+        "dd",
+        "del",
+        "details",
+        "dfn",
+        "div",
+        "dl",
+        "dt",
+        "em",
+        "figcaption",
+        "figure",
+        "footer",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hgroup",
+        "hr",
+        "i",
+        "img",
+        "ins",
+        "kbd",
+        "li",
+        "map",
+        "mark",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "q",
+        "rp",
+        "rt",
+        "rtc",
+        "ruby",
+        "s",
+        "samp",
+        "small",
+        "span",
+        "strike",
+        "strong",
+        "sub",
+        "summary",
+        "sup",
+        "table",
+        "tbody",
+        "td",
+        "th",
+        "thead",
+        "time",
+        "tr",
+        "tt",
+        "u",
+        "ul",
+        "var",
+        "wbr",
+    ]
+)
+DEFAULT_ATTRIBUTES = {
+    "a": {"href", "hreflang"},
+    "bdo": {"dir"},
+    "blockquote": {"cite"},
+    "col": {"align", "char", "charoff", "span"},
+    "colgroup": {"align", "char", "charoff", "span"},
+    "del": {"cite", "datetime"},
+    "hr": {"align", "size", "width"},
+    "img": {"align", "alt", "height", "src", "width"},
+    "ins": {"cite", "datetime"},
+    "ol": {"start"},
+    "q": {"cite"},
+    "table": {"align", "char", "charoff", "summary"},
+    "tbody": {"align", "char", "charoff"},
+    "td": {"align", "char", "charoff", "colspan", "headers", "rowspan"},
+    "tfoot": {"align", "char", "charoff"},
+    "th": {"align", "char", "charoff", "colspan", "headers", "rowspan", "scope"},
+    "thead": {"align", "char", "charoff"},
+    "tr": {"align", "char", "charoff"},
+}
+DEFAULT_GENERIC_ATTRIBUTES = frozenset({"lang", "title"})
+DEFAULT_URL_SCHEMES = frozenset(
+    [
+        "bitcoin",
+        "ftp",
+        "ftps",
+        "geo",
+        "http",
+        "https",
+        "im",
+        "irc",
+        "ircs",
+        "magnet",
+        "mailto",
+        "mms",
+        "mx",
+        "news",
+        "nntp",
+        "openpgp4fpr",
+        "sip",
+        "sms",
+        "smsto",
+        "ssh",
+        "tel",
+        "url",
+        "webcal",
+        "wtai",
+        "xmpp",
+    ]
+)
+DEFAULT_CLEAN_CONTENT_TAGS = frozenset({"script", "style"})
+
+_VOID_ELEMENTS = frozenset(
+    [
+        "area",
+        "base",
+        "basefont",
+        "bgsound",
+        "br",
+        "col",
+        "embed",
+        "frame",
+        "hr",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    ]
+)
+# Elements containing text which is not parsed as markup but in which
+# character references are decoded
+_ESCAPABLE_RAW_TEXT_ELEMENTS = frozenset({"textarea", "title"})
+_RAW_TEXT_ELEMENTS = frozenset(
+    {
+        "iframe",
+        "noembed",
+        "noframes",
+        "noscript",
+        "plaintext",
+        "script",
+        "style",
+        "xmp",
+    }
+)
+_URL_ATTRIBUTES = {
+    "*": {"href", "src"},
+    "a": {"ping"},
+    "button": {"formaction"},
+    "form": {"action"},
+    "input": {"formaction"},
+    "object": {"data"},
+    "video": {"poster"},
+}
+# Elements of other namespaces inside these elements are removed
+_FOREIGN = frozenset({"math", "svg"})
+_SPECIAL_SCHEMES = frozenset({"ftp", "http", "https", "ws", "wss"})
+
+_C0_AND_SPACE = "".join(map(chr, range(0x21)))
+_incomplete_tag_re = re.compile(r"</?[a-zA-Z]")
+_scheme_re = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*):")
+_invalid_host_re = re.compile(r"[\x00-\x20#%/:<>?@\[\\\]^|]")
+
+
+def _escape_text(text):
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace("\xa0", "&nbsp;")
+    )
+
+
+def _escape_attribute(value):
+    return (
+        value.replace("&", "&amp;")
+        .replace('"', "&quot;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace("\xa0", "&nbsp;")
+    )
+
+
+def _url_allowed(url, schemes):
+    """
+    Approximate the URL check of ammonia: URLs without a scheme are allowed,
+    URLs with a scheme need an allowed scheme and a host if the scheme
+    requires one
+    """
+    url = url.strip(_C0_AND_SPACE)
+    url = url.replace("\t", "").replace("\n", "").replace("\r", "")
+    if not (match := _scheme_re.match(url)):
+        return True
+    scheme = match[1].lower()
+    if scheme not in schemes:
+        return False
+    if scheme in _SPECIAL_SCHEMES:
+        authority = url[match.end() :].lstrip("/\\")
+        host = re.split(r"[/?#\\]", authority, maxsplit=1)[0].rpartition("@")[2]
+        if host.startswith("["):
+            return host.rpartition("]")[0] != ""
+        host = host.partition(":")[0]
+        return bool(host) and not _invalid_host_re.search(host)
+    return True
+
+
+class Comment(str):
+    """Comment nodes of the trees built by the tree backends"""
+
+
+class Element:
+    """Element nodes of the trees built by the tree backends"""
+
+    __slots__ = ("attrs", "children", "tag")
+
+    def __init__(self, tag, attrs):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+
+
+class TreeBackend(SanitizerBackend):
+    """
+    Base class for backends which build a tree using :class:`Element` nodes,
+    text and :class:`Comment` strings and filter it while serializing
+    """
+
+    options = frozenset(
+        {
+            "tags",
+            "clean_content_tags",
+            "attributes",
+            "strip_comments",
+            "link_rel",
+            "generic_attribute_prefixes",
+            "tag_attribute_values",
+            "set_tag_attribute_values",
+            "url_schemes",
+        }
+    )
+
+    def __init__(self, allowlist):
+        super().__init__(allowlist)
+        self.tags = frozenset(allowlist.get("tags", DEFAULT_TAGS))
+        self.clean_content_tags = frozenset(
+            allowlist.get("clean_content_tags", DEFAULT_CLEAN_CONTENT_TAGS)
+        )
+        attributes = allowlist.get("attributes", DEFAULT_ATTRIBUTES)
+        generic = frozenset(attributes.get("*", DEFAULT_GENERIC_ATTRIBUTES))
+        self.attributes = {
+            tag: frozenset(attributes.get(tag, ())) | generic for tag in self.tags
+        }
+        self.generic_attribute_prefixes = tuple(
+            allowlist.get("generic_attribute_prefixes") or ()
+        )
+        self.tag_attribute_values = allowlist.get("tag_attribute_values") or {}
+        self.set_tag_attribute_values = allowlist.get("set_tag_attribute_values") or {}
+        self.url_schemes = frozenset(allowlist.get("url_schemes", DEFAULT_URL_SCHEMES))
+        self.link_rel = allowlist.get("link_rel", "noopener noreferrer")
+        self.strip_comments = allowlist.get("strip_comments", True)
+
+    def __call__(self, html):
+        html = html.replace("\r\n", "\n").replace("\r", "\n")
+        return self.serialize(self.parse(html))
+
+    def parse(self, html):
+        """Return the root :class:`Element` of the HTML fragment"""
+        raise NotImplementedError
+
+    def clean_attributes(self, tag, attrs):
+        allowed = self.attributes[tag]
+        values = self.tag_attribute_values.get(tag, {})
+        url_attributes = _URL_ATTRIBUTES["*"] | _URL_ATTRIBUTES.get(tag, set())
+        cleaned = {}
+        for name, value in attrs:
+            if name in cleaned:
+                continue
+            if not (
+                name in allowed
+                or name.startswith(self.generic_attribute_prefixes)
+                or value in values.get(name, ())
+            ):
+                continue
+            if name in url_attributes and not _url_allowed(value, self.url_schemes):
+                continue
+            cleaned[name] = value
+        cleaned.update(self.set_tag_attribute_values.get(tag, {}))
+        if tag == "a" and self.link_rel:
+            cleaned.pop("rel", None)
+            cleaned["rel"] = self.link_rel
+        return "".join(
+            f' {name}="{_escape_attribute(value)}"' for name, value in cleaned.items()
+        )
+
+    def children(self, node):
+        if node.tag in _FOREIGN:
+            return (child for child in node.children if type(child) is not Element)
+        return iter(node.children)
+
+    def serialize(self, root):
+        # Iterative to support arbitrarily deep documents
+        out = []
+        iterators = [iter(root.children)]
+        end_tags = [""]
+        raw = [False]
+        while iterators:
+            for node in iterators[-1]:
+                if type(node) is str:
+                    out.append(node if raw[-1] else _escape_text(node))
+                elif type(node) is Comment:
+                    if not self.strip_comments:
+                        out.append(f"<!--{node}-->")
+                elif node.tag in self.clean_content_tags:
+                    continue
+                elif node.tag not in self.tags:
+                    # Keep the content of elements which aren't allowed
+                    iterators.append(self.children(node))
+                    end_tags.append("")
+                    raw.append(False)
+                    break
+                else:
+                    tag = node.tag
+                    out.append(f"<{tag}{self.clean_attributes(tag, node.attrs)}>")
+                    if tag not in _VOID_ELEMENTS:
+                        iterators.append(self.children(node))
+                        end_tags.append(f"</{tag}>")
+                        raw.append(tag in _RAW_TEXT_ELEMENTS)
+                        break
+            else:
+                iterators.pop()
+                raw.pop()
+                out.append(end_tags.pop())
+        return "".join(out)
+
+
+# Elements which close an open <p> when started
+_CLOSES_P = frozenset(
+    [
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "center",
+        "details",
+        "dialog",
+        "dir",
+        "div",
+        "dl",
+        "dd",
+        "dt",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hgroup",
+        "hr",
+        "li",
+        "listing",
+        "main",
+        "menu",
+        "nav",
+        "ol",
+        "p",
+        "plaintext",
+        "pre",
+        "search",
+        "section",
+        "summary",
+        "table",
+        "ul",
+        "xmp",
+    ]
+)
+# Elements which may not be implicitly closed by unrelated end tags
+_SPECIAL = _CLOSES_P | frozenset(
+    [
+        "applet",
+        "area",
+        "base",
+        "basefont",
+        "bgsound",
+        "body",
+        "br",
+        "button",
+        "caption",
+        "col",
+        "colgroup",
+        "embed",
+        "frame",
+        "frameset",
+        "head",
+        "html",
+        "iframe",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "marquee",
+        "meta",
+        "noembed",
+        "noframes",
+        "noscript",
+        "object",
+        "param",
+        "script",
+        "select",
+        "source",
+        "style",
+        "tbody",
+        "td",
+        "template",
+        "textarea",
+        "tfoot",
+        "th",
+        "thead",
+        "title",
+        "tr",
+        "track",
+        "wbr",
+    ]
+)
+_FORMATTING = frozenset(
+    [
+        "a",
+        "b",
+        "big",
+        "code",
+        "em",
+        "font",
+        "i",
+        "nobr",
+        "s",
+        "small",
+        "strike",
+        "strong",
+        "tt",
+        "u",
+    ]
+)
+_HEADINGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+_TABLE_SECTIONS = frozenset({"tbody", "tfoot", "thead"})
+_TABLE_PARTS = frozenset(
+    {"caption", "col", "colgroup", "td", "th", "tr"} | _TABLE_SECTIONS
+)
+# Content of these elements is foster parented before the table
+_TABLE_CONTEXT = frozenset({"table", "tr"} | _TABLE_SECTIONS)
+
+_SCOPE = frozenset(
+    {"applet", "caption", "html", "marquee", "object", "table", "td", "template"}
+    | {"th"}
+    | _FOREIGN
+)
+_BUTTON_SCOPE = _SCOPE | {"button"}
+_LIST_SCOPE = _SCOPE | {"ol", "ul"}
+_TABLE_SCOPE = frozenset({"html", "table", "template"})
+# Elements which insert a marker into the list of active formatting elements
+_MARKERS = frozenset({"applet", "caption", "marquee", "object", "td", "th"})
+# Special elements which reopen formatting elements
+_RECONSTRUCT = frozenset(
+    {"applet", "area", "br", "embed", "img", "input", "keygen", "marquee", "object"}
+    | {"wbr"}
+)
+# Elements which end foreign content
+_BREAKOUT = frozenset(
+    [
+        "b",
+        "big",
+        "blockquote",
+        "body",
+        "br",
+        "center",
+        "code",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "em",
+        "embed",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "head",
+        "hr",
+        "i",
+        "img",
+        "li",
+        "listing",
+        "menu",
+        "meta",
+        "nobr",
+        "ol",
+        "p",
+        "pre",
+        "ruby",
+        "s",
+        "small",
+        "span",
+        "strike",
+        "strong",
+        "sub",
+        "sup",
+        "table",
+        "tt",
+        "u",
+        "ul",
+        "var",
+    ]
+)
+
+
+class _TreeBuilder(HTMLParser):
+    """
+    Builds a tree from a HTML fragment, implementing the parts of the HTML5
+    tree construction algorithm which matter for editor content: implicitly
+    closed paragraphs, list items and headings, reopened formatting elements,
+    implicit table bodies, foster parenting and leaving foreign content
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element(None, [])
+        self.stack = [self.root]
+        # Active formatting elements, None is a marker
+        self.formatting = []
+        self.strip_newline = False
+        self.escapable_raw_text = False
+        # Position of the outermost <svg> or <math> element in the stack
+        self.foreign_root = 1
+
+    def in_scope(self, tags, boundary=_SCOPE):
+        for node in reversed(self.stack):
+            if node.tag in tags:
+                return node
+            if node.tag in boundary:
+                return None
+        return None
+
+    def in_foreign_content(self):
+        root = self.foreign_root
+        return root < len(self.stack) and self.stack[root].tag in _FOREIGN
+
+    def leave_foreign_content(self):
+        while self.in_foreign_content():
+            self.stack.pop()
+
+    def pop_until(self, node):
+        while (popped := self.stack.pop()) is not node:
+            if popped.tag in _MARKERS:
+                self.clear_to_marker()
+        if node.tag in _MARKERS:
+            self.clear_to_marker()
+
+    def close_element(self, tags, boundary=_SCOPE):
+        if node := self.in_scope(tags, boundary):
+            self.pop_until(node)
+
+    def clear_to_marker(self):
+        while self.formatting and self.formatting.pop() is not None:
+            pass
+
+    def active_formatting(self, tag):
+        for entry in reversed(self.formatting):
+            if entry is None:
+                return None
+            if entry.tag == tag:
+                return entry
+        return None
+
+    def reconstruct(self):
+        # Reopen formatting elements which have been closed implicitly
+        index = len(self.formatting)
+        while index and (entry := self.formatting[index - 1]) is not None:
+            if entry in self.stack:
+                break
+            index -= 1
+        for i in range(index, len(self.formatting)):
+            entry = self.formatting[i]
+            self.formatting[i] = self.push(entry.tag, list(entry.attrs))
+
+    def foster_target(self):
+        # Returns the parent and index where fostered content is inserted
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == "table":
+                parent = self.stack[index - 1]
+                return parent, parent.children.index(self.stack[index])
+        return self.stack[-1], None
+
+    def insert(self, node, *, foster=False):
+        parent, index = self.foster_target() if foster else (self.stack[-1], None)
+        if index is None:
+            index = len(parent.children)
+        if (
+            type(node) is str
+            and index
+            and type(previous := parent.children[index - 1]) is str
+        ):
+            parent.children[index - 1] = previous + node
+        else:
+            parent.children.insert(index, node)
+
+    def push(self, tag, attrs):
+        element = Element(tag, attrs)
+        foster = self.stack[-1].tag in _TABLE_CONTEXT and tag not in _TABLE_PARTS
+        self.insert(element, foster=foster and tag not in {"script", "style"})
+        if tag not in _VOID_ELEMENTS:
+            if tag in _FOREIGN:
+                self.foreign_root = len(self.stack)
+            self.stack.append(element)
+        return element
+
+    def handle_starttag(self, tag, attrs):
+        self.strip_newline = False
+        attrs = [
+            (name, "" if value is None else value.replace("\0", "\ufffd"))
+            for name, value in attrs
+        ]
+
+        if self.in_foreign_content():
+            if tag not in _BREAKOUT:
+                self.stack.append(Element(tag, attrs))
+                self.stack[-2].children.append(self.stack[-1])
+                return
+            self.leave_foreign_content()
+
+        if tag in {"body", "head", "html"}:
+            return
+        if tag in _TABLE_PARTS:
+            if self.in_scope({"table"}, _TABLE_SCOPE):
+                self.start_table_part(tag, attrs)
+            return
+        if tag == "table" and self.stack[-1].tag in _TABLE_CONTEXT:
+            self.close_element({"table"}, _TABLE_SCOPE)
+
+        self.close_implied(tag)
+        if tag not in _SPECIAL or tag in _RECONSTRUCT:
+            self.reconstruct()
+        element = self.push(tag, attrs)
+        if tag in _FORMATTING:
+            self.formatting.append(element)
+        elif tag in _MARKERS:
+            self.formatting.append(None)
+
+        if tag in {"listing", "pre", "textarea"}:
+            self.strip_newline = True
+        if tag in _ESCAPABLE_RAW_TEXT_ELEMENTS:
+            self.escapable_raw_text = True
+            self.set_cdata_mode(tag)
+        elif tag in _RAW_TEXT_ELEMENTS:
+            self.set_cdata_mode(tag)
+
+    def close_implied(self, tag):
+        if tag in _CLOSES_P:
+            self.close_element({"p"}, _BUTTON_SCOPE)
+        if tag in _HEADINGS and self.stack[-1].tag in _HEADINGS:
+            self.stack.pop()
+        elif tag == "li":
+            self.close_item({"li"})
+        elif tag in {"dd", "dt"}:
+            self.close_item({"dd", "dt"})
+        elif tag == "a" and (node := self.active_formatting("a")):
+            if node in self.stack:
+                self.pop_until(node)
+            self.formatting.remove(node)
+
+    def start_table_part(self, tag, attrs):
+        self.close_element({"td", "th"}, _TABLE_SCOPE)
+        if tag in {"td", "th"}:
+            if self.stack[-1].tag == "table":
+                self.push("tbody", [])
+            if self.stack[-1].tag in _TABLE_SECTIONS:
+                self.push("tr", [])
+        elif tag == "tr":
+            self.close_element({"tr"}, _TABLE_SCOPE)
+            if self.stack[-1].tag == "table":
+                self.push("tbody", [])
+        else:
+            self.close_element({"tr"}, _TABLE_SCOPE)
+            self.close_element(_TABLE_SECTIONS | {"caption", "colgroup"}, _TABLE_SCOPE)
+        self.push(tag, attrs)
+        if tag in _MARKERS:
+            self.formatting.append(None)
+
+    def close_item(self, tags):
+        for node in reversed(self.stack):
+            if node.tag in tags:
+                self.pop_until(node)
+                break
+            if node.tag in _SPECIAL and node.tag not in {"address", "div", "p"}:
+                break
+        self.close_element({"p"}, _BUTTON_SCOPE)
+
+    def handle_startendtag(self, tag, attrs):
+        # The self-closing flag is only respected in foreign content
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_ELEMENTS and self.in_foreign_content():
+            self.stack.pop()
+            self.clear_cdata_mode()
+
+    def handle_endtag(self, tag):
+        self.strip_newline = False
+        self.escapable_raw_text = False
+        if tag in {"br", "p"}:
+            self.leave_foreign_content()
+        if tag in {"body", "head", "html"}:
+            return
+        if tag == "br":
+            self.handle_starttag("br", [])
+        elif tag == "p":
+            if not self.in_scope({"p"}, _BUTTON_SCOPE):
+                self.push("p", [])
+            self.close_element({"p"}, _BUTTON_SCOPE)
+        elif tag == "li":
+            self.close_element({"li"}, _LIST_SCOPE)
+        elif tag in _HEADINGS:
+            self.close_element(_HEADINGS)
+        elif tag in _TABLE_PARTS or tag == "table":
+            self.close_element({tag}, _TABLE_SCOPE)
+        elif tag in _FORMATTING and (node := self.active_formatting(tag)):
+            self.end_formatting(node)
+        elif tag in _SPECIAL:
+            self.close_element({tag})
+        else:
+            for node in reversed(self.stack):
+                if node.tag == tag:
+                    self.pop_until(node)
+                    break
+                if node.tag in _SPECIAL:
+                    break
+
+    def end_formatting(self, node):
+        # Misnested formatting elements are simply closed, the adoption
+        # agency algorithm isn't implemented
+        if self.in_scope({node.tag}) is node:
+            self.pop_until(node)
+        if node not in self.stack:
+            self.formatting.remove(node)
+
+    def handle_data(self, data):
+        if self.escapable_raw_text:
+            # html.parser doesn't decode references in CDATA mode
+            data = unescape(data)
+        data = data.replace("\0", "")
+        if self.strip_newline:
+            self.strip_newline = False
+            data = data.removeprefix("\n")
+        if not data:
+            return
+        if self.stack[-1].tag in _TABLE_CONTEXT:
+            self.insert(data, foster=not data.isspace())
+            return
+        if not self.in_foreign_content():
+            self.reconstruct()
+        self.insert(data)
+
+    def handle_comment(self, data):
+        self.strip_newline = False
+        self.insert(Comment(data))
+
+
+class PythonBackend(TreeBackend):
+    name = "python"
+
+    def parse(self, html):
+        builder = _TreeBuilder()
+        builder.feed(html)
+        # Tags which are cut off at the end are dropped
+        if _incomplete_tag_re.match(builder.rawdata):
+            builder.rawdata = ""
+        builder.close()
+        return builder.root
+
+
+class LxmlBackend(TreeBackend):
+    name = "lxml"
+    untrusted_input = False
+
+    @classmethod
+    def available(cls):
+        try:
+            import lxml.html  # noqa: F401, PLC0415
+        except ImportError:
+            return False
+        return True
+
+    @classmethod
+    def version(cls):
+        import lxml  # noqa: PLC0415
+
+        return lxml.__version__
+
+    def __init__(self, allowlist):
+        from lxml import etree, html  # noqa: PLC0415
+
+        super().__init__(allowlist)
+        self.etree = etree
+        self.fragment = html.fragment_fromstring
+
+    def parse(self, html):
+        if not html:
+            return Element(None, [])
+        parsed = self.fragment(html, create_parent="div")
+        # libxml2 drops whitespace in front of the first element
+        leading = html[: len(html) - len(html.lstrip(" \t\n\f"))]
+        if leading and not (parsed.text or "").startswith(leading):
+            parsed.text = leading + (parsed.text or "")
+
+        root = Element(None, [])
+        # Iterative to support arbitrarily deep documents
+        pending = [(parsed, root)]
+        while pending:
+            source, target = pending.pop()
+            text = source.text
+            if text and source.tag in {"listing", "pre", "textarea"}:
+                text = text.removeprefix("\n")
+            if text:
+                target.children.append(text)
+            for child in source:
+                if child.tag is self.etree.Comment:
+                    target.children.append(Comment(child.text or ""))
+                elif isinstance(child.tag, str):
+                    element = Element(child.tag, list(child.items()))
+                    target.children.append(element)
+                    pending.append((child, element))
+                if child.tail:
+                    target.children.append(child.tail)
+            if source.tag == "table":
+                target.children = _wrap_rows(target.children)
+        return root
+
+
+def _wrap_rows(children):
+    # libxml2 doesn't insert the implicit <tbody> element
+    wrapped = []
+    tbody = None
+    for child in children:
+        if type(child) is Element and child.tag == "tr":
+            if tbody is None:
+                tbody = Element("tbody", [])
+                wrapped.append(tbody)
+            tbody.children.append(child)
+        elif tbody is not None and type(child) is str and child.isspace():
+            tbody.children.append(child)
+        else:
+            tbody = None
+            wrapped.append(child)
+    return wrapped
+
+
+#: Backends in the order of preference
+BACKENDS = [Nh3Backend, LxmlBackend, PythonBackend]
+
+
+def configured_backend():
+    """
+    Return the backend class configured using
+    ``DJANGO_PROSE_EDITOR_SANITIZER_BACKEND`` or ``None``
+    """
+    if configured := getattr(settings, "DJANGO_PROSE_EDITOR_SANITIZER_BACKEND", None):
+        names = {backend.name: backend for backend in BACKENDS}
+        return names.get(configured) or import_string(configured)
+    return None
+
+
+def get_backend(allowlist):
+    """
+    Return the backend class configured using
+    ``DJANGO_PROSE_EDITOR_SANITIZER_BACKEND`` or nh3
+
+    Other backends are never selected automatically.
+    """
+    if backend := configured_backend():
+        if not backend.available():
+            raise ImproperlyConfigured(
+                f"The sanitizer backend {backend.name!r} isn't installed."
+            )
+        if not backend.supports(allowlist):
+            raise ImproperlyConfigured(
+                f"The sanitizer backend {backend.name!r} doesn't support the"
+                f" options {sorted(set(allowlist) - backend.options)}."
+            )
+        return backend
+
+    if Nh3Backend.available():
+        return Nh3Backend
+    raise ImportError(
+        "You need to install nh3 to use automatic sanitization. "
+        "Install django-prose-editor[sanitize] or pip install nh3, or select"
+        " another backend using DJANGO_PROSE_EDITOR_SANITIZER_BACKEND"
+    )
@@ -0,0 +1,32 @@
+// Generated by ./manage.py prose_compile_js_catalogs, do not edit.
+Object.assign((window.djangoProseEditorCatalog ||= {}), {
+  "Alternative Text": "Alternativer Text",
+  "Cancel": "Abbrechen",
+  "Caption": "Legende",
+  "Columns": "Spalten",
+  "Decimal numbers": "Dezimalzahlen",
+  "Edit Figure": "Bild bearbeiten",
+  "Edit HTML": "HTML bearbeiten",
+  "Edit Link": "Link bearbeiten",
+  "Image URL": "Bild-URL",
+  "Include header row": "Inklusive Kopfzeile",
+  "Insert": "Einfügen",
+  "Insert Figure": "Bild einfügen",
+  "Insert Table": "Tabelle einfügen",
+  "List properties": "Listen-Einstellungen",
+  "List type": "Listentyp",
+  "Lowercase Roman numerals": "Kleine römische Zahlen",
+  "Lowercase letters": "Kleinbuchstaben",
+  "Open in new window": "In neuem Fenster öffnen",
+  "Prettify": "Verschönern",
+  "Rows": "Zeilen",
+  "Start at": "Starten mit",
+  "Table Properties": "Tabellen-Einstellungen",
+  "The HTML contents of the editor. Note that the allowed HTML is restricted by the editor schema.": "Der HTML-Inhalt des Editors. Das HTML wird immer noch durch das Editor-Schema eingeschränkt.",
+  "Title": "Titel",
+  "Toggle fullscreen": "Vollbild umschalten",
+  "URL": "URL",
+  "Update": "Aktualisieren",
+  "Uppercase Roman numerals": "Grosse römische Zahlen",
+  "Uppercase letters": "Grossbuchstaben"
+})
@@ -0,0 +1,104 @@
+"""
+Content statistics for HTML produced by the prose editor.
+
+The statistics are computed using the HTML parser from the standard library
+so that no additional dependencies are required.
+"""
+
+import math
+from html.parser import HTMLParser
+
+
+#: Reading speed used for calculating the reading time.
+WORDS_PER_MINUTE = 200
+
+#: Tags which separate words even when no whitespace is present in the HTML.
+BLOCK_TAGS = {
+    "blockquote",
+    "br",
+    "div",
+    "figcaption",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "table",
+    "td",
+    "th",
+    "tr",
+    "ul",
+}
+
+
+class _ContentParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.images = []
+        self.links = []
+        self.headings = []
+        self._heading = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.parts.append(" ")
+        if tag == "img":
+            self.images.append(dict(attrs).get("src") or "")
+        elif tag == "a" and (href := dict(attrs).get("href")):
+            self.links.append(href)
+        elif len(tag) == 2 and tag[0] == "h" and tag[1] in "123456":
+            self._heading = (int(tag[1]), [])
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self.parts.append(" ")
+        if self._heading and tag == f"h{self._heading[0]}":
+            level, parts = self._heading
+            self.headings.append((level, " ".join("".join(parts).split())))
+            self._heading = None
+
+    def handle_data(self, data):
+        self.parts.append(data)
+        if self._heading:
+            self._heading[1].append(data)
+
+
+def parse_content(html):
+    """
+    Parse HTML and return a parser instance with the extracted ``parts``,
+    ``images``, ``links`` and ``headings`` attributes.
+    """
+    parser = _ContentParser()
+    parser.feed(html or "")
+    parser.close()
+    return parser
+
+
+def content_text(html):
+    """Return the whitespace-normalized text content of the HTML."""
+    return " ".join("".join(parse_content(html).parts).split())
+
+
+def content_statistics(html):
+    """
+    Return a JSON-serializable dictionary of statistics for the HTML.
+
+    The dictionary contains the number of ``words``, the ``reading_time`` in
+    minutes (rounded up) and the number of ``images`` and ``links``.
+    """
+    parser = parse_content(html)
+    words = len("".join(parser.parts).split())
+    return {
+        "words": words,
+        "reading_time": math.ceil(words / WORDS_PER_MINUTE),
+        "images": len(parser.images),
+        "links": len(parser.links),
+    }
@@ -0,0 +1,19 @@
+from django import template
+
+from django_prose_editor.rendering import render_prose
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def prose_render(html, *transforms, excerpt=None):
+    """
+    Render stored prose content using the named transforms, caching the
+    result::
+
+        {% load prose_editor %}
+        {% prose_render article.content "noopener" "lazy_images" %}
+        {% prose_render article.content excerpt=30 %}
+    """
+    return render_prose(html, transforms=transforms, excerpt=excerpt)
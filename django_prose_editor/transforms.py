@@ -0,0 +1,291 @@
+"""
+Post-sanitization transforms for prose editor HTML.
+
+Transforms register callbacks for elements (by tag name) and for text. A
+pipeline tokenizes the document once using a regular expression and runs all
+callbacks while doing so. The tokenizer expects well-formed HTML such as the
+output of nh3.
+"""
+
+import re
+from html import escape, unescape
+
+from django.utils.text import slugify
+
+
+class Element:
+    """
+    An element passed to :meth:`Transform.element`
+
+    ``attrs`` is a dictionary which may be modified in place. ``text`` is the
+    unescaped text content of the element if the transform sets
+    ``needs_text``, ``None`` otherwise. ``state`` is a dictionary which is
+    shared by all elements of a single document.
+    """
+
+    __slots__ = ("attrs", "state", "tag", "text")
+
+    def __init__(self, tag, attrs, state, text=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.state = state
+        self.text = text
+
+
+class Transform:
+    """
+    Base class for transforms
+
+    Subclasses list the tags they are interested in in ``tags`` and modify
+    the attributes of those elements in :meth:`element`. Transforms setting
+    ``needs_text`` receive the text content of the element too; the element
+    extends to the first matching end tag, so this should only be used for
+    elements such as headings which don't contain elements of the same type.
+
+    :meth:`text` receives the text of the document as escaped HTML and
+    returns the replacement. Text inside ``<pre>`` and ``<code>`` elements is
+    left alone.
+    """
+
+    tags = ()
+    needs_text = False
+
+    def element(self, element):
+        pass
+
+    def text(self, data):
+        return data
+
+
+class AddLinkRel(Transform):
+    """Add tokens such as ``noopener`` to the ``rel`` attribute of links."""
+
+    tags = ("a",)
+
+    def __init__(self, rel="noopener"):
+        self.rel = rel.split()
+
+    def element(self, element):
+        rel = (element.attrs.get("rel") or "").split()
+        if missing := [token for token in self.rel if token not in rel]:
+            element.attrs["rel"] = " ".join([*rel, *missing])
+
+
+class LazyImages(Transform):
+    """Add ``loading="lazy"`` to images unless they specify a loading mode."""
+
+    tags = ("img",)
+
+    def element(self, element):
+        element.attrs.setdefault("loading", "lazy")
+
+
+class HeadingIds(Transform):
+    """Add unique slugified ``id`` attributes to headings."""
+
+    tags = ("h1", "h2", "h3", "h4", "h5", "h6")
+    needs_text = True
+
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+
+    def element(self, element):
+        if element.attrs.get("id"):
+            return
+        seen = element.state.setdefault(self, {})
+        slug = f"{self.prefix}{slugify(element.text) or 'section'}"
+        if count := seen.get(slug):
+            seen[slug] = count + 1
+            slug = f"{slug}-{count}"
+        else:
+            seen[slug] = 1
+        element.attrs["id"] = slug
+
+
+class NormalizeNbsp(Transform):
+    """
+    Replace lone non-breaking spaces with regular spaces
+
+    Sequences of non-breaking spaces or non-breaking spaces next to regular
+    whitespace are left alone since those are probably intentional.
+    """
+
+    _re = re.compile(r"(?<!\s)(?<!&nbsp;)(?:&nbsp;|\xa0)(?!\s|&nbsp;)")
+
+    def text(self, data):
+        if "&nbsp;" not in data and "\xa0" not in data:
+            return data
+        return self._re.sub(" ", data)
+
+
+_attrs_pattern = r"""([^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*)"""
+_token_pattern = (
+    r"<!--.*?-->"
+    rf"|<({{text_tags}})(?=[\s/>]){_attrs_pattern}>(.*?)</\1\s*>"
+    rf"|<({{tags}})(?=[\s/>]){_attrs_pattern}>"
+)
+# Matches all other tags, only used when text is transformed
+_other_tags_pattern = r"""|<(/?)([^\s/>]*)[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>"""
+_tag_re = re.compile(r"<!--.*?-->|<[^>]*>", re.DOTALL)
+_attr_re = re.compile(
+    r"""([^\s"'=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?"""
+)
+
+
+def _parse_attrs(source):
+    attrs = {}
+    for match in _attr_re.finditer(source):
+        name, double, single, unquoted = match.groups()
+        value = (
+            double if double is not None else single if single is not None else unquoted
+        )
+        if value is not None and "&" in value:
+            value = unescape(value)
+        attrs.setdefault(name.lower(), value)
+    return attrs
+
+
+def _attributes(attrs):
+    return "".join(
+        f" {name}" if value is None else f' {name}="{escape(value)}"'
+        for name, value in attrs
+    )
+
+
+def _element(tag, attrs, transforms, state, source, text=None):
+    original = attrs.copy()
+    for transform in transforms:
+        transform.element(Element(tag, attrs, state, text))
+    if attrs == original:
+        return source
+    if original.items() <= attrs.items():
+        # Attributes have only been added, keep the original start tag
+        added = _attributes(item for item in attrs.items() if item[0] not in original)
+        if source.endswith("/>"):
+            return f"{source[:-2].rstrip()}{added} />"
+        return f"{source[:-1]}{added}>"
+    return f"<{tag}{_attributes(attrs.items())}>"
+
+
+# Text inside these elements is left alone by text transforms
+_RAW_TEXT_TAGS = frozenset(("code", "pre"))
+
+
+class TransformPipeline:
+    """
+    Run a list of transforms over HTML
+
+    The document is tokenized using a regular expression which only matches
+    the start tags element transforms are interested in (and the content of
+    elements whose text is required). When text transforms are present all
+    other tags are matched too, and the text between the tags is transformed
+    during the same pass unless it is inside ``<pre>`` or ``<code>``.
+    Instances are callables receiving and returning HTML, so they can be used
+    everywhere where a sanitizer function is accepted.
+    """
+
+    def __init__(self, transforms):
+        self.transforms = list(transforms)
+        self.element_transforms = {}
+        for transform in self.transforms:
+            for tag in transform.tags:
+                self.element_transforms.setdefault(tag, []).append(transform)
+        self.text_transforms = [
+            transform
+            for transform in self.transforms
+            if type(transform).text is not Transform.text
+        ]
+        # Only the tags element transforms are interested in are tokenized
+        # unless the text between all tags is required.
+        text_tags = {
+            tag
+            for tag, transforms in self.element_transforms.items()
+            if any(transform.needs_text for transform in transforms)
+        }
+        self.token_re = re.compile(
+            _token_pattern.format(
+                text_tags="|".join(sorted(map(re.escape, text_tags))) or "(?!)",
+                tags="|".join(
+                    sorted(map(re.escape, self.element_transforms.keys() - text_tags))
+                )
+                or "(?!)",
+            )
+            + (_other_tags_pattern if self.text_transforms else ""),
+            re.DOTALL | re.IGNORECASE,
+        )
+
+    def text(self, data):
+        """Apply the text transforms to the escaped text ``data``."""
+        for transform in self.text_transforms:
+            data = transform.text(data)
+        return data
+
+    def __call__(self, html, state=None):
+        """
+        Transform the HTML
+
+        ``state`` is shared by all elements of a document. Pass the same
+        dictionary when transforming a document in several parts, for example
+        block by block, so that e.g. heading IDs stay unique.
+        """
+        if not html or not self.transforms:
+            return html
+        state = {} if state is None else state
+        # Number of open <pre> and <code> elements
+        state.setdefault(_RAW_TEXT_TAGS, 0)
+        return self._transform(html, state)
+
+    def _transform(self, html, state):
+        parts = []
+        position = 0
+        for match in self.token_re.finditer(html):
+            if position < match.start():
+                parts.append(self._text(html[position : match.start()], state))
+            parts.append(self._token(match, html, state))
+            position = match.end()
+        if not parts:
+            return self._text(html, state)
+        if position < len(html):
+            parts.append(self._text(html[position:], state))
+        return "".join(parts)
+
+    def _text(self, data, state):
+        if not self.text_transforms or state[_RAW_TEXT_TAGS]:
+            return data
+        return self.text(data)
+
+    def _token(self, match, html, state):
+        text_tag, text_source, content, tag, source, *other = match.groups()
+        if other and other[1] is not None:
+            end, name = other
+            if name.lower() in _RAW_TEXT_TAGS:
+                state[_RAW_TEXT_TAGS] = max(
+                    0, state[_RAW_TEXT_TAGS] + (-1 if end else 1)
+                )
+            return match[0]
+        if tag:
+            tag = tag.lower()
+            if tag in _RAW_TEXT_TAGS and not match[0].endswith("/>"):
+                state[_RAW_TEXT_TAGS] += 1
+            return _element(
+                tag, _parse_attrs(source), self.element_transforms[tag], state, match[0]
+            )
+        if text_tag is None:
+            # Comment
+            return match[0]
+
+        tag = text_tag.lower()
+        raw = tag in _RAW_TEXT_TAGS
+        state[_RAW_TEXT_TAGS] += raw
+        # Transform the descendants first, for example links in headings
+        content = self._transform(content, state)
+        state[_RAW_TEXT_TAGS] -= raw
+        start = _element(
+            tag,
+            _parse_attrs(text_source),
+            self.element_transforms[tag],
+            state,
+            html[match.start() : match.start(3)],
+            unescape(_tag_re.sub("", content)),
+        )
+        return f"{start}{content}{html[match.end(3) : match.end()]}"
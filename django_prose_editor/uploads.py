@@ -0,0 +1,237 @@
+"""
+Chunked image uploads for the ``Figure`` extension.
+
+The client sends the file in chunks using ``POST`` requests with a
+``Content-Range`` header. Chunks are appended to a file in a staging
+directory on disk while they are received, so neither the view nor the
+client ever hold the complete file in memory. The staging file is locked
+while a chunk is written, so retried or duplicated chunks arriving at the
+same time are written once. When the last chunk has been
+received the file is saved to the configured storage. The dimensions are
+read from the image header; thumbnails are generated in a thread pool after
+responding.
+
+Include the URLs and pass the upload URL to the extension::
+
+    urlpatterns = [
+        path("prose-editor/", include("django_prose_editor.urls")),
+    ]
+
+    content = ProseEditorField(
+        extensions={
+            "Figure": {"uploadUrl": reverse_lazy("django_prose_editor:upload")},
+        },
+    )
+"""
+
+import logging
+import os
+import re
+import secrets
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import cache
+from hashlib import sha256
+from pathlib import Path, PurePosixPath
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.files import File, locks
+from django.core.files.storage import storages
+from django.db import connections
+from django.http import JsonResponse
+from django.utils.text import get_valid_filename
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_POST
+
+from django_prose_editor.images import (
+    MAX_WORKERS,
+    ResponsiveImages,
+    cache_dimensions,
+    read_image_size,
+)
+
+
+logger = logging.getLogger(__name__)
+
+#: Default options, may be overridden using the
+#: ``DJANGO_PROSE_EDITOR_UPLOADS`` setting.
+UPLOADS_DEFAULTS = {
+    # Alias of the storage receiving the uploaded images
+    "storage": "default",
+    # Directory in the storage, formatted using strftime()
+    "upload_to": "prose-editor/%Y/%m/",
+    # Maximum size of uploaded files in bytes
+    "max_size": 20 * 1024 * 1024,
+    # Permission required for uploading; staff users may upload if None
+    "permission": None,
+    # Widths of the thumbnails generated after uploading, the widths of the
+    # responsive images settings are used if None
+    "thumbnail_widths": None,
+}
+
+#: Suffixes of accepted files.
+IMAGE_SUFFIXES = {".gif", ".jpeg", ".jpg", ".png", ".webp"}
+
+#: Partial uploads older than this number of seconds are removed.
+STALE_UPLOAD_AGE = 86400
+
+_content_range_re = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+_upload_id_re = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+_read_size = 64 * 1024
+
+
+def upload_options():
+    return UPLOADS_DEFAULTS | getattr(settings, "DJANGO_PROSE_EDITOR_UPLOADS", {})
+
+
+@cache
+def executor():
+    """Return the thread pool used for generating thumbnails."""
+    return ThreadPoolExecutor(MAX_WORKERS, thread_name_prefix="prose-editor-upload")
+
+
+def staging_directory():
+    path = Path(
+        settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir(),
+        "django-prose-editor-uploads",
+    )
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _staging_path(request, upload):
+    # Uploads are bound to the user so that IDs cannot be hijacked
+    key = f"{request.user.pk}:{upload}:{settings.SECRET_KEY}"
+    return staging_directory() / sha256(key.encode()).hexdigest()
+
+
+def _remove_stale_uploads():
+    threshold = time.time() - STALE_UPLOAD_AGE
+    for path in staging_directory().iterdir():
+        try:
+            if path.stat().st_mtime < threshold:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def _has_permission(user, options):
+    if options["permission"]:
+        return user.has_perm(options["permission"])
+    return user.is_active and user.is_staff
+
+
+def _error(message, status=400, **kwargs):
+    return JsonResponse({"error": message, **kwargs}, status=status)
+
+
+def _generate_thumbnails(src, widths):
+    responsive = ResponsiveImages()
+    try:
+        for width in widths or responsive.widths:
+            responsive.thumbnail_url(src, width)
+    except Exception:
+        logger.exception("Generating thumbnails of %s failed", src)
+    finally:
+        connections.close_all()
+
+
+def _save(fp, filename, options):
+    storage = storages[options["storage"]]
+    directory = datetime.now().strftime(options["upload_to"])
+    # Only the header is read, the rest of the file is streamed to the
+    # storage by save()
+    fp.seek(0)
+    if not (dimensions := read_image_size(fp)):
+        return _error(_("The file isn't a supported image."))
+    fp.seek(0)
+    name = storage.save(
+        storage.generate_filename(
+            str(PurePosixPath(directory, get_valid_filename(filename)))
+        ),
+        File(fp),
+    )
+    src = storage.url(name)
+    width, height = dimensions
+    cache_dimensions(src, dimensions, storage=storage)
+
+    widths = options["thumbnail_widths"]
+    if widths or ResponsiveImages().thumbnail:
+        executor().submit(_generate_thumbnails, src, widths)
+    return {"src": src, "width": width, "height": height}
+
+
+@require_POST
+def upload_image(request):
+    """
+    Receive a chunk of an image upload
+
+    The request body contains the chunk, the ``Content-Range`` header its
+    position in the file (``bytes <start>-<end>/<size>``), the
+    ``X-Upload-Name`` header the URL-encoded filename and ``X-Upload-Id`` the
+    ID returned by the response to the first chunk. Responses contain the
+    ``upload`` ID and the ``offset`` of the next chunk; the response to the
+    last chunk additionally contains the ``src``, ``width`` and ``height`` of
+    the image. A chunk not starting at the expected offset is answered with
+    status 409 and the expected ``offset`` so that the client can resume.
+    """
+    options = upload_options()
+    if not _has_permission(request.user, options):
+        return _error(_("You are not allowed to upload images."), status=403)
+
+    if not (match := _content_range_re.match(request.headers.get("Content-Range", ""))):
+        return _error(_("Invalid Content-Range header."))
+    start, end, size = map(int, match.groups())
+    if end < start or end >= size:
+        return _error(_("Invalid Content-Range header."))
+    if size > options["max_size"]:
+        return _error(_("The file is too large."), status=413)
+
+    filename = unquote(request.headers.get("X-Upload-Name", ""))
+    if os.path.splitext(filename)[1].lower() not in IMAGE_SUFFIXES:
+        return _error(_("The file isn't a supported image."))
+
+    upload = request.headers.get("X-Upload-Id")
+    if not upload and start == 0:
+        upload = secrets.token_urlsafe(16)
+        _remove_stale_uploads()
+    if not upload or not _upload_id_re.match(upload):
+        return _error(_("Invalid upload ID."))
+
+    path = _staging_path(request, upload)
+    if start and not path.exists():
+        return _error(_("Unexpected chunk."), status=409, upload=upload, offset=0)
+
+    with open(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), "r+b") as fp:
+        # Requests for the same upload wait here until the chunk received by
+        # the current request has been written
+        locks.lock(fp, locks.LOCK_EX)
+        offset = fp.seek(0, os.SEEK_END)
+        if start != offset:
+            return _error(
+                _("Unexpected chunk."), status=409, upload=upload, offset=offset
+            )
+
+        # Stream the chunk to the staging file
+        remaining = end - start + 1
+        while remaining and (data := request.read(min(remaining, _read_size))):
+            fp.write(data)
+            remaining -= len(data)
+        if remaining:
+            fp.truncate(offset)
+            return _error(_("Incomplete chunk."), upload=upload, offset=offset)
+
+        offset = end + 1
+        if offset < size:
+            return JsonResponse({"upload": upload, "offset": offset})
+
+        try:
+            result = _save(fp, filename, options)
+        finally:
+            path.unlink(missing_ok=True)
+    if isinstance(result, JsonResponse):
+        return result
+    return JsonResponse({"upload": upload, "offset": offset, **result})
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from django_prose_editor.uploads import upload_image
+
+
+app_name = "django_prose_editor"
+urlpatterns = [
+    path("upload/", upload_image, name="upload"),
+]
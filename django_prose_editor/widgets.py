@@ -1,117 +1,300 @@
+import hashlib
 import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache, lru_cache
 
 from django import forms
 from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.utils.html import json_script
+from django.utils.translation import get_language
 from js_asset import JS, importmap, static_lazy
 
-from django_prose_editor.config import expand_extensions, js_from_extensions
+from django_prose_editor.catalogs import catalog_path
+from django_prose_editor.compression import (
+    UndecompressedValue,
+    decompress_submitted,
+    is_compressed,
+)
+from django_prose_editor.config import (
+    FrozenConfig,
+    expand_extensions,
+    freeze_config,
+    js_from_extensions,
+)
+from django_prose_editor.profiling import measure
 
 
-importmap.update(
-    {
-        "imports": {
-            "django-prose-editor/editor": static_lazy("django_prose_editor/editor.js"),
-            "django-prose-editor/configurable": static_lazy(
-                "django_prose_editor/configurable.js"
-            ),
+@cache
+def register_importmap():
+    """
+    Add the editor modules to the ``js_asset`` importmap
+
+    This happens when the media of a widget is used for the first time or
+    when the app is ready if the ``js_asset.context_processors.importmap``
+    context processor is used, but not when importing this module.
+    """
+    importmap.update(
+        {
+            "imports": {
+                "django-prose-editor/editor": static_lazy(
+                    "django_prose_editor/editor.js"
+                ),
+                "django-prose-editor/configurable": static_lazy(
+                    "django_prose_editor/configurable.js"
+                ),
+            }
         }
-    }
-)
+    )
 
-#: These three module-level variables are somewhat part of the API.
-prose_editor_js = JS("django_prose_editor/editor.js", {"type": "module"})
-prose_editor_base_media = forms.Media(
-    css={
-        "all": [
-            "django_prose_editor/material-icons.css",
-            "django_prose_editor/editor.css",
-        ]
-    },
-    js=[
-        # We don't really need this since editor.js will be loaded
-        # in default.js (or other presets' modules) anyway, but keeping
-        # the tag around helps the browser discover and load this
-        # module a little bit earlier.
-        prose_editor_js,
-    ],
-)
-prose_editor_admin_media = (
-    forms.Media(
-        js=[importmap, prose_editor_js]
-    )  # Sneak the importmap into the admin <head>
-    + prose_editor_base_media
-    + forms.Media(
+
+@cache
+def _prose_editor_js():
+    return JS("django_prose_editor/editor.js", {"type": "module"})
+
+
+@cache
+def _prose_editor_base_media():
+    return forms.Media(
         css={
             "all": [
-                "django_prose_editor/editor.css",  # For the ordering
-                "django_prose_editor/overrides.css",
+                "django_prose_editor/material-icons.css",
+                "django_prose_editor/editor.css",
             ]
-        }
+        },
+        js=[
+            # We don't really need this since editor.js will be loaded
+            # in default.js (or other presets' modules) anyway, but keeping
+            # the tag around helps the browser discover and load this
+            # module a little bit earlier.
+            _prose_editor_js(),
+        ],
     )
-)
+
+
+@cache
+def _prose_editor_admin_media():
+    register_importmap()
+    return (
+        forms.Media(
+            js=[importmap, _prose_editor_js()]
+        )  # Sneak the importmap into the admin <head>
+        + _prose_editor_base_media()
+        + forms.Media(
+            css={
+                "all": [
+                    "django_prose_editor/editor.css",  # For the ordering
+                    "django_prose_editor/overrides.css",
+                ]
+            }
+        )
+    )
+
+
+#: These three module-level variables are somewhat part of the API. They are
+#: created on first access so that importing this module stays cheap.
+_lazy_attributes = {
+    "prose_editor_js": _prose_editor_js,
+    "prose_editor_base_media": _prose_editor_base_media,
+    "prose_editor_admin_media": _prose_editor_admin_media,
+}
+
+
+def __getattr__(name):
+    if factory := _lazy_attributes.get(name):
+        return factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def prose_editor_presets():
     return getattr(settings, "DJANGO_PROSE_EDITOR_PRESETS", {}) | {
         "default": [
-            prose_editor_js,
+            _prose_editor_js(),
             JS("django_prose_editor/default.js", {"type": "module"}),
         ],
         "configurable": [
-            prose_editor_js,
+            _prose_editor_js(),
             JS("django_prose_editor/configurable.js", {"type": "module"}),
         ],
     }
 
 
-def prose_editor_media(*, base=prose_editor_base_media, preset="default"):
+@cache
+def _prose_editor_catalog_media(language):
+    path = catalog_path(language)
+    return forms.Media(js=[path] if path else [])
+
+
+def prose_editor_media(*, base=None, preset="default"):
     """
     Utility for returning a ``forms.Media`` instance containing everything you
     need to initialize a prose editor in the frontend (hopefully!)
+
+    ``base`` defaults to ``prose_editor_base_media``. The static translation
+    catalog for the active language is included as well.
     """
-    return base + forms.Media(js=[prose_editor_js, *prose_editor_presets()[preset]])
+    register_importmap()
+    if base is None:
+        base = _prose_editor_base_media()
+    return (
+        _prose_editor_catalog_media(get_language())
+        + base
+        + forms.Media(js=[_prose_editor_js(), *prose_editor_presets()[preset]])
+    )
+
+
+_shared_configs = ContextVar("django_prose_editor_shared_configs", default=None)
+
+
+@contextmanager
+def shared_config_scope():
+    """
+    Emit each distinct widget configuration only once while active
+
+    Widgets rendered inside the scope reference their configuration by the
+    ID of a ``<script type="application/json">`` element which is only
+    rendered alongside the first widget using the configuration. The scope
+    has to cover everything which ends up in the same HTML document, e.g.
+    the whole request as in
+    :class:`django_prose_editor.middleware.SharedConfigMiddleware`.
+
+    Yields a dictionary mapping the IDs of the emitted configurations to
+    their JSON-encoded data.
+    """
+    emitted = {}
+    token = _shared_configs.set(emitted)
+    try:
+        yield emitted
+    finally:
+        _shared_configs.reset(token)
+
+
+#: Presets whose JavaScript supports configurations referenced by ID
+SHARED_CONFIG_PRESETS = {"default", "configurable"}
+
+_LEGACY_DEFAULT_CONFIG = freeze_config(
+    {
+        "types": None,
+        "history": True,
+        "html": True,
+        "typographic": True,
+    }
+)
+
+
+def _expand_config(config):
+    return config | {
+        "extensions": expand_extensions(config["extensions"]),
+        "js_modules": js_from_extensions(config["extensions"]),
+    }
+
+
+def _cacheable(config):
+    if not isinstance(config, FrozenConfig):
+        return False
+    try:
+        hash(config)
+    except TypeError:  # The configuration contains unhashable values
+        return False
+    return True
+
+
+@lru_cache(maxsize=128)
+def _expand_frozen_config(config):
+    return freeze_config(_expand_config(config))
+
+
+def _serialize_config(config):
+    data = json.dumps(config, separators=(",", ":"), cls=DjangoJSONEncoder)
+    digest = hashlib.sha256(data.encode()).hexdigest()[:16]
+    return data, f"prose-editor-config-{digest}"
+
+
+@lru_cache(maxsize=128)
+def _serialize_frozen_config(config, language):
+    # The language is a part of the key because the configuration may contain
+    # lazy translations
+    return _serialize_config(config)
+
+
+def _clear_frozen_configs(*, setting, **kwargs):
+    # The expanded configuration contains the JavaScript modules of custom
+    # extensions, which are read from the settings
+    if setting.startswith("DJANGO_PROSE_EDITOR_"):
+        _expand_frozen_config.cache_clear()
+        _serialize_frozen_config.cache_clear()
+
+
+setting_changed.connect(_clear_frozen_configs)
 
 
 class ProseEditorWidget(forms.Textarea):
+    template_name = "django_prose_editor/widgets/prose_editor.html"
+
     def __init__(self, *args, **kwargs):
-        self.config = kwargs.pop("config", {})
+        self.config = freeze_config(kwargs.pop("config", {}))
         self.preset = kwargs.pop("preset", "default")
+        self.compress = kwargs.pop("compress", None)
         super().__init__(*args, **kwargs)
 
     @property
     def media(self):
-        return prose_editor_media(preset=self.preset)
+        with measure("media"):
+            return prose_editor_media(preset=self.preset)
 
     def get_config(self):
-        config = self.config or {
-            "types": None,
-            "history": True,
-            "html": True,
-            "typographic": True,
-        }
+        config = self.config or _LEGACY_DEFAULT_CONFIG
 
         # New-style config with "extensions" key
         if isinstance(config, dict) and "extensions" in config:
-            config = config | {
-                "extensions": expand_extensions(config["extensions"]),
-                "js_modules": js_from_extensions(config["extensions"]),
-            }
+            if _cacheable(config):
+                # Expanded once and shared by all widgets using the config
+                return _expand_frozen_config(config)
+            config = _expand_config(config)
 
         return config
 
     def get_context(self, name, value, attrs):
         context = super().get_context(name, value, attrs)
-        context["widget"]["attrs"][f"data-django-prose-editor-{self.preset}"] = (
-            json.dumps(self.get_config(), separators=(",", ":"), cls=DjangoJSONEncoder)
-        )
+        with measure("widget"):
+            config = self.get_config()
+            if _cacheable(config):
+                data, config_id = _serialize_frozen_config(config, get_language())
+            else:
+                data, config_id = _serialize_config(config)
+
+            emitted = _shared_configs.get()
+            if emitted is not None and self.preset in SHARED_CONFIG_PRESETS:
+                if config_id not in emitted:
+                    emitted[config_id] = data
+                    context["widget"]["config_script"] = json_script(config, config_id)
+                data = f"#{config_id}"
+
+            context["widget"]["attrs"][f"data-django-prose-editor-{self.preset}"] = data
+            if self.compress:
+                context["widget"]["attrs"]["data-django-prose-editor-compress"] = (
+                    self.compress["threshold"]
+                )
         return context
 
+    def value_from_datadict(self, data, files, name):
+        value = super().value_from_datadict(data, files, name)
+        if self.compress and is_compressed(value):
+            try:
+                return decompress_submitted(data, value, self.compress)
+            except ValueError as exc:
+                # Rejected by the form field
+                return UndecompressedValue(value, exc)
+        return value
+
 
 class AdminProseEditorWidget(ProseEditorWidget):
     @property
     def media(self):
-        return prose_editor_media(
-            base=prose_editor_admin_media,
-            preset=self.preset,
-        )
+        with measure("media"):
+            return prose_editor_media(
+                base=_prose_editor_admin_media(),
+                preset=self.preset,
+            )
@@ -0,0 +1,89 @@
+// Prefix of compressed values, see django_prose_editor.compression
+const PREFIX = "data:application/gzip;base64,"
+
+const compressedTextareas = new WeakMap()
+
+/**
+ * Return a data: URL containing the gzipped value
+ */
+export const compressValue = async (value) => {
+  const stream = new Blob([value])
+    .stream()
+    .pipeThrough(new CompressionStream("gzip"))
+  const blob = await new Response(stream).blob()
+  return new Promise((resolve, reject) => {
+    const reader = new FileReader()
+    reader.onload = () =>
+      resolve(PREFIX + reader.result.slice(reader.result.indexOf(",") + 1))
+    reader.onerror = () => reject(reader.error)
+    reader.readAsDataURL(blob)
+  })
+}
+
+const onSubmit = async (event) => {
+  const form = event.target
+  if (event.defaultPrevented || form.dataset.proseEditorCompressing) return
+
+  const textareas = [...compressedTextareas.get(form)].filter(
+    (textarea) =>
+      textarea.form === form &&
+      textarea.name &&
+      !textarea.disabled &&
+      textarea.value.length >=
+        Number(textarea.dataset.djangoProseEditorCompress),
+  )
+  if (!textareas.length) return
+
+  // Compress asynchronously and submit the form again afterwards
+  event.preventDefault()
+  const values = await Promise.all(
+    textareas.map((textarea) => compressValue(textarea.value).catch(() => null)),
+  )
+
+  // The textareas keep their value so that nothing changes if the
+  // submission is canceled; the compressed values are submitted using
+  // hidden inputs instead.
+  const swapped = []
+  textareas.forEach((textarea, index) => {
+    const value = values[index]
+    if (value === null || value.length >= textarea.value.length) return
+    const input = Object.assign(document.createElement("input"), {
+      type: "hidden",
+      name: textarea.name,
+      value,
+    })
+    textarea.after(input)
+    swapped.push([textarea, textarea.name, input])
+    textarea.removeAttribute("name")
+  })
+
+  // The form data set is constructed synchronously when submitting
+  form.dataset.proseEditorCompressing = "true"
+  try {
+    form.requestSubmit(event.submitter)
+  } finally {
+    delete form.dataset.proseEditorCompressing
+    for (const [textarea, name, input] of swapped) {
+      textarea.name = name
+      input.remove()
+    }
+  }
+}
+
+/**
+ * Compress the value of the textarea when submitting its form if the value
+ * is longer than the threshold in the data-django-prose-editor-compress
+ * attribute
+ *
+ * Values are submitted uncompressed if the browser doesn't support the
+ * CompressionStream API.
+ */
+export const compressOnSubmit = (textarea) => {
+  const form = textarea.form
+  if (!form || !window.CompressionStream) return
+  if (!compressedTextareas.has(form)) {
+    compressedTextareas.set(form, new Set())
+    form.addEventListener("submit", onSubmit)
+  }
+  compressedTextareas.get(form).add(textarea)
+}
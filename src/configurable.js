@@ -2,6 +2,7 @@ import * as editorModule from "django-prose-editor/editor"
 import {
   createTextareaEditor,
   initializeEditors,
+  parseEditorConfig,
 } from "django-prose-editor/editor"
 
 const marker = "data-django-prose-editor-configurable"
@@ -39,7 +40,7 @@ async function loadExtensionModules(moduleUrls) {
 async function createEditorAsync(textarea, config = null) {
   if (textarea.closest(".prose-editor")) return null
 
-  config = config || JSON.parse(textarea.getAttribute(marker) || "{}")
+  config = config || parseEditorConfig(textarea, marker)
 
   if (config.js_modules?.length) {
     await loadExtensionModules(config.js_modules)
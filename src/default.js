@@ -19,6 +19,7 @@ import {
   NoSpellCheck,
   OrderedList,
   Paragraph,
+  parseEditorConfig,
   Strike,
   Subscript,
   Superscript,
@@ -37,7 +38,7 @@ function createEditor(textarea, config = null) {
   if (textarea.closest(".prose-editor")) return
 
   if (!config) {
-    config = JSON.parse(textarea.getAttribute(marker))
+    config = parseEditorConfig(textarea, marker)
   }
 
   // Default extension types (table explicitly excluded)
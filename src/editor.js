@@ -33,6 +33,7 @@ export {
   TrailingNode,
 } from "@tiptap/extensions"
 export { Plugin } from "@tiptap/pm/state"
+export { compressOnSubmit, compressValue } from "./compress.js"
 export { Caption, Figure } from "./figure.js"
 export { Fullscreen } from "./fullscreen.js"
 export * from "./history.js"
@@ -46,9 +47,11 @@ export * as pm from "./pm.js"
 export { Table } from "./table.js"
 export { TextClass } from "./textClass.js"
 export { Typographic } from "./typographic.js"
+export { uploadFile } from "./upload.js"
 export * from "./utils.js"
 
 import { Editor } from "@tiptap/core"
+import { compressOnSubmit } from "./compress.js"
 import { crel } from "./utils.js"
 
 export function createTextareaEditor(textarea, extensions) {
@@ -60,6 +63,10 @@ export function createTextareaEditor(textarea, extensions) {
   textarea.before(element)
   element.append(textarea)
 
+  if (textarea.hasAttribute("data-django-prose-editor-compress")) {
+    compressOnSubmit(textarea)
+  }
+
   const editor = new Editor({
     element,
     editable: !disabled,
@@ -1,4 +1,6 @@
 import { canInsertNode, mergeAttributes, Node } from "@tiptap/core"
+import { Mapping } from "@tiptap/pm/transform"
+import { uploadFile } from "./upload.js"
 import { gettext, updateAttrsDialog } from "./utils.js"
 
 /**
@@ -11,6 +13,13 @@ export const Figure = Node.create({
   draggable: true,
   isolating: true,
 
+  addOptions() {
+    return {
+      // URL of the upload view, see django_prose_editor.uploads
+      uploadUrl: "",
+    }
+  },
+
   addAttributes() {
     return {
       class: {
@@ -79,6 +88,9 @@ export const Figure = Node.create({
           let currentImageSrc = ""
           let currentImageAlt = ""
           let currentCaption = ""
+          // Position of the edited figure, mapped through the edits which
+          // happen while the dialog is open or the image is being uploaded
+          let figurePos = null
 
           if (isEditingFigure) {
             // Get the selected figure node
@@ -95,6 +107,7 @@ export const Figure = Node.create({
               const node = $from.node(depth)
               if (node.type.name === "figure") {
                 figureNode = node
+                figurePos = $from.before(depth)
 
                 // Find the child nodes (image and caption)
                 node.forEach((child, _, _i) => {
@@ -128,12 +141,24 @@ export const Figure = Node.create({
           }
 
           // Define dialog properties
+          const { uploadUrl } = this.options
           const figureDialogProperties = {
+            ...(uploadUrl
+              ? {
+                  imageFile: {
+                    type: "string",
+                    title: gettext("Upload image"),
+                    format: "file",
+                    accept: "image/gif,image/jpeg,image/png,image/webp",
+                  },
+                }
+              : {}),
             imageUrl: {
               type: "string",
               title: gettext("Image URL"),
               format: "url",
-              required: true,
+              // The URL is filled in after uploading the file
+              required: !uploadUrl,
             },
             altText: {
               type: "string",
@@ -166,76 +191,98 @@ export const Figure = Node.create({
             dialogOptions,
           )
 
-          dialogFn(editor, initialAttrs).then((attrs) => {
+          const applyAttrs = async (attrs) => {
             if (!attrs) return true // Cancelled but command is considered successful
 
-            const imageUrl = attrs.imageUrl.trim()
+            let imageUrl = attrs.imageUrl.trim()
+            // Intrinsic dimensions of uploaded images; the dimensions of
+            // replaced images are unknown
+            let dimensions =
+              isEditingFigure && imageUrl !== currentImageSrc
+                ? { width: null, height: null }
+                : {}
+            if (attrs.imageFile) {
+              try {
+                const { src, width, height } = await uploadFile(
+                  uploadUrl,
+                  attrs.imageFile,
+                )
+                imageUrl = src
+                dimensions = { width, height }
+              } catch (error) {
+                window.alert(`${gettext("Upload failed")}: ${error.message}`)
+                return true
+              }
+            }
             const imageAlt = attrs.altText.trim()
             const captionText = attrs.caption.trim()
 
+            // The document may have changed in the meantime, find the figure
+            // in the current state
+            let figure = null
+            if (isEditingFigure && figurePos !== null) {
+              const { pos, deleted } = mapping.mapResult(figurePos, 1)
+              const node = deleted ? null : editor.state.doc.nodeAt(pos)
+              if (node?.type.name === "figure") {
+                figure = { node, pos }
+              }
+            }
+
             if (imageUrl) {
-              if (isEditingFigure) {
-                // Then update the image source - find the image node within the figure
-                const { selection } = state
-                const { $from } = selection
-
-                for (let depth = $from.depth; depth > 0; depth--) {
-                  const node = $from.node(depth)
-                  if (node.type.name === "figure") {
-                    // Find positions of image and caption
-                    let imagePos = null
-                    let captionPos = null
-                    const pos = $from.start(depth)
-
-                    node.forEach((child, offset) => {
-                      if (child.type.name === "image") {
-                        imagePos = pos + offset
-                      } else if (child.type.name === "caption") {
-                        captionPos = pos + offset
-                      }
+              if (figure) {
+                // Find positions of image and caption in the figure
+                const { node } = figure
+                let imagePos = null
+                let captionPos = null
+                const pos = figure.pos + 1
+
+                node.forEach((child, offset) => {
+                  if (child.type.name === "image") {
+                    imagePos = pos + offset
+                  } else if (child.type.name === "caption") {
+                    captionPos = pos + offset
+                  }
+                })
+
+                let chain = editor.chain()
+
+                // Update image source
+                if (imagePos !== null) {
+                  chain = chain
+                    .setNodeSelection(imagePos)
+                    .updateAttributes("image", {
+                      src: imageUrl,
+                      alt: imageAlt,
+                      ...dimensions,
                     })
+                }
 
-                    let chain = editor.chain()
-
-                    // Update image source
-                    if (imagePos !== null) {
-                      chain = chain
-                        .setNodeSelection(imagePos)
-                        .updateAttributes("image", {
-                          src: imageUrl,
-                          alt: imageAlt,
-                        })
-                    }
-
-                    if (captionText) {
-                      const content = {
-                        type: "caption",
-                        content: [{ type: "text", text: captionText }],
-                      }
-                      if (captionPos) {
-                        chain = chain
-                          .setNodeSelection(captionPos)
-                          .insertContent(content)
-                      } else {
-                        chain = chain.insertContentAt(imagePos + 1, content)
-                      }
-                    } else if (captionPos) {
-                      chain = chain
-                        .setNodeSelection(captionPos)
-                        .deleteSelection()
-                    }
-
-                    chain.run()
-
-                    break
+                if (captionText) {
+                  const content = {
+                    type: "caption",
+                    content: [{ type: "text", text: captionText }],
+                  }
+                  if (captionPos) {
+                    chain = chain
+                      .setNodeSelection(captionPos)
+                      .insertContent(content)
+                  } else {
+                    chain = chain.insertContentAt(imagePos + 1, content)
                   }
+                } else if (captionPos) {
+                  chain = chain
+                    .setNodeSelection(captionPos)
+                    .deleteSelection()
                 }
+
+                chain.run()
               } else {
-                // Insert a new figure
+                // Insert a new figure (also if the edited figure has been
+                // removed in the meantime)
                 const content = [
                   {
                     type: "image",
-                    attrs: { src: imageUrl, alt: imageAlt },
+                    attrs: { src: imageUrl, alt: imageAlt, ...dimensions },
                   },
                 ]
                 if (captionText) {
@@ -261,6 +308,20 @@ export const Figure = Node.create({
               }
             }
             return true
+          }
+
+          const mapping = new Mapping()
+          const trackChanges = ({ transaction }) => {
+            mapping.appendMapping(transaction.mapping)
+          }
+          editor.on("transaction", trackChanges)
+
+          dialogFn(editor, initialAttrs).then(async (attrs) => {
+            try {
+              return await applyAttrs(attrs)
+            } finally {
+              editor.off("transaction", trackChanges)
+            }
           })
 
           // Return true as the dialog is async, and we've already checked permissions
@@ -0,0 +1,54 @@
+import { gettext } from "./utils.js"
+
+const csrfToken = () =>
+  document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/)?.[1] ||
+  document.querySelector("[name=csrfmiddlewaretoken]")?.value ||
+  ""
+
+/**
+ * Upload a file in chunks to the upload view of django-prose-editor
+ *
+ * Only one chunk is held in memory at a time. Chunks which weren't accepted
+ * are resent starting at the offset returned by the server. Resolves to the
+ * response to the last chunk containing the src, width and height of the
+ * image.
+ */
+export const uploadFile = async (
+  url,
+  file,
+  { chunkSize = 1024 * 1024, onProgress = null } = {},
+) => {
+  if (!file.size) throw new Error(gettext("The file is empty."))
+
+  let upload = ""
+  let offset = 0
+  while (true) {
+    const chunk = file.slice(offset, offset + chunkSize)
+    const response = await fetch(url, {
+      method: "POST",
+      credentials: "same-origin",
+      headers: {
+        "Content-Type": "application/octet-stream",
+        "Content-Range": `bytes ${offset}-${offset + chunk.size - 1}/${file.size}`,
+        "X-CSRFToken": csrfToken(),
+        "X-Upload-Id": upload,
+        "X-Upload-Name": encodeURIComponent(file.name),
+      },
+      body: chunk,
+    })
+    const data = await response.json().catch(() => ({}))
+    if (response.status === 409 && data.upload) {
+      // Resume at the offset expected by the server
+      upload = data.upload
+      offset = data.offset
+      continue
+    }
+    if (!response.ok) {
+      throw new Error(data.error || response.statusText)
+    }
+    upload = data.upload
+    offset = data.offset
+    onProgress?.(offset, file.size)
+    if (data.src) return data
+  }
+}
@@ -13,7 +13,38 @@ export const crel = (tagName, attributes = null, children = []) => {
   return dom
 }
 
-export const gettext = window.gettext || ((s) => s)
+/**
+ * Translate the string using the static catalog shipped with
+ * django-prose-editor, falling back to Django's JavaScript catalog
+ *
+ * Both catalogs are looked up when the function is called, so they may be
+ * loaded after this module.
+ */
+export const gettext = (s) =>
+  window.djangoProseEditorCatalog?.[s] ||
+  (window.gettext ? window.gettext(s) : s)
+
+const sharedConfigs = new Map()
+
+/**
+ * Return the configuration stored in the textarea's marker attribute
+ *
+ * The attribute either contains the JSON-encoded configuration or a
+ * reference such as "#prose-editor-config-<hash>" to a
+ * <script type="application/json"> element. Referenced configurations are
+ * parsed once and shared between all textareas referencing them.
+ */
+export const parseEditorConfig = (textarea, marker) => {
+  const value = textarea.getAttribute(marker)
+  if (!value?.startsWith("#")) return JSON.parse(value || "{}")
+
+  const id = value.slice(1)
+  if (!sharedConfigs.has(id)) {
+    const script = document.getElementById(id)
+    sharedConfigs.set(id, JSON.parse(script?.textContent || "{}"))
+  }
+  return sharedConfigs.get(id)
+}
 
 const formFieldForProperty = (name, config, attrValue, id) => {
   const label = crel("label", {
@@ -49,6 +80,13 @@ const formFieldForProperty = (name, config, attrValue, id) => {
     textarea.addEventListener("input", () => {
       widget.dataset.value = textarea.value
     })
+  } else if (config.format === "file") {
+    widget = crel("input", {
+      id,
+      name,
+      type: "file",
+      accept: config.accept || "",
+    })
   } else if (config.enum) {
     widget = crel(
       "select",
@@ -83,6 +121,9 @@ const valueForFormField = (name, config, form) => {
   if (config.type === "boolean") {
     return !!form[name].checked
   }
+  if (config.format === "file") {
+    return form[name].files[0] || null
+  }
   return form[name].value
 }
 
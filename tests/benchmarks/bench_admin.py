@@ -0,0 +1,171 @@
+"""
+Render admin change forms with many prose editor inline rows.
+
+Measures the server render time, the HTML payload size and the number of
+queries of the change form of ``testapp.Article`` with N section and note
+inline rows, with and without the ``SharedConfigMiddleware``. The time spent
+in widget config serialization and media assembly is reported as well and
+checked against generous budgets; the command exits with status 1 if a
+budget is exceeded. The test suite only checks counts, queries and bytes
+since wall-clock budgets are flaky on shared CI machines.
+
+Run with ``python tests/benchmarks/bench_admin.py [--json] [rows ...]``.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testapp.settings")
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+
+from django_prose_editor.profiling import collect_timings
+
+
+SECTION = (
+    "<h2>Section {i}</h2><p>Lorem ipsum <strong>dolor</strong> sit amet,"
+    ' <a href="https://example.com/{i}">consectetur</a> adipiscing elit.</p>'
+    "<ul><li><p>One</p></li><li><p>Two</p></li></ul>"
+)
+NOTE = "<p>Note {i} with a <strong>bold</strong> remark.</p>"
+
+#: Budget for serializing the config of one widget in milliseconds.
+WIDGET_BUDGET_MS = 1
+#: Budget for assembling the media of the whole change form in milliseconds.
+MEDIA_BUDGET_MS = 50
+
+SHARED_CONFIG_MIDDLEWARE = [
+    "django_prose_editor.middleware.SharedConfigMiddleware",
+    *settings.MIDDLEWARE,
+]
+
+
+def create_article(rows):
+    """Create an article with ``rows`` editors split between both inlines."""
+    from testapp.models import Article, ArticleNote, ArticleSection  # noqa: PLC0415
+
+    article = Article.objects.create(title=f"{rows} rows")
+    sections = rows - rows // 2
+    ArticleSection.objects.bulk_create(
+        ArticleSection(article=article, ordering=i, content=SECTION.format(i=i))
+        for i in range(sections)
+    )
+    ArticleNote.objects.bulk_create(
+        ArticleNote(article=article, content=NOTE.format(i=i))
+        for i in range(rows - sections)
+    )
+    return article
+
+
+def render_change_form(client, article):
+    """
+    Render the change form once and return a dictionary containing the
+    ``seconds``, ``bytes``, ``queries`` and prose editor ``timings``
+    """
+    url = f"/admin/testapp/article/{article.pk}/change/"
+    with (
+        CaptureQueriesContext(connection) as queries,
+        collect_timings() as timings,
+    ):
+        start = time.perf_counter()
+        response = client.get(url)
+        seconds = time.perf_counter() - start
+    assert response.status_code == 200, response.status_code
+    return {
+        "seconds": seconds,
+        "bytes": len(response.content),
+        "queries": len(queries),
+        "editors": response.content.count(b"data-django-prose-editor-"),
+        "timings": {
+            name: {"ms": seconds * 1000, "count": count}
+            for name, (seconds, count) in timings.items()
+        },
+    }
+
+
+def exceeded_budgets(result):
+    """Return a list of messages describing the budgets ``result`` exceeds."""
+    messages = []
+    widget = result["timings"].get("widget", {"ms": 0, "count": 0})
+    if widget["count"] and widget["ms"] / widget["count"] >= WIDGET_BUDGET_MS:
+        messages.append(
+            f"{result['rows']} rows: {widget['ms'] / widget['count']:.2f} ms per"
+            f" widget config (budget {WIDGET_BUDGET_MS} ms)"
+        )
+    media = result["timings"].get("media", {"ms": 0})
+    if media["ms"] >= MEDIA_BUDGET_MS:
+        messages.append(
+            f"{result['rows']} rows: {media['ms']:.2f} ms for media"
+            f" (budget {MEDIA_BUDGET_MS} ms)"
+        )
+    return messages
+
+
+def benchmark(client, article, *, repeat=5):
+    # Keep the fastest run, the other values are the same for every run
+    runs = [render_change_form(client, article) for _ in range(repeat)]
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def main():
+    args = sys.argv[1:]
+    as_json = "--json" in args
+    rows = [int(arg) for arg in args if arg != "--json"] or [1, 10, 100, 300]
+
+    django.setup()
+    setup_test_environment()
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+    from django.contrib.auth.models import User  # noqa: PLC0415
+
+    user = User.objects.create_superuser("admin", "admin@example.com")
+
+    results = []
+    for n in rows:
+        article = create_article(n)
+        for shared in (False, True):
+            middleware = SHARED_CONFIG_MIDDLEWARE if shared else settings.MIDDLEWARE
+            with override_settings(MIDDLEWARE=middleware):
+                # The client loads the middleware when it is used first
+                client = Client()
+                client.force_login(user)
+                result = benchmark(client, article)
+            results.append({"rows": n, "shared_config": shared, **result})
+
+    exceeded = [message for result in results for message in exceeded_budgets(result)]
+    if as_json:
+        print(json.dumps(results, indent=2))
+        sys.exit(1 if exceeded else 0)
+
+    print(
+        f"{'rows':>5} {'shared':>6} {'ms':>8} {'KiB':>8} {'B/editor':>9}"
+        f" {'queries':>7} {'widget ms':>9} {'media ms':>8} {'media n':>7}"
+    )
+    for result in results:
+        timings = result["timings"]
+        widget = timings.get("widget", {"ms": 0})
+        media = timings.get("media", {"ms": 0, "count": 0})
+        print(
+            f"{result['rows']:>5} {result['shared_config']!s:>6}"
+            f" {result['seconds'] * 1000:8.1f} {result['bytes'] / 1024:8.1f}"
+            f" {result['bytes'] / max(result['editors'], 1):9.0f}"
+            f" {result['queries']:>7} {widget['ms']:9.2f}"
+            f" {media['ms']:8.2f} {media['count']:>7}"
+        )
+    for message in exceeded:
+        print(f"Budget exceeded: {message}")
+    sys.exit(1 if exceeded else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Measure the editor performance in the browser using Playwright.
+
+Loads pages with 1, 50 and 300 editors containing a 1 KB document and pages
+with one editor containing documents from 1 KB to 5 MB. Records the editor
+initialization time, the time to interactive, the keystroke-to-paint
+latency, the cost of ``editor.getHTML()`` and the JS heap size using the
+Performance API. The results are written as JSON to
+``test-results/browser-benchmark.json`` (or ``$BENCHMARK_OUTPUT``) so that
+builds can be compared.
+
+Run with ``pytest tests/benchmarks/bench_browser.py --browser chromium``.
+The JS heap size is only available in Chromium.
+"""
+
+import hashlib
+import json
+import os
+import platform
+from pathlib import Path
+
+import pytest
+
+
+# Set Django async unsafe to allow database operations in tests
+os.environ.setdefault("DJANGO_ALLOW_ASYNC_UNSAFE", "true")
+
+KB = 1024
+
+#: (editors, document size) combinations
+SCENARIOS = [
+    (1, KB),
+    (50, KB),
+    (300, KB),
+    (1, 100 * KB),
+    (1, 1024 * KB),
+    (1, 5 * 1024 * KB),
+]
+
+#: Number of keystrokes for measuring the latency
+KEYSTROKES = 30
+
+#: Number of getHTML() calls per editor
+GET_HTML_REPEAT = 5
+
+#: Time without long tasks after which the page is considered interactive
+QUIET_WINDOW_MS = 1000
+
+
+START_KEYSTROKES = """
+(count) => {
+  window.proseBenchmarkKeystrokes = new Promise((resolve) => {
+    const editor = window.proseBenchmark.editors[0]
+    const latencies = []
+    const listener = (e) => {
+      const start = e.timeStamp
+      // The frame after the next animation frame has been painted
+      requestAnimationFrame(() => setTimeout(() => {
+        latencies.push(performance.now() - start)
+        if (latencies.length === count) {
+          editor.view.dom.removeEventListener("keydown", listener, true)
+          resolve(latencies)
+        }
+      }))
+    }
+    editor.view.dom.addEventListener("keydown", listener, true)
+    editor.commands.focus("end")
+  })
+}
+"""
+
+MEASURE_GET_HTML = """
+(repeat) => {
+  const durations = []
+  for (const editor of window.proseBenchmark.editors) {
+    for (let i = 0; i < repeat; ++i) {
+      const start = performance.now()
+      editor.getHTML()
+      durations.push(performance.now() - start)
+    }
+  }
+  return durations
+}
+"""
+
+COLLECT = """
+() => {
+  const navigation = performance.getEntriesByType("navigation")[0]
+  const ready = window.proseBenchmark.readyAt
+  return {
+    domInteractive: navigation.domInteractive,
+    firstReady: Math.min(...ready),
+    lastReady: Math.max(...ready),
+    lastLongTask: Math.max(0, ...window.proseBenchmark.longTasks),
+    heap: performance.memory
+      ? {
+          used: performance.memory.usedJSHeapSize,
+          total: performance.memory.totalJSHeapSize,
+        }
+      : null,
+  }
+}
+"""
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def build_id():
+    """Identify the build using the hash of the editor bundle."""
+    root = Path(__file__).parents[2] / "django_prose_editor" / "static"
+    digest = hashlib.sha256()
+    for name in ("editor.js", "configurable.js"):
+        digest.update((root / "django_prose_editor" / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@pytest.fixture(scope="module")
+def results(browser):
+    results = []
+    yield results
+
+    output = Path(
+        os.environ.get("BENCHMARK_OUTPUT", "test-results/browser-benchmark.json")
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "build": build_id(),
+        "browser": f"{browser.browser_type.name} {browser.version}",
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nBrowser benchmark results written to {output}")
+
+
+@pytest.mark.django_db
+@pytest.mark.e2e
+@pytest.mark.parametrize(("editors", "size"), SCENARIOS)
+def test_browser_benchmark(page, live_server, results, editors, size):
+    page.goto(
+        f"{live_server.url}/benchmark/?editors={editors}&size={size}",
+        timeout=120_000,
+    )
+    page.wait_for_function(
+        f"window.proseBenchmark.editors.length === {editors}", timeout=120_000
+    )
+    # Wait until no long tasks have been observed for a while
+    page.wait_for_function(
+        f"""() => {{
+          const last = Math.max(0, ...window.proseBenchmark.longTasks)
+          return performance.now() - last > {QUIET_WINDOW_MS}
+        }}""",
+        timeout=120_000,
+    )
+    timings = page.evaluate(COLLECT)
+
+    page.evaluate(START_KEYSTROKES, KEYSTROKES)
+    for _ in range(KEYSTROKES):
+        page.keyboard.type("x")
+    latencies = page.evaluate("() => window.proseBenchmarkKeystrokes")
+
+    get_html = page.evaluate(MEASURE_GET_HTML, GET_HTML_REPEAT)
+
+    result = {
+        "editors": editors,
+        "document_bytes": size,
+        # From the start of the module execution to the last ready editor
+        "initialization_ms": timings["lastReady"] - timings["domInteractive"],
+        "first_editor_ready_ms": timings["firstReady"],
+        "all_editors_ready_ms": timings["lastReady"],
+        # The later of the last ready editor and the end of the last long task
+        "time_to_interactive_ms": max(timings["lastReady"], timings["lastLongTask"]),
+        "keystroke_to_paint_ms": {
+            "median": median(latencies),
+            "p95": percentile(latencies, 95),
+            "max": max(latencies),
+        },
+        "get_html_ms": {
+            "median": median(get_html),
+            "max": max(get_html),
+            "all_editors": sum(get_html) / GET_HTML_REPEAT,
+        },
+        "js_heap_bytes": timings["heap"],
+    }
+    results.append(result)
+
+    assert result["initialization_ms"] > 0
+    assert len(latencies) == KEYSTROKES
@@ -0,0 +1,142 @@
+"""
+Construct and render formsets with many prose editor forms.
+
+Measures the time spent instantiating a formset with N forms (Django copies
+the fields and widgets of every form), building the widget contexts (which
+expands and serializes the editor configuration) and rendering all editors.
+The frozen configuration shared by all copies is compared to a plain
+dictionary which is expanded and serialized for every widget and which has
+to be deep-copied if the forms want to modify it.
+
+Run with ``python tests/benchmarks/bench_formsets.py [--json] [forms ...]``.
+"""
+
+import copy
+import json
+import os
+import sys
+import time
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testapp.settings")
+
+import django
+
+
+EXTENSIONS = {
+    "Bold": True,
+    "Italic": True,
+    "Strike": True,
+    "Underline": True,
+    "Heading": {"levels": [2, 3, 4]},
+    "BulletList": True,
+    "OrderedList": True,
+    "ListItem": True,
+    "Blockquote": True,
+    "Link": {"enableTarget": True, "protocols": ["http", "https", "mailto"]},
+    "Table": True,
+    "TableRow": True,
+    "TableHeader": True,
+    "TableCell": True,
+    "NodeClass": {"cssClasses": {"paragraph": ["lead", "note"]}},
+}
+
+
+def formset_class(*, frozen=True):
+    from django import forms  # noqa: PLC0415
+
+    from django_prose_editor.fields import ProseEditorFormField  # noqa: PLC0415
+
+    class Form(forms.Form):
+        content = ProseEditorFormField(extensions=EXTENSIONS)
+
+    if not frozen:
+        # Emulate a mutable configuration which cannot be shared safely
+        field = Form.base_fields["content"]
+        field.config = field.widget.config = json.loads(json.dumps(field.config))
+
+    return forms.formset_factory(Form, extra=0)
+
+
+def measure(formset_class, forms):
+    """
+    Construct and render a formset with ``forms`` forms and return a
+    dictionary containing the ``construct``, ``copy``, ``context`` and
+    ``render`` times in seconds
+    """
+    data = {
+        "form-TOTAL_FORMS": str(forms),
+        "form-INITIAL_FORMS": "0",
+        **{f"form-{i}-content": f"<p>Form {i}</p>" for i in range(forms)},
+    }
+
+    start = time.perf_counter()
+    formset = formset_class(data)
+    formset.forms  # noqa: B018
+    construct = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for form in formset:
+        copy.deepcopy(form.fields["content"].config)
+    copy_config = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for form in formset:
+        form.fields["content"].widget.get_context("content", "", {})
+    context = time.perf_counter() - start
+
+    start = time.perf_counter()
+    html = "".join(str(form["content"]) for form in formset)
+    render = time.perf_counter() - start
+
+    assert html.count("data-django-prose-editor-configurable") == forms
+    return {
+        "construct": construct,
+        "copy": copy_config,
+        "context": context,
+        "render": render,
+    }
+
+
+def benchmark(formset_class, forms, *, repeat=5):
+    # Keep the fastest run of each phase
+    runs = [measure(formset_class, forms) for _ in range(repeat)]
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def main():
+    args = sys.argv[1:]
+    as_json = "--json" in args
+    sizes = [int(arg) for arg in args if arg != "--json"] or [10, 100, 500]
+
+    django.setup()
+
+    results = []
+    for frozen in (False, True):
+        cls = formset_class(frozen=frozen)
+        benchmark(cls, 1)  # Warm up
+        results.extend(
+            {"forms": forms, "frozen": frozen, **benchmark(cls, forms)}
+            for forms in sizes
+        )
+
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(
+        f"{'forms':>5} {'frozen':>6} {'construct ms':>12} {'copy ms':>7}"
+        f" {'context ms':>10} {'render ms':>9}"
+    )
+    for result in results:
+        print(
+            f"{result['forms']:>5} {result['frozen']!s:>6}"
+            f" {result['construct'] * 1000:12.2f} {result['copy'] * 1000:7.2f}"
+            f" {result['context'] * 1000:10.2f} {result['render'] * 1000:9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
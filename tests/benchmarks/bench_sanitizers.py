@@ -0,0 +1,171 @@
+"""
+Compare the throughput and the output of the sanitizer backends.
+
+Every available backend cleans the same corpus using the allowlist of a
+typical extension configuration and the default allowlist. The output is
+compared to the output of nh3.
+
+Run with ``python tests/benchmarks/bench_sanitizers.py [repeat]``.
+"""
+
+import os
+import sys
+import timeit
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from django.conf import settings
+
+from django_prose_editor.config import allowlist_from_extensions, expand_extensions
+from django_prose_editor.sanitizers import BACKENDS, Nh3Backend
+
+
+EXTENSIONS = {
+    "Blockquote": True,
+    "Bold": True,
+    "BulletList": True,
+    "ListItem": True,
+    "Caption": True,
+    "CodeBlock": True,
+    "Figure": True,
+    "HardBreak": True,
+    "Heading": {"levels": [1, 2, 3]},
+    "HorizontalRule": True,
+    "Image": True,
+    "Italic": True,
+    "Link": {"protocols": ["http", "https", "mailto"]},
+    "OrderedList": True,
+    "Strike": True,
+    "Subscript": True,
+    "Superscript": True,
+    "Table": True,
+    "TableCell": True,
+    "TableHeader": True,
+    "TableRow": True,
+    "Underline": True,
+}
+
+#: Documents as produced by the editor
+DOCUMENTS = [
+    "",
+    "<p></p>",
+    "<p>Hello <strong>world</strong>!</p>",
+    "<h1>Title</h1><h2>Subtitle</h2><h3>Section</h3><h4>Too deep</h4>",
+    (
+        '<p>A <a href="https://example.com/" target="_blank">link</a> and a'
+        ' <a href="mailto:a@example.com">mail</a>.</p>'
+    ),
+    (
+        '<ul><li><p>One</p></li><li><p>Two<br>lines</p><ol start="3"><li><p>'
+        "Nested</p></li></ol></li></ul>"
+    ),
+    (
+        "<blockquote><p><em>Quoted</em> <u>text</u> <s>gone</s> H<sub>2</sub>O"
+        " E=mc<sup>2</sup></p></blockquote><hr>"
+    ),
+    (
+        '<pre><code class="language-python">if a &lt; b:\n    print("&amp;")\n'
+        "</code></pre>"
+    ),
+    (
+        '<figure><img src="/media/image.jpg" alt="An image" width="640"'
+        ' height="480"><figcaption>Caption &amp; credits</figcaption></figure>'
+    ),
+    (
+        "<table><tbody><tr><th><p>Name</p></th><th><p>Value</p></th></tr><tr><td"
+        ' colspan="2"><p>Both</p></td></tr></tbody></table>'
+    ),
+    "<p>Entities &amp; &lt;tags&gt; &quot;quotes&quot; non\xa0breaking</p>",
+    "<p>Unicode: äöü ✓ 😀 中文</p>",
+]
+
+#: Hostile and sloppy markup
+ATTACKS = [
+    "<script>alert(1)</script><p>After</p>",
+    "<style>p { color: red }</style><p>Styled</p>",
+    '<p onclick="alert(1)" style="color: red" class="x" title="Title">x</p>',
+    '<a href="javascript:alert(1)">js</a><a href=" JaVaScRiPt:alert(1)">js</a>',
+    '<a href="java\tscript:alert(1)">js</a><a href="data:text/html,x">data</a>',
+    '<a href="http://">empty</a><a href="//example.com">relative</a>',
+    '<a href="/path?query#hash">relative</a><a href="#top">anchor</a>',
+    '<a href="https://example.com/" rel="opener">rel</a><a>no href</a>',
+    '<img src="x" onerror="alert(1)"><img src="javascript:x">',
+    "<p>a<!-- comment -->b</p><!-- top level -->",
+    "<iframe src=https://example.com>text</iframe><object>x</object>",
+    "<form action=/><input value=x><button>Go</button></form>",
+    '<p title="&quot;&gt;&lt;script&gt;">attribute</p>',
+    "<p>&#0; &#128; &unknown; &amp &lt</p>",
+    "<div><p>Unwrapped div</div><span>span</span>",
+    "<p>Unclosed <strong>bold<p>Next",
+    "<ul><li>One<li>Two</ul><p>a<p>b",
+    "<h1>One<h2>Two</h2>",
+    "<table><tr><td>Implicit tbody</td></tr></table>",
+    "<table>Fostered<tr><td>x</td></tr></table>",
+    "<pre>\nLeading newline</pre>",
+    "Text\r\nwith\rline endings",
+    "  <p>Surrounding whitespace</p>  ",
+    "<svg><circle/></svg><math><mi>x</mi></math>",
+]
+
+CORPUS = DOCUMENTS + ATTACKS
+
+
+def allowlists():
+    return {
+        "extensions": allowlist_from_extensions(expand_extensions(EXTENSIONS)),
+        "default": {},
+    }
+
+
+def conformance(allowlist, corpus=CORPUS):
+    """
+    Return ``{backend name: [(html, expected, actual), ...]}`` containing the
+    differences between the output of nh3 and the other available backends
+    """
+    reference = Nh3Backend(allowlist)
+    differences = {}
+    for backend in BACKENDS:
+        if backend is Nh3Backend or not backend.available():
+            continue
+        sanitize = backend(allowlist)
+        differences[backend.name] = [
+            (html, expected, actual)
+            for html in corpus
+            if (expected := reference(html)) != (actual := sanitize(html))
+        ]
+    return differences
+
+
+def main():
+    if not settings.configured:
+        settings.configure()
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    document = "".join(DOCUMENTS) * 10
+
+    for name, allowlist in allowlists().items():
+        print(f"Allowlist: {name}")
+        for backend, differences in conformance(allowlist).items():
+            print(f"  {backend}: {len(differences)} differences")
+            for html, expected, actual in differences:
+                print(f"    {html!r}\n      nh3: {expected!r}\n      got: {actual!r}")
+
+        print(f"  {'backend':<8} {'MB/s':>8}")
+        for backend in BACKENDS:
+            if not backend.available():
+                print(f"  {backend.name:<8} {'n/a':>8}")
+                continue
+            sanitize = backend(allowlist)
+            seconds = min(
+                timeit.repeat(
+                    lambda sanitize=sanitize: sanitize(document),
+                    number=repeat,
+                    repeat=3,
+                )
+            )
+            throughput = len(document.encode()) * repeat / seconds / 1e6
+            print(f"  {backend.name:<8} {throughput:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare the transform pipeline with one pipeline per transform and with
+chained regex passes.
+
+Run with ``python tests/benchmarks/bench_transforms.py [paragraphs]``.
+"""
+
+import os
+import re
+import sys
+import timeit
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from django.utils.text import slugify
+
+from django_prose_editor.transforms import (
+    AddLinkRel,
+    HeadingIds,
+    LazyImages,
+    NormalizeNbsp,
+    TransformPipeline,
+)
+
+
+def document(paragraphs):
+    block = (
+        "<h2>Section {i}</h2>"
+        '<p>Lorem ipsum dolor sit amet, <a href="https://example.com/{i}">'
+        "consectetur</a> adipiscing&nbsp;elit. <strong>Sed do</strong> eiusmod"
+        " tempor incididunt ut labore et dolore magna aliqua.</p>"
+        '<figure><img src="/media/{i}.jpg" alt="Image {i}"><figcaption>Caption'
+        "</figcaption></figure>"
+    )
+    return "".join(block.format(i=i) for i in range(paragraphs))
+
+
+def regex_passes():
+    rel = re.compile(r"<a ((?:(?!rel=)[^>])*)>")
+    img = re.compile(r"<img ((?:(?!loading=)[^>])*)>")
+    heading = re.compile(r"<(h[1-6])>(.*?)</\1>")
+    nbsp = re.compile(r"(?<!\s)(?<!&nbsp;)&nbsp;(?!\s|&nbsp;)")
+
+    def heading_ids(html):
+        seen = {}
+
+        def replace(match):
+            slug = slugify(re.sub(r"<[^>]+>", "", match[2])) or "section"
+            if count := seen.get(slug):
+                seen[slug] = count + 1
+                slug = f"{slug}-{count}"
+            else:
+                seen[slug] = 1
+            return f'<{match[1]} id="{slug}">{match[2]}</{match[1]}>'
+
+        return heading.sub(replace, html)
+
+    def apply(html):
+        html = rel.sub(r'<a \1 rel="noopener">', html)
+        html = img.sub(r'<img \1 loading="lazy">', html)
+        html = heading_ids(html)
+        return nbsp.sub(" ", html)
+
+    return apply
+
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    html = document(paragraphs)
+    transforms = [AddLinkRel(), LazyImages(), HeadingIds(), NormalizeNbsp()]
+    pipeline = TransformPipeline(transforms)
+    element_pipeline = TransformPipeline(transforms[:3])
+    pipelines = [TransformPipeline([transform]) for transform in transforms]
+
+    def chained_pipelines(html):
+        for pipeline in pipelines:
+            html = pipeline(html)
+        return html
+
+    regex = regex_passes()
+    assert pipeline(html) == chained_pipelines(html)
+
+    print(f"Document size: {len(html) / 1024:.1f} KiB")
+    for name, fn in [
+        ("pipeline", pipeline),
+        ("pipeline without text transforms", element_pipeline),
+        ("one pass per transform", chained_pipelines),
+        ("chained regex passes", regex),
+    ]:
+        number = 20
+        best = min(timeit.repeat(lambda fn=fn: fn(html), number=number, repeat=5))
+        print(f"{name:>36}: {best / number * 1000:8.3f} ms per document")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 from django import forms
 from django.contrib import admin
+from django.db.models import IntegerField
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
 
+from django_prose_editor.admin import find_and_replace_action
 from django_prose_editor.widgets import ProseEditorWidget
 from testapp import models
 
@@ -37,3 +41,33 @@ class TableProseEditorModelAdmin(admin.ModelAdmin):
 @admin.register(models.ConfigurableProseEditorModel)
 class ConfigurableProseEditorModelAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(models.StatisticsProseEditorModel)
+class StatisticsProseEditorModelAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "words", "reading_time")
+    actions = (find_and_replace_action(),)
+
+    # KT() returns text, cast it so that 100 words sort after 9 words
+    @admin.display(ordering=Cast(KT("description_stats__words"), IntegerField()))
+    def words(self, obj):
+        return (obj.description_stats or {}).get("words")
+
+    @admin.display(ordering=Cast(KT("description_stats__reading_time"), IntegerField()))
+    def reading_time(self, obj):
+        return (obj.description_stats or {}).get("reading_time")
+
+
+class ArticleSectionInline(admin.StackedInline):
+    model = models.ArticleSection
+    extra = 0
+
+
+class ArticleNoteInline(admin.TabularInline):
+    model = models.ArticleNote
+    extra = 0
+
+
+@admin.register(models.Article)
+class ArticleAdmin(admin.ModelAdmin):
+    inlines = (ArticleSectionInline, ArticleNoteInline)
@@ -1,6 +1,8 @@
 from django.db import models
 
+from django_prose_editor.blobs import AbstractProseBlob
 from django_prose_editor.fields import ProseEditorField
+from django_prose_editor.revisions import AbstractProseRevision
 from django_prose_editor.sanitized import SanitizedProseEditorField
 
 
@@ -76,3 +78,119 @@ class ConfigurableProseEditorModel(models.Model):
 
     def __str__(self):
         return self.description
+
+
+class StatisticsProseEditorModel(models.Model):
+    description = ProseEditorField(
+        extensions={"Bold": True, "Link": True, "Image": True},
+        sanitize=True,
+        stats_field="description_stats",
+    )
+    description_stats = models.JSONField(null=True, editable=False)
+
+    def __str__(self):
+        return self.description
+
+
+class RevisionedProseEditorModel(models.Model):
+    description = ProseEditorField(
+        extensions={"Bold": True, "Heading": True},
+        sanitize=True,
+        revisions="testapp.ProseEditorRevision",
+    )
+
+    def __str__(self):
+        return self.description
+
+
+class ProseEditorRevision(AbstractProseRevision):
+    parent = models.ForeignKey(
+        RevisionedProseEditorModel, on_delete=models.CASCADE, related_name="revisions"
+    )
+
+    class Meta(AbstractProseRevision.Meta):
+        constraints = (
+            models.UniqueConstraint(
+                fields=["parent", "field_name", "number"],
+                name="unique_revision_number",
+            ),
+        )
+
+
+class ImageProseEditorModel(models.Model):
+    description = ProseEditorField(
+        extensions={"Image": True, "Figure": True},
+        sanitize=True,
+        image_dimensions=True,
+    )
+
+    def __str__(self):
+        return self.description
+
+
+class BlobProseEditorModel(models.Model):
+    description = ProseEditorField(
+        extensions={"Bold": True},
+        sanitize=True,
+        blobs="testapp.ProseBlob",
+    )
+
+    def __str__(self):
+        return self.description
+
+
+class ProseBlob(AbstractProseBlob):
+    pass
+
+
+class ContentProseEditorModel(models.Model):
+    description = ProseEditorField(
+        extensions={"Bold": True, "Heading": True, "Link": True},
+        sanitize=True,
+        content_class=True,
+    )
+
+    def __str__(self):
+        return self.description
+
+
+class Article(models.Model):
+    title = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.title
+
+
+class ArticleSection(models.Model):
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="sections"
+    )
+    ordering = models.IntegerField(default=0)
+    content = ProseEditorField(
+        extensions={
+            "Bold": True,
+            "Italic": True,
+            "Heading": {"levels": [2, 3]},
+            "Link": True,
+            "BulletList": True,
+            "OrderedList": True,
+            "ListItem": True,
+            "Table": True,
+            "Figure": True,
+        },
+        sanitize=True,
+    )
+
+    class Meta:
+        ordering = ("ordering",)
+
+    def __str__(self):
+        return f"Section {self.ordering}"
+
+
+class ArticleNote(models.Model):
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="notes")
+    content = ProseEditorField(extensions={"Bold": True, "Link": True}, sanitize=True)
+
+    def __str__(self):
+        return f"Note {self.pk}"
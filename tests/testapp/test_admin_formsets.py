@@ -0,0 +1,52 @@
+from benchmarks.bench_admin import (
+    SHARED_CONFIG_MIDDLEWARE,
+    create_article,
+    render_change_form,
+)
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+
+class AdminFormsetBenchmarkTest(TestCase):
+    """
+    Regression guards for change forms with many prose editor inline rows
+
+    Only counts, queries and bytes are checked; the wall-clock budgets are
+    checked by ``tests/benchmarks/bench_admin.py``.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com")
+        self.client.force_login(self.user)
+
+    def test_many_inline_rows(self):
+        small = create_article(10)
+        render_change_form(self.client, small)  # Warm up
+        small = render_change_form(self.client, small)
+        large = render_change_form(self.client, create_article(300))
+
+        # All editors are rendered, plus one for the empty form of each inline
+        assert large["editors"] == 302
+
+        # The number of queries doesn't depend on the number of rows
+        assert small["queries"] == large["queries"]
+
+        # The config of each widget is serialized once
+        assert large["timings"]["widget"]["count"] == 302
+
+        # Payload per additional editor including the content and config
+        per_editor = (large["bytes"] - small["bytes"]) / 290
+        assert per_editor < 2500
+
+    def test_shared_config(self):
+        article = create_article(100)
+        default = render_change_form(self.client, article)
+
+        with override_settings(MIDDLEWARE=SHARED_CONFIG_MIDDLEWARE):
+            self.client = self.client_class()
+            self.client.force_login(self.user)
+            shared = render_change_form(self.client, article)
+
+        assert shared["editors"] == default["editors"]
+        # Both inlines' configs are emitted once each instead of per textarea
+        assert default["bytes"] - shared["bytes"] > 100 * 300
@@ -0,0 +1,171 @@
+import pytest
+from django import forms
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_prose_editor import blobs
+from django_prose_editor.blobs import (
+    MissingBlobError,
+    blob_hash,
+    content_hash,
+    rebuild_refcounts,
+)
+from testapp.models import BlobProseEditorModel, ProseBlob
+
+
+BOILERPLATE = "<p>" + "Legal boilerplate. " * 50 + "</p>"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    blobs.blob_cache.clear()
+    yield
+    blobs.blob_cache.clear()
+
+
+def refcounts():
+    return dict(ProseBlob.objects.values_list("hash", "refcount"))
+
+
+def stored():
+    return list(
+        BlobProseEditorModel.objects.order_by("pk").values_list(
+            "description", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_deduplication():
+    first = BlobProseEditorModel.objects.create(description=BOILERPLATE)
+    second = BlobProseEditorModel.objects.create(description=BOILERPLATE)
+    empty = BlobProseEditorModel.objects.create(description="")
+
+    hash = content_hash(BOILERPLATE)
+    assert refcounts() == {hash: 2}
+    assert stored() == [f"sha256:{hash}", f"sha256:{hash}", ""]
+    assert first.description == BOILERPLATE
+
+    # Saving unchanged content doesn't change anything
+    second.save()
+    assert refcounts() == {hash: 2}
+
+    # Changing content releases the old blob
+    first.description = "<p>Other</p>"
+    first.save()
+    assert refcounts() == {hash: 1, content_hash("<p>Other</p>"): 1}
+
+    second.delete()
+    assert refcounts() == {content_hash("<p>Other</p>"): 1}
+
+    empty.description = "<p>Other</p>"
+    empty.save()
+    assert refcounts() == {content_hash("<p>Other</p>"): 2}
+
+    # Copies acquire a new reference
+    copy = BlobProseEditorModel.objects.get(pk=first.pk)
+    copy.pk = None
+    copy._state.adding = True
+    copy.save()
+    assert refcounts() == {content_hash("<p>Other</p>"): 3}
+
+
+@pytest.mark.django_db
+def test_lazy_loading():
+    for _ in range(3):
+        BlobProseEditorModel.objects.create(description=BOILERPLATE)
+    BlobProseEditorModel.objects.create(description="<p>Inline</p>")
+    # Rows written before enabling blobs contain the content itself
+    BlobProseEditorModel.objects.filter(
+        pk__in=BlobProseEditorModel.objects.order_by("-pk")[:1]
+    ).update(description="<p>Legacy</p>")
+    blobs.blob_cache.clear()
+
+    with CaptureQueriesContext(connection) as ctx:
+        instances = list(BlobProseEditorModel.objects.order_by("pk"))
+    assert len(ctx.captured_queries) == 1
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert [instance.description for instance in instances] == [
+            BOILERPLATE,
+            BOILERPLATE,
+            BOILERPLATE,
+            "<p>Legacy</p>",
+        ]
+        assert instances[0].get_description_excerpt(2) == "Legal boilerplate. ..."
+    # The blob is loaded once and cached afterwards
+    assert len(ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_forms_and_values():
+    instance = BlobProseEditorModel.objects.create(description=BOILERPLATE)
+
+    class Form(forms.ModelForm):
+        class Meta:
+            model = BlobProseEditorModel
+            fields = ("description",)
+
+    form = Form(instance=BlobProseEditorModel.objects.get(pk=instance.pk))
+    assert form.initial["description"] == BOILERPLATE
+
+    form = Form({"description": "<p>Changed</p>"}, instance=instance)
+    assert form.is_valid()
+    form.save()
+    assert refcounts() == {content_hash("<p>Changed</p>"): 1}
+
+    field = BlobProseEditorModel._meta.get_field("description")
+    values = stored() + ["<p>Inline</p>", ""]
+    assert blob_hash(values[0])
+    assert field.resolve_values(values) == ["<p>Changed</p>", "<p>Inline</p>", ""]
+
+
+@pytest.mark.django_db
+def test_missing_blobs():
+    instance = BlobProseEditorModel.objects.create(description=BOILERPLATE)
+    ProseBlob.objects.all().delete()
+    blobs.blob_cache.clear()
+
+    with pytest.raises(MissingBlobError, match=content_hash(BOILERPLATE)):
+        BlobProseEditorModel.objects.get(pk=instance.pk).description  # noqa: B018
+
+    field = BlobProseEditorModel._meta.get_field("description")
+    with pytest.raises(MissingBlobError):
+        field.resolve_values([*stored(), "<p>Inline</p>"])
+
+
+@pytest.mark.django_db
+def test_rebuild_refcounts():
+    instance = BlobProseEditorModel.objects.create(description=BOILERPLATE)
+    BlobProseEditorModel.objects.create(description=BOILERPLATE)
+    BlobProseEditorModel.objects.filter(pk=instance.pk).delete()
+    ProseBlob.objects.create(hash="0" * 64, content="unused", refcount=3)
+
+    rebuild_refcounts("testapp.ProseBlob")
+    assert refcounts() == {content_hash(BOILERPLATE): 1}
+
+
+@pytest.mark.django_db
+def test_export_resolves_blobs():
+    from django_prose_editor.export import export_rows  # noqa: PLC0415
+
+    BlobProseEditorModel.objects.create(description=BOILERPLATE)
+    rows = list(export_rows(["testapp.BlobProseEditorModel"], workers=0))
+    assert [row["html"] for row in rows] == [BOILERPLATE]
+
+
+@pytest.mark.django_db
+def test_reference_like_content():
+    # Only values loaded from the database are references, assigned strings
+    # are content even if they look like references
+    content = f"sha256:{content_hash(BOILERPLATE)}"
+    BlobProseEditorModel.objects.create(description=BOILERPLATE)
+    instance = BlobProseEditorModel.objects.create(description=content)
+    assert instance.description == content
+    assert refcounts() == {content_hash(BOILERPLATE): 1, content_hash(content): 1}
+
+    instance = BlobProseEditorModel.objects.get(pk=instance.pk)
+    assert instance.description == content
+    instance.description = content
+    instance.save()
+    assert refcounts() == {content_hash(BOILERPLATE): 1, content_hash(content): 1}
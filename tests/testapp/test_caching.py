@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from django_prose_editor.caching import LRUCache, cached_sanitizer, fingerprint
+from django_prose_editor.fields import create_sanitizer
+from django_prose_editor.transforms import AddLinkRel, LazyImages
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "shared",
+        },
+    }
+)
+class SanitizerCacheTest(SimpleTestCase):
+    def setUp(self):
+        caches["shared"].clear()
+
+    def test_lru(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_lru_max_length(self):
+        cache = LRUCache(10, max_length=10)
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        cache.set("a", "aaa")
+        assert cache.length == 7
+        # Evicts the least recently used values until the values fit
+        cache.set("c", "cccccc")
+        assert cache.get("b") is None
+        assert cache.get("a") == "aaa"
+        assert cache.get("c") == "cccccc"
+        # Values longer than max_length aren't cached
+        cache.set("d", "d" * 11)
+        assert cache.get("d") is None
+        assert cache.length == 9
+
+    def test_fingerprint(self):
+        assert fingerprint({"tags": {"a", "b"}}) == fingerprint({"tags": {"b", "a"}})
+        assert fingerprint({"tags": {"a"}}) != fingerprint({"tags": {"b"}})
+        assert fingerprint([AddLinkRel()]) == fingerprint([AddLinkRel()])
+        assert fingerprint([AddLinkRel()]) != fingerprint([AddLinkRel("nofollow")])
+        assert fingerprint([AddLinkRel()]) != fingerprint([LazyImages()])
+
+    def test_in_process_cache(self):
+        sanitize = mock.Mock(side_effect=lambda html: html.upper())
+        cached = cached_sanitizer(sanitize, "fp", {"max_length": 10})
+
+        assert cached("<p>a</p>") == "<P>A</P>"
+        assert cached("<p>a</p>") == "<P>A</P>"
+        assert sanitize.call_count == 1
+
+        # Documents exceeding max_length are never cached
+        assert cached("<p>abcdefgh</p>") == "<P>ABCDEFGH</P>"
+        assert cached("<p>abcdefgh</p>") == "<P>ABCDEFGH</P>"
+        assert sanitize.call_count == 3
+
+    def test_backend_cache(self):
+        first = mock.Mock(side_effect=lambda html: html.upper())
+        second = mock.Mock(side_effect=lambda html: html.upper())
+        options = {"backend": "shared", "maxsize": 0}
+
+        # Two separate processes sharing a cache backend
+        assert cached_sanitizer(first, "fp", options)("<p>a</p>") == "<P>A</P>"
+        assert cached_sanitizer(second, "fp", options)("<p>a</p>") == "<P>A</P>"
+        assert first.call_count == 1
+        assert second.call_count == 0
+
+        # Different configuration fingerprint
+        assert cached_sanitizer(second, "other", options)("<p>a</p>") == "<P>A</P>"
+        assert second.call_count == 1
+
+    def test_create_sanitizer(self):
+        sanitize = create_sanitizer({"Bold": True}, cache=True)
+        assert sanitize("<p><strong>a</strong><em>b</em></p>") == (
+            "<p><strong>a</strong>b</p>"
+        )
+        assert len(sanitize.cache.data) == 1
+        assert sanitize("<p><strong>a</strong><em>b</em></p>") == (
+            "<p><strong>a</strong>b</p>"
+        )
+        assert len(sanitize.cache.data) == 1
+        assert sanitize("<p></p>") == ""
+
+    @override_settings(DJANGO_PROSE_EDITOR_SANITIZE_CACHE={"backend": "shared"})
+    def test_setting(self):
+        sanitize = create_sanitizer({"Bold": True})
+        assert sanitize("<p><em>b</em></p>") == "<p>b</p>"
+        assert sanitize.cache is not None
+        assert not hasattr(create_sanitizer({"Bold": True}, cache=False), "cache")
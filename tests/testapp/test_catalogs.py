@@ -0,0 +1,51 @@
+import gettext
+
+import pytest
+from django.core.management import call_command
+from django.utils import translation
+
+from django_prose_editor.catalogs import (
+    CATALOG_DIR,
+    LOCALE_DIR,
+    catalog_path,
+    read_messages,
+)
+from django_prose_editor.widgets import prose_editor_media
+
+
+def test_catalogs_up_to_date(tmp_path):
+    call_command("prose_compile_js_catalogs", output=tmp_path, stdout=None)
+    generated = sorted(path.name for path in tmp_path.iterdir())
+    assert generated == sorted(path.name for path in CATALOG_DIR.iterdir())
+    for name in generated:
+        assert (tmp_path / name).read_text() == (CATALOG_DIR / name).read_text()
+    assert '"Insert Table": "Tabelle einfügen"' in (tmp_path / "de.js").read_text()
+
+
+def test_catalog_media():
+    assert catalog_path("de") == "django_prose_editor/locale/de.js"
+    assert catalog_path("de-ch") == "django_prose_editor/locale/de.js"
+    assert catalog_path("fr") is None
+    assert catalog_path(None) is None
+
+    script = '<script src="/static/django_prose_editor/locale/de.js"></script>'
+    with translation.override("de"):
+        media = str(prose_editor_media())
+    assert script in media
+    assert media.index(script) < media.index("editor.js")
+    with translation.override("en"):
+        assert "locale" not in str(prose_editor_media())
+
+
+def test_read_messages(tmp_path):
+    path = LOCALE_DIR / "de" / "LC_MESSAGES" / "djangojs.mo"
+    with path.open("rb") as f:
+        translations = gettext.GNUTranslations(f)
+    messages = [(msgid, msgstr) for msgid, msgstr in read_messages(path) if msgid]
+    assert ("Insert Table", "Tabelle einfügen") in messages
+    for msgid, msgstr in messages:
+        assert translations.gettext(msgid) == msgstr
+
+    (tmp_path / "broken.mo").write_bytes(b"not a catalog")
+    with pytest.raises(ValueError, match="isn't a .mo file"):
+        read_messages(tmp_path / "broken.mo")
@@ -1,13 +1,17 @@
 from django.core.checks import Error, Warning
 from django.db import models
 from django.test import SimpleTestCase, override_settings
+from django.test.utils import isolate_apps
 
 from django_prose_editor.checks import (
     check_extensions_parameter,
     check_js_preset_configuration,
+    check_revision_constraints,
     check_sanitization_enabled,
 )
 from django_prose_editor.fields import ProseEditorField
+from django_prose_editor.revisions import AbstractProseRevision
+from testapp.models import RevisionedProseEditorModel
 
 
 class ChecksTests(SimpleTestCase):
@@ -138,3 +142,39 @@ class ChecksTests(SimpleTestCase):
         assert len(no_config_warnings) == 1
         assert "doesn't have sanitization enabled" in no_config_warnings[0].msg
         assert "extensions mechanism with sanitize=True" in no_config_warnings[0].hint
+
+    @isolate_apps("testapp")
+    def test_revision_constraints(self):
+        """Test that revision models without a unique constraint are caught."""
+        assert check_revision_constraints(None) == []
+
+        class Revision(AbstractProseRevision):
+            parent = models.ForeignKey(
+                RevisionedProseEditorModel, on_delete=models.CASCADE
+            )
+
+        class ConstrainedRevision(AbstractProseRevision):
+            parent = models.ForeignKey(
+                RevisionedProseEditorModel, on_delete=models.CASCADE
+            )
+
+            class Meta(AbstractProseRevision.Meta):
+                constraints = (
+                    models.UniqueConstraint(
+                        fields=["number", "parent", "field_name"], name="unique"
+                    ),
+                )
+
+        errors = check_revision_constraints(
+            [
+                type(
+                    "AppConfig",
+                    (),
+                    {"get_models": lambda: [Revision, ConstrainedRevision]},
+                )
+            ]
+        )
+        assert len(errors) == 1
+        assert isinstance(errors[0], Error)
+        assert errors[0].obj is Revision
+        assert errors[0].id == "django_prose_editor.E010"
@@ -0,0 +1,125 @@
+import base64
+import gzip
+
+import pytest
+from django import forms
+from django.http import QueryDict
+from django.test import override_settings
+
+from django_prose_editor.compression import (
+    PREFIX,
+    ContentTooLargeError,
+    compression_options,
+    decompress,
+)
+from django_prose_editor.fields import ProseEditorFormField
+from testapp.models import ProseEditorModel
+
+
+def compress(html):
+    return PREFIX + base64.b64encode(gzip.compress(html.encode())).decode()
+
+
+HTML = "<p>Grüezi</p>" * 1000
+
+
+def test_decompress():
+    assert decompress(compress(HTML)) == HTML
+
+    # Decompression bombs are refused without inflating them completely
+    with pytest.raises(ContentTooLargeError):
+        decompress(compress("<p>" + "a" * 10_000_000 + "</p>"), max_size=1000)
+    assert decompress(compress(HTML), max_size=len(HTML.encode())) == HTML
+
+    with pytest.raises(ValueError, match="base64"):
+        decompress(PREFIX + "not base64!")
+    with pytest.raises(ValueError, match="gzip"):
+        decompress(PREFIX + base64.b64encode(b"<p>plain</p>").decode())
+    with pytest.raises(ValueError, match="Truncated"):
+        decompress(compress(HTML)[:-20])
+    with pytest.raises(ValueError, match="UTF-8"):
+        decompress(PREFIX + base64.b64encode(gzip.compress(b"\xff")).decode())
+
+
+def test_compression_options():
+    assert compression_options() is None
+    assert compression_options(argument=False) is None
+    assert compression_options(argument=True)["threshold"] == 64 * 1024
+    assert compression_options({"threshold": 10})["threshold"] == 10
+
+    with override_settings(DJANGO_PROSE_EDITOR_COMPRESS={"max_size": 100}):
+        assert compression_options()["max_size"] == 100
+        assert compression_options(argument=False) is None
+
+
+def test_form_field():
+    class Form(forms.Form):
+        content = ProseEditorFormField(compress={"threshold": 1000, "max_size": 20000})
+        plain = ProseEditorFormField(required=False)
+
+    assert 'data-django-prose-editor-compress="1000"' in str(Form()["content"])
+    assert "data-django-prose-editor-compress" not in str(Form()["plain"])
+
+    form = Form({"content": compress(HTML), "plain": compress(HTML)})
+    assert form.is_valid()
+    assert form.cleaned_data["content"] == HTML
+    # Compression isn't enabled for the field
+    assert form.cleaned_data["plain"] == compress(HTML)
+    assert not Form(
+        {"content": compress(HTML)}, initial={"content": HTML}
+    ).has_changed()
+
+    form = Form({"content": compress(HTML * 2)})
+    assert not form.is_valid()
+    assert form.errors["content"] == [
+        "The submitted content is too large (more than 20000 bytes)."
+    ]
+
+    form = Form({"content": PREFIX + "garbage"})
+    assert not form.is_valid()
+    assert form.errors["content"] == [
+        "The submitted content could not be decompressed."
+    ]
+
+    # Uncompressed values are still accepted
+    form = Form({"content": "<p>Hello</p>"})
+    assert form.is_valid()
+    assert form.cleaned_data["content"] == "<p>Hello</p>"
+
+
+def test_request_size_limit():
+    class Form(forms.Form):
+        first = ProseEditorFormField(
+            compress={"max_size": 15000, "max_request_size": 20000}
+        )
+        second = ProseEditorFormField(
+            compress={"max_size": 15000, "max_request_size": 20000}
+        )
+
+    size = len(HTML.encode())
+    data = QueryDict(mutable=True)
+    data.update({"first": compress(HTML), "second": compress(HTML)})
+
+    # Each value is smaller than max_size, both together exceed the limit
+    form = Form(data)
+    assert not form.is_valid()
+    assert form.cleaned_data["first"] == HTML
+    assert form.errors["second"] == [
+        "The submitted contents are too large in total (more than 20000 bytes)."
+    ]
+    assert data._prose_editor_decompressed == size
+
+    # Each request is tracked separately
+    data = QueryDict(mutable=True)
+    data.update({"first": compress(HTML), "second": "<p>Plain</p>"})
+    assert Form(data).is_valid()
+
+
+def test_model_field():
+    field = ProseEditorModel._meta.get_field("description")
+    field.compress = True
+    try:
+        assert field.formfield().compress["threshold"] == 64 * 1024
+    finally:
+        field.compress = None
+    assert field.formfield().compress is None
@@ -1,5 +1,10 @@
 """Tests for the configuration module."""
 
+import copy
+import pickle
+
+import pytest
+from django import forms
 from django.test import TestCase, override_settings
 from js_asset import static_lazy
 
@@ -7,9 +12,11 @@ from django_prose_editor.config import (
     allowlist_from_extensions,
     check_legacy_dependencies,
     expand_extensions,
+    freeze_config,
     html_tags,
     js_from_extensions,
 )
+from django_prose_editor.fields import ProseEditorFormField
 
 
 class ConfigFunctionsTestCase(TestCase):
@@ -223,3 +230,64 @@ class ConfigFunctionsTestCase(TestCase):
         allowlist = allowlist_from_extensions(extensions)
         assert "strong" in allowlist["tags"]  # Bold
         assert "em" not in allowlist["tags"]  # Italic should be excluded
+
+
+class FrozenConfigTestCase(TestCase):
+    def test_freeze_config(self):
+        config = freeze_config({"extensions": {"Heading": {"levels": [1, 2]}}})
+        assert config == {"extensions": {"Heading": {"levels": [1, 2]}}}
+        assert freeze_config(config) is config
+        assert copy.deepcopy(config) is config
+        assert copy.copy(config) is config
+        assert pickle.loads(pickle.dumps(config)) == config
+        assert hash(config) == hash(freeze_config(dict(config)))
+
+        with pytest.raises(TypeError, match="immutable"):
+            config["extensions"] = {}
+        with pytest.raises(TypeError, match="immutable"):
+            config["extensions"]["Heading"].update(levels=[3])
+        with pytest.raises(TypeError, match="immutable"):
+            config["extensions"]["Heading"]["levels"].append(3)
+
+        # Merging returns a regular dictionary
+        assert (config | {"extensions": {}}) == {"extensions": {}}
+
+    def test_shared_between_forms(self):
+        extensions = {"Bold": True, "Heading": {"levels": [1, 2]}}
+        config = {"extensions": extensions}
+
+        class Form(forms.Form):
+            content = ProseEditorFormField(config=config)
+            other = ProseEditorFormField(extensions=extensions)
+
+        # The passed configuration isn't modified
+        assert config == {"extensions": extensions}
+
+        first, second = Form(), Form()
+        assert first.fields["content"] is not second.fields["content"]
+        assert first.fields["content"].config is second.fields["content"].config
+        widget = first.fields["content"].widget
+        assert widget.config is second.fields["content"].widget.config
+
+        # The expanded configuration is shared as well
+        assert widget.get_config() is second.fields["content"].widget.get_config()
+        assert widget.get_config()["extensions"]["Heading"] == {"levels": [1, 2]}
+        assert str(first["content"]).replace("content", "other") == str(first["other"])
+
+    def test_settings_changed(self):
+        def js_modules():
+            widget = ProseEditorFormField(extensions={"CustomExt": True}).widget
+            return widget.get_config()["js_modules"]
+
+        for js in ("testapp/blue-bold.js", "testapp/other.js"):
+            with override_settings(
+                DJANGO_PROSE_EDITOR_EXTENSIONS=[
+                    {
+                        "js": [static_lazy(js)],
+                        "extensions": {"CustomExt": html_tags(tags=["div"])},
+                    }
+                ]
+            ):
+                assert [str(module) for module in js_modules()] == [
+                    str(static_lazy(js))
+                ]
@@ -0,0 +1,81 @@
+import pickle
+import sys
+
+import pytest
+
+from django_prose_editor.content import ProseContent
+from testapp.models import BlobProseEditorModel, ContentProseEditorModel
+
+
+HTML = (
+    "<h2>Intro</h2><p>Hello <strong>big</strong> world, see"
+    ' <a href="https://example.com/">the example</a>.</p>'
+    "<h3>Details</h3><p>More&nbsp;text</p>"
+)
+
+
+def test_prose_content():
+    content = ProseContent(HTML)
+    assert content == HTML
+    assert isinstance(content, str)
+    assert type(content + "") is str
+    assert content.startswith("<h2>")
+    assert not hasattr(content, "__weakref__")
+    size = sys.getsizeof(content)
+
+    assert content.text == "Intro Hello big world, see the example. Details More text"
+    assert content.word_count == 10
+    assert content.outline == [(2, "Intro"), (3, "Details")]
+    assert content.links == ["https://example.com/"]
+    assert content.excerpt(3) == "Intro Hello big ..."
+    assert content.excerpt(3, truncate="") == "Intro Hello big"
+    assert content.excerpt(3) is content.excerpt(3)
+
+    # Values are computed once and cached on the instance
+    assert content.text is content.text
+    assert content._parsed is content._parsed
+    assert sys.getsizeof(content) == size
+
+    restored = pickle.loads(pickle.dumps(content))
+    assert type(restored) is ProseContent
+    assert restored == content
+    assert "_parsed" not in restored.__dict__
+
+    assert ProseContent("").text == ""
+    assert ProseContent("").outline == []
+
+
+@pytest.mark.django_db
+def test_content_class():
+    instance = ContentProseEditorModel.objects.create(description=HTML)
+    assert type(instance.description) is str
+
+    instance = ContentProseEditorModel.objects.get()
+    assert type(instance.description) is ProseContent
+    assert instance.description.word_count == 10
+    assert (
+        type(ContentProseEditorModel.objects.values_list("description", flat=True)[0])
+        is ProseContent
+    )
+
+    instance.description = ProseContent("<p>Changed</p>")
+    instance.save()
+    assert ContentProseEditorModel.objects.get().description.text == "Changed"
+    assert ContentProseEditorModel.objects.filter(description=HTML).count() == 0
+
+    ContentProseEditorModel.objects.create()
+    assert ContentProseEditorModel.objects.get(description="").description.text == ""
+
+
+@pytest.mark.django_db
+def test_content_class_blobs():
+    field = BlobProseEditorModel._meta.get_field("description")
+    BlobProseEditorModel.objects.create(description=HTML)
+    field.content_class = ProseContent
+    try:
+        instance = BlobProseEditorModel.objects.get()
+        assert type(instance.description) is ProseContent
+        assert instance.description == HTML
+    finally:
+        field.content_class = None
+    assert type(BlobProseEditorModel.objects.get().description) is str
@@ -0,0 +1,88 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from django_prose_editor.export import export_rows
+from testapp.models import ProseEditorModel, SanitizedProseEditorModel
+
+
+@pytest.fixture
+def content():
+    rows = [
+        ProseEditorModel.objects.create(
+            description=f"<h2>Title {i}</h2><p>Hello <strong>world</strong>&nbsp;{i}</p>"
+        )
+        for i in range(7)
+    ]
+    ProseEditorModel.objects.create(description="")
+    rows.append(SanitizedProseEditorModel.objects.create(description="<p>Other</p>"))
+    return rows
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [0, 2])
+def test_export_rows(content, workers):
+    rows = list(
+        export_rows(
+            ["testapp.ProseEditorModel", "testapp.SanitizedProseEditorModel"],
+            outline=True,
+            chunk_size=3,
+            workers=workers,
+        )
+    )
+    assert len(rows) == 8
+    assert rows[1] == {
+        "model": "testapp.ProseEditorModel",
+        "pk": content[1].pk,
+        "field": "description",
+        "html": "<h2>Title 1</h2><p>Hello <strong>world</strong>&nbsp;1</p>",
+        "text": "Title 1 Hello world 1",
+        "outline": [{"level": 2, "text": "Title 1"}],
+    }
+    assert [row["pk"] for row in rows[:7]] == [obj.pk for obj in content[:7]]
+    assert rows[7] == {
+        "model": "testapp.SanitizedProseEditorModel",
+        "pk": content[7].pk,
+        "field": "description",
+        "html": "<p>Other</p>",
+        "text": "Other",
+        "outline": [],
+    }
+
+
+@pytest.mark.django_db
+def test_command(content, tmp_path):
+    stdout = StringIO()
+    call_command(
+        "prose_export",
+        "testapp.SanitizedProseEditorModel",
+        "--workers=0",
+        stdout=stdout,
+    )
+    lines = stdout.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {
+            "model": "testapp.SanitizedProseEditorModel",
+            "pk": content[7].pk,
+            "field": "description",
+            "html": "<p>Other</p>",
+            "text": "Other",
+        }
+    ]
+
+    output = tmp_path / "export.jsonl"
+    call_command(
+        "prose_export",
+        "testapp.ProseEditorModel",
+        "--outline",
+        "--workers=1",
+        f"--output={output}",
+    )
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(rows) == 7
+    assert rows[0]["outline"] == [{"level": 2, "text": "Title 0"}]
+
+    with pytest.raises(CommandError):
+        call_command("prose_export", "testapp.Unknown", stdout=StringIO())
@@ -0,0 +1,71 @@
+from django.forms import modelformset_factory
+from django.test import SimpleTestCase, TestCase
+
+from django_prose_editor.fields import ProseEditorFormField
+from testapp.models import ConfigurableProseEditorModel
+
+
+class HasChangedTest(SimpleTestCase):
+    def test_cosmetic_differences(self):
+        field = ProseEditorFormField(extensions={"Bold": True}, sanitize=True)
+        for initial, data in [
+            ("<p>a</p><p>b</p>", "<p>a</p>\r\n<p>b</p>"),
+            ("<p>a<br>b</p>", "<p>a<br />b</p>"),
+            ("", "<p></p>"),
+            (None, "<p></p>"),
+            ("<ul>\n  <li><p>x</p></li>\n</ul>", "<ul><li><p>x</p></li></ul>"),
+            ("<p>a\xa0b</p>", "<p>a&nbsp;b</p>"),
+            ("<p>a</p>", "  <p>a</p>\n"),
+        ]:
+            assert not field.has_changed(initial, data), (initial, data)
+
+    def test_changes(self):
+        field = ProseEditorFormField(extensions={"Bold": True}, sanitize=True)
+        for initial, data in [
+            ("<p>a</p>", "<p>b</p>"),
+            (
+                "<p><strong>a</strong> <em>b</em></p>",
+                "<p><strong>a</strong><em>b</em></p>",
+            ),
+            ("<pre><code>x\n</code></pre>", "<pre><code>x</code></pre>"),
+            ("", "<p>a</p>"),
+            ("<p>a</p>", ""),
+        ]:
+            assert field.has_changed(initial, data), (initial, data)
+
+    def test_disabled(self):
+        field = ProseEditorFormField(disabled=True)
+        assert not field.has_changed("<p>a</p>", "<p>b</p>")
+
+
+class FormsetTest(TestCase):
+    def test_unchanged_rows_are_skipped(self):
+        objects = [
+            ConfigurableProseEditorModel.objects.create(
+                description=f"<p>Row {i}</p><p>second<br>line</p>"
+            )
+            for i in range(10)
+        ]
+        formset_class = modelformset_factory(
+            ConfigurableProseEditorModel, fields=["description"], extra=0
+        )
+        data = {
+            "form-TOTAL_FORMS": "10",
+            "form-INITIAL_FORMS": "10",
+        }
+        for i, obj in enumerate(objects):
+            data[f"form-{i}-id"] = str(obj.pk)
+            # Re-serialized by the browser
+            data[f"form-{i}-description"] = f"<p>Row {i}</p>\r\n<p>second<br/>line</p>"
+        data["form-3-description"] = "<p>Changed</p>"
+
+        formset = formset_class(
+            data, queryset=ConfigurableProseEditorModel.objects.all()
+        )
+        assert formset.is_valid()
+        assert [form.has_changed() for form in formset].count(True) == 1
+        saved = formset.save()
+        assert saved == [objects[3]]
+        assert ConfigurableProseEditorModel.objects.get(
+            pk=objects[3].pk
+        ).description == ("<p>Changed</p>")
@@ -0,0 +1,223 @@
+import io
+import struct
+import zlib
+from unittest import mock
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.test import override_settings
+
+from django_prose_editor import images
+from django_prose_editor.fields import create_sanitizer
+from django_prose_editor.images import (
+    ResponsiveImages,
+    add_image_dimensions,
+    image_dimensions,
+    read_image_size,
+    storage_name,
+)
+from django_prose_editor.rendering import render_prose
+from django_prose_editor.transforms import TransformPipeline
+from testapp.models import ImageProseEditorModel
+
+
+def png(width, height):
+    def chunk(kind, data):
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IEND", b"")
+    )
+
+
+def jpeg(width, height, orientation=None):
+    segments = [
+        b"\xff\xd8",
+        b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0" + 9 * b"\0",
+    ]
+    if orientation:
+        tiff = b"MM\0\x2a" + struct.pack(">I", 8) + struct.pack(">H", 1)
+        tiff += struct.pack(">HHIHH", 0x0112, 3, 1, orientation, 0)
+        tiff += struct.pack(">I", 0)
+        data = b"Exif\0\0" + tiff
+        segments.append(b"\xff\xe1" + struct.pack(">H", len(data) + 2) + data)
+    sof = struct.pack(">BHHB", 8, height, width, 3) + 9 * b"\0"
+    segments.append(b"\xff\xc0" + struct.pack(">H", len(sof) + 2) + sof)
+    return b"".join(segments) + b"\xff\xd9"
+
+
+def webp(width, height):
+    data = b"VP8X" + struct.pack("<I", 10) + 4 * b"\0"
+    data += (width - 1).to_bytes(3, "little") + (height - 1).to_bytes(3, "little")
+    return b"RIFF" + struct.pack("<I", len(data) + 4) + b"WEBP" + data
+
+
+@pytest.mark.parametrize(
+    ("data", "size"),
+    [
+        (png(640, 480), (640, 480)),
+        (b"GIF89a" + struct.pack("<HH", 20, 10) + 20 * b"\0", (20, 10)),
+        (jpeg(1200, 800), (1200, 800)),
+        (jpeg(1200, 800, orientation=6), (800, 1200)),
+        (jpeg(1200, 800, orientation=3), (1200, 800)),
+        (webp(300, 200), (300, 200)),
+        (b"<svg></svg>", None),
+        (b"", None),
+    ],
+)
+def test_read_image_size(data, size):
+    assert read_image_size(io.BytesIO(data)) == size
+
+
+def test_storage_name():
+    storage = FileSystemStorage(location="/tmp", base_url="/media/")
+    assert storage_name("/media/a%20b.png", storage) == "a b.png"
+    assert storage_name("/media/a.png?v=1", storage) == "a.png"
+    assert storage_name("/static/a.png", storage) is None
+    assert storage_name("https://example.com/media/a.png", storage) is None
+
+    storage = FileSystemStorage(location="/tmp", base_url="https://cdn.com/media/")
+    assert storage_name("https://cdn.com/media/a.png", storage) == "a.png"
+    assert storage_name("/media/a.png", storage) is None
+
+
+@pytest.fixture
+def storage(tmp_path):
+    images.dimensions_cache.clear()
+    storage = FileSystemStorage(location=tmp_path, base_url="/media/")
+    storage.save("a.png", ContentFile(png(640, 480)))
+    storage.save("b.jpg", ContentFile(jpeg(100, 50)))
+    storage.save("broken.png", ContentFile(b"nothing"))
+    yield storage
+    images.dimensions_cache.clear()
+
+
+def test_image_dimensions(storage):
+    srcs = ["/media/a.png", "/media/b.jpg", "/media/broken.png", "/media/missing.png"]
+    with mock.patch.object(storage, "open", wraps=storage.open) as open:
+        assert image_dimensions(srcs, storage=storage) == {
+            "/media/a.png": (640, 480),
+            "/media/b.jpg": (100, 50),
+        }
+        assert open.call_count == 4
+
+        # Only successful lookups are cached
+        storage.save("missing.png", ContentFile(png(10, 20)))
+        assert image_dimensions(srcs, storage=storage) == {
+            "/media/a.png": (640, 480),
+            "/media/b.jpg": (100, 50),
+            "/media/missing.png": (10, 20),
+        }
+        assert open.call_count == 6
+
+    # The same URL in another storage is another file
+    other = FileSystemStorage(location=storage.location + "-other", base_url="/media/")
+    other.save("a.png", ContentFile(png(32, 16)))
+    assert image_dimensions(["/media/a.png"], storage=other) == {
+        "/media/a.png": (32, 16)
+    }
+
+
+def test_add_image_dimensions(storage):
+    html = (
+        '<p><img src="/media/a.png" alt="a"></p>'
+        '<figure><img src="/media/b.jpg" width="200"></figure>'
+        '<p><img src="/media/a.png" width="10" height="10"></p>'
+        '<p><img src="https://example.com/a.png"></p>'
+    )
+    assert add_image_dimensions(html, storage=storage) == (
+        '<p><img src="/media/a.png" alt="a" width="640" height="480"></p>'
+        '<figure><img src="/media/b.jpg" width="200" height="100"></figure>'
+        '<p><img src="/media/a.png" width="10" height="10"></p>'
+        '<p><img src="https://example.com/a.png"></p>'
+    )
+    assert add_image_dimensions("<p>No images</p>", storage=storage) == (
+        "<p>No images</p>"
+    )
+
+
+@pytest.mark.django_db
+def test_field(tmp_path):
+    images.dimensions_cache.clear()
+    with override_settings(MEDIA_ROOT=tmp_path, MEDIA_URL="/media/"):
+        default_storage.save("a.png", ContentFile(png(64, 48)))
+        instance = ImageProseEditorModel.objects.create(
+            description='<figure><img src="/media/a.png"></figure>'
+        )
+    assert instance.description == (
+        '<figure><img src="/media/a.png" width="64" height="48"></figure>'
+    )
+    images.dimensions_cache.clear()
+
+
+def thumbnail(src, width):
+    if src.startswith("/media/"):
+        return f"/thumbs/{width}{src}"
+    return None
+
+
+def test_responsive_images():
+    pipeline = TransformPipeline([ResponsiveImages(thumbnail=thumbnail)])
+    assert pipeline('<p><img src="/media/a.jpg" width="1000" height="500"></p>') == (
+        '<p><img src="/media/a.jpg" width="1000" height="500" loading="lazy"'
+        ' decoding="async" srcset="/thumbs/480/media/a.jpg 480w,'
+        ' /thumbs/960/media/a.jpg 960w, /media/a.jpg 1000w" sizes="100vw"></p>'
+    )
+    # No intrinsic width, no thumbnails, existing srcset and loading
+    assert pipeline(
+        '<img src="/media/a.jpg" sizes="50vw">'
+        '<img src="https://example.com/a.jpg">'
+        '<img src="/media/b.jpg" srcset="/b.jpg 1x" loading="eager">'
+    ) == (
+        '<img src="/media/a.jpg" sizes="50vw" loading="lazy" decoding="async"'
+        ' srcset="/thumbs/480/media/a.jpg 480w, /thumbs/960/media/a.jpg 960w,'
+        ' /thumbs/1440/media/a.jpg 1440w">'
+        '<img src="https://example.com/a.jpg" loading="lazy" decoding="async">'
+        '<img src="/media/b.jpg" srcset="/b.jpg 1x" loading="eager"'
+        ' decoding="async">'
+    )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+def test_render_responsive_images():
+    html = '<img src="/media/a.jpg" width="300">'
+    options = {
+        "widths": [200],
+        "sizes": "(min-width: 800px) 50vw, 100vw",
+        "thumbnail": "testapp.test_images.thumbnail",
+    }
+    with override_settings(DJANGO_PROSE_EDITOR_RESPONSIVE_IMAGES=options):
+        assert render_prose(html, transforms=["responsive_images"]) == (
+            '<img src="/media/a.jpg" width="300" loading="lazy" decoding="async"'
+            ' srcset="/thumbs/200/media/a.jpg 200w, /media/a.jpg 300w"'
+            ' sizes="(min-width: 800px) 50vw, 100vw">'
+        )
+
+    # Neither the pipeline nor the cached result are stale
+    options["widths"] = [100, 200]
+    with override_settings(DJANGO_PROSE_EDITOR_RESPONSIVE_IMAGES=options):
+        assert render_prose(html, transforms=["responsive_images"]) == (
+            '<img src="/media/a.jpg" width="300" loading="lazy" decoding="async"'
+            ' srcset="/thumbs/100/media/a.jpg 100w, /thumbs/200/media/a.jpg 200w,'
+            ' /media/a.jpg 300w" sizes="(min-width: 800px) 50vw, 100vw">'
+        )
+
+
+def test_sanitizer_allows_responsive_attributes():
+    sanitize = create_sanitizer({"Image": True})
+    html = '<img src="/a.jpg" sizes="100vw" loading="lazy" decoding="async">'
+    assert sanitize(html) == html
+    # srcset is only generated when rendering
+    assert sanitize('<img src="/a.jpg" srcset="javascript:x 480w">') == (
+        '<img src="/a.jpg">'
+    )
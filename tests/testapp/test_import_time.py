@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# Generous upper bound for the cumulative import time of each module in
+# microseconds, excluding Django itself. The point is catching regressions
+# such as importing the admin or building media objects at import time.
+MAX_IMPORT_TIME = 50_000
+
+SCRIPT = """
+import json, sys
+import django.conf, django.db.models, django.forms
+import django_prose_editor.{module}
+print(json.dumps(sorted(
+    name for name in ("django.contrib.admin", "django_prose_editor.widgets", "js_asset")
+    if name in sys.modules
+)))
+"""
+
+
+def import_module(module):
+    env = os.environ.copy()
+    env.pop("DJANGO_SETTINGS_MODULE", None)
+    # Write bytecode first so that compilation isn't measured
+    subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(module=module)],
+        check=True,
+        capture_output=True,
+        env=env,
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT.format(module=module)],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _self, cumulative, name = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                timings[name.strip()] = int(cumulative)
+    return timings, json.loads(result.stdout)
+
+
+@pytest.mark.parametrize("module", ["fields", "config", "sanitized"])
+def test_import_time(module):
+    timings, loaded = import_module(module)
+
+    assert loaded == []
+    assert timings[f"django_prose_editor.{module}"] < MAX_IMPORT_TIME
+
+
+def test_lazy_media():
+    from js_asset import importmap  # noqa: PLC0415
+
+    from django_prose_editor import widgets  # noqa: PLC0415
+
+    assert widgets.prose_editor_admin_media is widgets.prose_editor_admin_media
+    assert "django_prose_editor/editor.js" in str(widgets.prose_editor_media())
+    assert "django-prose-editor/configurable" in str(importmap)
+    with pytest.raises(AttributeError):
+        widgets.prose_editor_unknown  # noqa: B018
@@ -0,0 +1,157 @@
+import csv
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from django_prose_editor import importer
+from django_prose_editor.importer import (
+    InvalidRecord,
+    import_records,
+    read_csv,
+    read_directory,
+    read_jsonl,
+    read_source,
+)
+from testapp.models import StatisticsProseEditorModel
+
+
+RECORDS = [
+    {"description": "<p>Hello <b>world</b></p>"},
+    {"description": '<p onclick="evil()">Click <script>x</script>me</p>\r\n'},
+    {"description": "<script>only()</script>"},
+    {"description": ""},
+    {"other": "<p>x</p>"},
+    {"description": '<p><a href="https://example.com">Link</a></p>'},
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [0, 2])
+def test_import_records(workers):
+    stats = import_records(
+        iter([*RECORDS, InvalidRecord("invalid JSON")]),
+        "testapp.StatisticsProseEditorModel.description",
+        batch_size=2,
+        workers=workers,
+    )
+    assert (stats.read, stats.imported, stats.rejected, stats.modified) == (7, 3, 4, 2)
+    assert stats.reasons == {
+        "empty after sanitization": 1,
+        "no content": 2,
+        "invalid JSON": 1,
+    }
+    assert stats.removed > 0
+    assert "7 records read, 3 imported, 4 rejected" in str(stats)
+    # The sanitizer of the current process is passed explicitly
+    assert importer._sanitize is None
+
+    rows = list(
+        StatisticsProseEditorModel.objects.order_by("pk").values_list(
+            "description", "description_stats__words"
+        )
+    )
+    assert rows == [
+        ("<p>Hello world</p>", 2),
+        ("<p>Click me</p>", 2),
+        ('<p><a href="https://example.com">Link</a></p>', 1),
+    ]
+
+
+def test_read_source(tmp_path):
+    (tmp_path / "pages" / "sub").mkdir(parents=True)
+    (tmp_path / "pages" / "a.html").write_text("<p>A</p>")
+    (tmp_path / "pages" / "sub" / "b.html").write_text("<p>B</p>")
+    (tmp_path / "pages" / "c.txt").write_text("ignored")
+    assert list(
+        read_directory(tmp_path / "pages", key="content", filename_key="slug")
+    ) == [
+        {"content": "<p>A</p>", "slug": "a"},
+        {"content": "<p>B</p>", "slug": "sub/b"},
+    ]
+
+    (tmp_path / "data.csv").write_text('description,x\n"<p>a, b</p>",1\n')
+    assert list(read_source(tmp_path / "data.csv", key="description")) == [
+        {"description": "<p>a, b</p>", "x": "1"}
+    ]
+
+    with pytest.raises(ValueError, match="Unknown import format"):
+        read_source(tmp_path / "data.xml", key="description")
+
+
+def test_read_large_csv(tmp_path):
+    html = "<p>" + "x" * 200_000 + "</p>"
+    (tmp_path / "data.csv").write_text(f"description\n{html}\n")
+    limit = csv.field_size_limit()
+    assert list(read_csv(tmp_path / "data.csv")) == [{"description": html}]
+    assert csv.field_size_limit() == limit
+
+    with pytest.raises(csv.Error, match="field limit"):
+        list(read_csv(tmp_path / "data.csv", field_size_limit=1000))
+
+
+def test_read_invalid_jsonl(tmp_path):
+    (tmp_path / "data.jsonl").write_text(
+        '{"description": "<p>a</p>"}\n{"description": \n[1]\n\n{"x": 1}\n'
+    )
+    assert list(read_jsonl(tmp_path / "data.jsonl")) == [
+        {"description": "<p>a</p>"},
+        InvalidRecord("invalid JSON"),
+        InvalidRecord("not a JSON object"),
+        {"x": 1},
+    ]
+
+
+@pytest.mark.django_db
+def test_command(tmp_path):
+    source = tmp_path / "data.jsonl"
+    source.write_text(
+        "\n".join(json.dumps(record) for record in RECORDS) + "\n{broken\n"
+    )
+
+    stdout = StringIO()
+    call_command(
+        "prose_import",
+        "testapp.StatisticsProseEditorModel.description",
+        str(source),
+        "--workers=0",
+        stdout=stdout,
+    )
+    assert "7 records read, 3 imported, 4 rejected" in stdout.getvalue()
+    assert "Rejected (no content): 2" in stdout.getvalue()
+    assert "Rejected (invalid JSON): 1" in stdout.getvalue()
+    assert StatisticsProseEditorModel.objects.count() == 3
+
+    (tmp_path / "html").mkdir()
+    (tmp_path / "html" / "a.html").write_text("<p>From a file</p>")
+    call_command(
+        "prose_import",
+        "testapp.StatisticsProseEditorModel.description",
+        str(tmp_path / "html"),
+        "--workers=0",
+        stdout=StringIO(),
+    )
+    assert StatisticsProseEditorModel.objects.filter(
+        description="<p>From a file</p>"
+    ).exists()
+
+    (tmp_path / "data.csv").write_text(f"description\n<p>{'x' * 2000}</p>\n")
+    with (
+        patch.object(importer, "CSV_FIELD_SIZE_LIMIT", 1000),
+        pytest.raises(CommandError, match="field limit"),
+    ):
+        call_command(
+            "prose_import",
+            "testapp.StatisticsProseEditorModel.description",
+            str(tmp_path / "data.csv"),
+            "--workers=0",
+        )
+
+    with pytest.raises(CommandError):
+        call_command("prose_import", "testapp.ProseEditorModel.unknown", str(source))
+    with pytest.raises(CommandError):
+        call_command(
+            "prose_import", "testapp.StatisticsProseEditorModel.description", "x.xml"
+        )
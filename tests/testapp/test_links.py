@@ -0,0 +1,171 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from django_prose_editor.links import (
+    LinkLocation,
+    _cache_key,
+    check_links,
+    collect_links,
+)
+from testapp.models import ProseEditorModel, SanitizedProseEditorModel
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    active = 0
+    max_active = 0
+    requests = None
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append((self.command, self.path))
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.05)
+            if self.path == "/no-head" and self.command == "HEAD":
+                status = 405
+            elif self.path == "/redirect":
+                self.send_response(302)
+                self.send_header("Location", "/ok")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            elif self.path == "/missing":
+                status = 404
+            else:
+                status = 200
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    do_HEAD = do_GET = respond  # noqa: N815
+
+
+@pytest.fixture
+def server():
+    StubHandler.requests = []
+    StubHandler.max_active = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    cache.clear()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    cache.clear()
+
+
+def test_check_links(server):
+    urls = [
+        f"{server}/ok",
+        f"{server}/missing",
+        f"{server}/no-head",
+        f"{server}/redirect",
+        "http://127.0.0.1:1/refused",
+    ]
+    results = check_links(urls, timeout=5)
+    assert {url: result.ok for url, result in results.items()} == {
+        f"{server}/ok": True,
+        f"{server}/missing": False,
+        f"{server}/no-head": True,
+        f"{server}/redirect": True,
+        "http://127.0.0.1:1/refused": False,
+    }
+    assert results[f"{server}/missing"].status == 404
+    assert results["http://127.0.0.1:1/refused"].error
+
+    # Responses are cached, errors aren't
+    count = len(StubHandler.requests)
+    assert check_links(urls) == results
+    assert len(StubHandler.requests) == count
+    assert cache.get_many([_cache_key(url) for url in urls]).keys() == {
+        _cache_key(url) for url in urls[:4]
+    }
+
+    # ... unless caching is disabled
+    check_links([f"{server}/ok"], ttl=0)
+    assert len(StubHandler.requests) == count + 1
+
+
+def test_per_host_limit(server):
+    urls = [f"{server}/slow/{i}" for i in range(12)]
+    results = check_links(urls, per_host=3, ttl=0)
+    assert all(result.ok for result in results.values())
+    assert 1 < StubHandler.max_active <= 3
+
+
+def test_concurrency_limit(server):
+    # More requests than allowed concurrently don't time out waiting for a
+    # connection
+    urls = [f"{server}/slow/{i}" for i in range(12)]
+    results = check_links(urls, concurrency=2, per_host=10, timeout=1, ttl=0)
+    assert all(result.ok for result in results.values())
+    assert 1 < StubHandler.max_active <= 2
+
+
+@pytest.mark.django_db
+def test_collect_links():
+    first = ProseEditorModel.objects.create(
+        description='<p><a href="https://example.com/#a">a</a>'
+        '<a href="https://example.com/#b">b</a> <a href="mailto:a@example.com">'
+        'm</a> <a href="/relative">r</a></p>'
+    )
+    second = SanitizedProseEditorModel.objects.create(
+        description='<p><a href="https://example.com/">a</a></p>'
+    )
+    ProseEditorModel.objects.create(description="")
+
+    assert collect_links(
+        ["testapp.ProseEditorModel", "testapp.SanitizedProseEditorModel"]
+    ) == {
+        "https://example.com/": [
+            LinkLocation("testapp.ProseEditorModel", first.pk, "description"),
+            LinkLocation("testapp.SanitizedProseEditorModel", second.pk, "description"),
+        ],
+    }
+    assert set(collect_links(["testapp"], base_url="https://example.org/")) == {
+        "https://example.com/",
+        "https://example.org/relative",
+    }
+
+
+@pytest.mark.django_db
+def test_command(server):
+    ok = ProseEditorModel.objects.create(description=f'<a href="{server}/ok">ok</a>')
+    broken = ProseEditorModel.objects.create(
+        description=f'<a href="{server}/missing">x</a>'
+    )
+
+    stdout = StringIO()
+    call_command("prose_check_links", "testapp.ProseEditorModel", stdout=stdout)
+    output = stdout.getvalue()
+    assert (
+        f"testapp.ProseEditorModel pk={broken.pk} description: {server}/missing (404)"
+        in output
+    )
+    assert f"pk={ok.pk}" not in output
+    assert "2 links checked, 1 broken." in output
+
+    stdout = StringIO()
+    call_command(
+        "prose_check_links", "testapp.ProseEditorModel", "--all", stdout=stdout
+    )
+    assert (
+        f"testapp.ProseEditorModel pk={ok.pk} description: {server}/ok (200)"
+        in stdout.getvalue()
+    )
@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from django_prose_editor.profiling import collect_timings, measure
+from testapp.models import ConfigurableProseEditorModel
+
+
+class MeasureTest(SimpleTestCase):
+    def test_measure(self):
+        with measure("sanitize"):
+            pass
+
+        with collect_timings() as timings:
+            with measure("sanitize"):
+                pass
+            with measure("sanitize"):
+                pass
+
+        assert list(timings) == ["sanitize"]
+        assert timings["sanitize"][0] >= 0
+        assert timings["sanitize"][1] == 2
+
+
+@override_settings(
+    MIDDLEWARE=[
+        "django_prose_editor.middleware.ServerTimingMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+)
+class ServerTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+    def test_render(self):
+        with self.assertLogs("django_prose_editor.timing", "INFO") as logs:
+            response = self.client.get(
+                "/admin/testapp/configurableproseeditormodel/add/"
+            )
+
+        header = response["Server-Timing"]
+        assert "prose-widget;dur=" in header
+        assert "prose-media;dur=" in header
+        assert "prose-sanitize" not in header
+
+        assert len(logs.records) == 1
+        assert set(logs.records[0].prose_timings) == {"widget", "media"}
+
+    def test_save(self):
+        response = self.client.post(
+            "/admin/testapp/configurableproseeditormodel/add/",
+            {"description": "<p>Hello <script>World</script></p>"},
+        )
+        assert response.status_code == 302
+        assert "prose-sanitize;dur=" in response["Server-Timing"]
+        assert ConfigurableProseEditorModel.objects.get().description == (
+            "<p>Hello </p>"
+        )
+
+    def test_no_prose_work(self):
+        response = self.client.get("/admin/")
+        assert "Server-Timing" not in response
@@ -83,3 +83,11 @@ class Test(test.TestCase):
 <script src="/static/django_prose_editor/editor.js" type="module"></script>
 <script src="/static/django_prose_editor/default.js" type="module"></script>"""
         )
+
+    def test_benchmark_page(self):
+        response = self.client.get("/benchmark/?editors=3&size=2000")
+        content = response.content.decode()
+        assert content.count("data-django-prose-editor-configurable") == 3
+        assert '<script type="importmap">' in content
+        assert content.index("importmap") < content.index("configurable.js")
+        assert len(response.context["form"].initial["content_0"]) >= 2000
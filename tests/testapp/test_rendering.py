@@ -0,0 +1,199 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from django_prose_editor import rendering
+from django_prose_editor.rendering import (
+    astream_prose,
+    render_prose,
+    stream_prose,
+    streaming_prose_response,
+)
+from django_prose_editor.transforms import AddLinkRel, HeadingIds
+
+
+class Ids(HeadingIds):
+    def __init__(self):
+        super().__init__(prefix="ids-")
+
+
+class Rel(AddLinkRel):
+    pass
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class RenderProseTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_render(self):
+        html = '<p><a href="/">Hello</a> <img src="a.png"></p>'
+        assert render_prose(html) == html
+        assert render_prose(html, transforms=["noopener", "lazy_images"]) == (
+            '<p><a href="/" rel="noopener">Hello</a>'
+            ' <img src="a.png" loading="lazy"></p>'
+        )
+        assert render_prose("") == ""
+
+    def test_excerpt(self):
+        assert (
+            render_prose("<p>One <strong>two</strong> three &amp; four</p>", excerpt=3)
+            == "One two three ..."
+        )
+        assert render_prose("<p>&lt;script&gt;</p>", excerpt=3) == "&lt;script&gt;"
+
+    def test_unknown_transform(self):
+        with pytest.raises(ValueError, match="Unknown render transforms: unknown"):
+            render_prose("<p>x</p>", transforms=["unknown"])
+
+    def test_cached(self):
+        html = "<h1>Title</h1>"
+        with mock.patch.object(rendering, "_render", wraps=rendering._render) as render:
+            assert render_prose(html, transforms=["heading_ids"]) == (
+                '<h1 id="title">Title</h1>'
+            )
+            assert render_prose(html, transforms=["heading_ids"]) == (
+                '<h1 id="title">Title</h1>'
+            )
+            assert render.call_count == 1
+
+            # Different options, different cache key
+            assert render_prose(html, transforms=["noopener"]) == html
+            assert render.call_count == 2
+
+            # The identity render doesn't use the cache at all
+            with mock.patch.object(rendering, "caches") as caches:
+                assert render_prose(html) == html
+            assert render.call_count == 2
+            assert not caches.mock_calls
+
+    def test_cache_key_uses_transform_classes(self):
+        html = "<h1>Title</h1>"
+        with override_settings(
+            DJANGO_PROSE_EDITOR_RENDER_TRANSFORMS={
+                "custom": "testapp.test_rendering.Ids"
+            }
+        ):
+            assert render_prose(html, transforms=["custom"]) == (
+                '<h1 id="ids-title">Title</h1>'
+            )
+        # The same name pointing to another class doesn't return stale results
+        with override_settings(
+            DJANGO_PROSE_EDITOR_RENDER_TRANSFORMS={
+                "custom": "testapp.test_rendering.Rel"
+            }
+        ):
+            assert render_prose(html, transforms=["custom"]) == html
+
+    @override_settings(DJANGO_PROSE_EDITOR_RENDER_CACHE=False)
+    def test_uncached(self):
+        with mock.patch.object(rendering, "_render", wraps=rendering._render) as render:
+            render_prose("<p>x</p>", transforms=["noopener"])
+            render_prose("<p>x</p>", transforms=["noopener"])
+            assert render.call_count == 2
+
+    def test_template_tag(self):
+        template = Template(
+            '{% load prose_editor %}{% prose_render html "noopener" %}|'
+            "{% prose_render html excerpt=1 %}"
+        )
+        assert template.render(Context({"html": '<p><a href="/">A</a> B</p>'})) == (
+            '<p><a href="/" rel="noopener">A</a> B</p>|A ...'
+        )
+
+
+@override_settings(DJANGO_PROSE_EDITOR_RENDER_CACHE=False)
+class StreamProseTest(SimpleTestCase):
+    html = "".join(
+        f'<h2>Section</h2><p>Paragraph {i} <a href="/{i}">link</a></p>'
+        for i in range(50)
+    )
+    transforms = ("heading_ids", "noopener")
+
+    def test_stream(self):
+        chunks = list(
+            stream_prose(self.html, transforms=self.transforms, chunk_size=500)
+        )
+        assert len(chunks) > 5
+        assert all(len(chunk) >= 500 for chunk in chunks[:-1])
+        # Heading IDs stay unique across chunks
+        assert "".join(chunks) == render_prose(self.html, transforms=self.transforms)
+        assert 'id="section-49"' in chunks[-1]
+
+        assert list(stream_prose("")) == []
+        assert list(stream_prose("<p>a</p><p>b</p>")) == ["<p>a</p><p>b</p>"]
+
+    def test_astream(self):
+        async def collect():
+            return [
+                chunk
+                async for chunk in astream_prose(
+                    self.html, transforms=self.transforms, chunk_size=500
+                )
+            ]
+
+        chunks = asyncio.run(collect())
+        assert chunks == list(
+            stream_prose(self.html, transforms=self.transforms, chunk_size=500)
+        )
+
+    def test_response(self):
+        request = RequestFactory().get("/")
+        for asynchronous in [False, True]:
+            response = streaming_prose_response(
+                request,
+                "article.html",
+                {"title": "Title"},
+                self.html,
+                transforms=self.transforms,
+                asynchronous=asynchronous,
+            )
+            assert response.streaming
+            assert response.is_async == asynchronous
+            if asynchronous:
+
+                async def collect(response=response):
+                    return [chunk async for chunk in response.streaming_content]
+
+                chunks = asyncio.run(collect())
+            else:
+                chunks = list(response.streaming_content)
+            assert chunks[0].startswith(b"<!DOCTYPE html>")
+            assert chunks[0].endswith(b"<article>")
+            assert chunks[-1].startswith(b"</article>")
+            assert b"".join(chunks).decode() == (
+                "<!DOCTYPE html>\n<html>\n<head><title>Title</title></head>\n"
+                f"<body><article>{render_prose(self.html, transforms=self.transforms)}"
+                "</article></body>\n</html>\n"
+            )
+
+    @override_settings(
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "OPTIONS": {
+                    "loaders": [
+                        (
+                            "django.template.loaders.locmem.Loader",
+                            {"twice.html": "{{ prose }}<hr>{{ prose }}"},
+                        )
+                    ]
+                },
+            }
+        ]
+    )
+    def test_response_marker_count(self):
+        request = RequestFactory().get("/")
+        with pytest.raises(ImproperlyConfigured, match="not 2 times"):
+            streaming_prose_response(request, "twice.html", {}, self.html)
+        with pytest.raises(ImproperlyConfigured, match="not 0 times"):
+            streaming_prose_response(
+                request, "twice.html", {}, self.html, context_name="content"
+            )
@@ -0,0 +1,254 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+
+from django_prose_editor import images
+from django_prose_editor.replace import Replacer, _write, find_and_replace
+from django_prose_editor.stats import content_statistics
+from testapp.models import (
+    BlobProseEditorModel,
+    ImageProseEditorModel,
+    RevisionedProseEditorModel,
+    StatisticsProseEditorModel,
+)
+from testapp.test_images import png
+
+
+HTML = (
+    '<p>Visit <a href="https://old.example.com/a" title="old.example.com">'
+    "old.example.com</a> &amp; strong <strong>old</strong>.</p>"
+    '<p><img src="https://old.example.com/i.png" alt="old"></p>'
+)
+
+
+def test_replacer_modes():
+    replacer = Replacer("old.example.com", "new.example.com")
+    html, matches = replacer(HTML)
+    assert matches == 4
+    assert "old.example.com" not in html
+
+    html, matches = Replacer("old.example.com", "new", mode="text")(HTML)
+    assert matches == 1
+    assert '<a href="https://old.example.com/a" title="old.example.com">new</a>' in html
+
+    html, matches = Replacer("old.example.com", "new", mode="attributes")(HTML)
+    assert matches == 3
+    assert '<a href="https://new/a" title="new">old.example.com</a>' in html
+
+    # Markup is never touched, text is escaped
+    html, matches = Replacer("strong", "<em>", mode="text")(HTML)
+    assert matches == 1
+    assert "&amp; &lt;em&gt; <strong>old</strong>" in html
+    assert Replacer("&", "and")(HTML)[0].count("&amp;") == 0
+
+    # Regular expressions and case-insensitive search
+    html, matches = Replacer(r"OLD\.(\w+)", r"new.\1", regex=True, ignore_case=True)(
+        HTML
+    )
+    assert matches == 4
+    assert "new.example.com" in html
+
+    assert Replacer("missing", "x")(HTML) == (HTML, 0)
+    with pytest.raises(ValueError, match="must not be empty"):
+        Replacer("", "x")
+    with pytest.raises(ValueError, match="Unknown mode"):
+        Replacer("x", "y", mode="everything")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [0, 2])
+def test_find_and_replace(workers):
+    StatisticsProseEditorModel.objects.bulk_create(
+        StatisticsProseEditorModel(description=html)
+        for html in [HTML, "<p>Nothing to see</p>", "", HTML] * 3
+    )
+
+    stats = find_and_replace(
+        "old",
+        "new new",
+        labels=["testapp.StatisticsProseEditorModel"],
+        dry_run=True,
+        chunk_size=2,
+        workers=workers,
+    )
+    field_stats = stats["testapp.StatisticsProseEditorModel.description"]
+    assert (field_stats.rows, field_stats.changed, field_stats.matches) == (9, 6, 36)
+    assert StatisticsProseEditorModel.objects.filter(description=HTML).count() == 6
+
+    stats = find_and_replace(
+        "old",
+        "new new",
+        labels=["testapp.StatisticsProseEditorModel"],
+        chunk_size=2,
+        workers=workers,
+    )
+    assert stats["testapp.StatisticsProseEditorModel.description"].changed == 6
+    assert not StatisticsProseEditorModel.objects.filter(
+        description__contains="old"
+    ).exists()
+    # The statistics are updated too
+    instance = StatisticsProseEditorModel.objects.filter(
+        description__contains="new"
+    ).first()
+    assert instance.description_stats == content_statistics(instance.description)
+    assert instance.description_stats != content_statistics(HTML)
+
+
+@pytest.mark.django_db
+def test_sanitize_and_transform():
+    instance = StatisticsProseEditorModel.objects.create(description=HTML)
+
+    find_and_replace(
+        "https:",
+        "javascript:",
+        labels=["testapp.StatisticsProseEditorModel"],
+        mode="attributes",
+        workers=0,
+    )
+    instance.refresh_from_db()
+    assert "javascript:" not in instance.description
+    assert '<a title="old.example.com">' in instance.description
+    assert instance.description_stats == content_statistics(instance.description)
+
+
+@pytest.mark.django_db
+def test_image_dimensions(tmp_path):
+    images.dimensions_cache.clear()
+    with override_settings(MEDIA_ROOT=tmp_path, MEDIA_URL="/media/"):
+        default_storage.save("new.png", ContentFile(png(64, 48)))
+        ImageProseEditorModel.objects.bulk_create(
+            [ImageProseEditorModel(description='<p><img src="/media/old.png"></p>')]
+        )
+
+        find_and_replace(
+            "old.png",
+            "new.png",
+            labels=["testapp.ImageProseEditorModel"],
+            workers=0,
+        )
+    assert ImageProseEditorModel.objects.get().description == (
+        '<p><img src="/media/new.png" width="64" height="48"></p>'
+    )
+    images.dimensions_cache.clear()
+
+
+@pytest.mark.django_db
+def test_concurrent_changes():
+    field = StatisticsProseEditorModel._meta.get_field("description")
+    first, second, third = StatisticsProseEditorModel.objects.bulk_create(
+        StatisticsProseEditorModel(description="<p>old</p>") for _ in range(3)
+    )
+    # Changed after the values have been read
+    StatisticsProseEditorModel.objects.filter(pk=second.pk).update(
+        description="<p>old and <strong>old</strong></p>"
+    )
+    StatisticsProseEditorModel.objects.filter(pk=third.pk).update(
+        description="<p>Nothing</p>"
+    )
+
+    replacer = Replacer("old", "new")
+    with transaction.atomic():
+        _write(
+            field,
+            [(obj.pk, "<p>old</p>", "<p>new</p>") for obj in (first, second, third)],
+            replacer,
+        )
+
+    assert [
+        obj.description for obj in StatisticsProseEditorModel.objects.order_by("pk")
+    ] == ["<p>new</p>", "<p>new and <strong>new</strong></p>", "<p>Nothing</p>"]
+
+
+@pytest.mark.django_db
+def test_signals():
+    blob = BlobProseEditorModel.objects.create(description="<p>old</p>")
+    revisioned = RevisionedProseEditorModel.objects.create(description="<p>old</p>")
+
+    find_and_replace(
+        "old",
+        "new",
+        labels=["testapp.BlobProseEditorModel", "testapp.RevisionedProseEditorModel"],
+        workers=0,
+    )
+
+    blob = BlobProseEditorModel.objects.get(pk=blob.pk)
+    assert blob.description == "<p>new</p>"
+    assert revisioned.revisions.count() == 2
+
+
+@pytest.mark.django_db
+def test_command():
+    StatisticsProseEditorModel.objects.create(description=HTML)
+
+    stdout = StringIO()
+    call_command(
+        "prose_replace",
+        "https://old.example.com/",
+        "/",
+        "testapp.StatisticsProseEditorModel",
+        "--mode=attributes",
+        "--attribute=a.href",
+        "--dry-run",
+        "--workers=0",
+        stdout=stdout,
+    )
+    assert "description: 1 matches in 1 of 1 rows" in stdout.getvalue()
+    assert "Dry run, 1 matches found" in stdout.getvalue()
+
+    call_command(
+        "prose_replace",
+        "old",
+        "new",
+        "testapp",
+        "--workers=0",
+        stdout=stdout,
+    )
+    assert "old" not in StatisticsProseEditorModel.objects.get().description
+
+    with pytest.raises(CommandError):
+        call_command("prose_replace", "(", "x", "--regex", stdout=stdout)
+    with pytest.raises(CommandError):
+        call_command("prose_replace", "x", "y", "--attribute=href", stdout=stdout)
+
+
+@pytest.mark.django_db
+def test_admin_action(client):
+    client.force_login(User.objects.create_superuser("admin", "admin@example.com"))
+    selected = StatisticsProseEditorModel.objects.create(description=HTML)
+    other = StatisticsProseEditorModel.objects.create(description=HTML)
+    url = reverse("admin:testapp_statisticsproseeditormodel_changelist")
+    data = {
+        "action": "find_and_replace_in_prose_fields",
+        "_selected_action": [selected.pk],
+    }
+
+    response = client.post(url, data)
+    assert response.status_code == 200
+    assert b'name="apply"' in response.content
+
+    response = client.post(
+        url, {**data, "apply": "1", "find": "(", "regex": "1", "mode": "all"}
+    )
+    assert response.status_code == 200
+    assert b"errorlist" in response.content
+
+    response = client.post(
+        url,
+        {**data, "apply": "1", "find": "old", "replace": "new", "mode": "text"},
+        follow=True,
+    )
+    assert [str(m) for m in response.context["messages"]] == [
+        "testapp.StatisticsProseEditorModel.description: 2 matches in 1 of 1 rows"
+    ]
+    selected.refresh_from_db()
+    other.refresh_from_db()
+    assert "old.example.com</a>" not in selected.description
+    assert 'href="https://old.example.com/a"' in selected.description
+    assert other.description == HTML
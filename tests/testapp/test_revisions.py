@@ -0,0 +1,158 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from django_prose_editor import revisions as revisions_module
+from django_prose_editor.blocks import iter_blocks
+from django_prose_editor.revisions import (
+    apply_delta,
+    compute_delta,
+    record_revision,
+    revision_diff,
+)
+from testapp.models import ProseEditorRevision, RevisionedProseEditorModel
+
+
+def document(paragraphs, changed=None):
+    return "".join(
+        f"<p>Paragraph {i}{' (changed)' if i == changed else ''}</p>"
+        for i in range(paragraphs)
+    )
+
+
+class DeltaTest(SimpleTestCase):
+    def test_blocks(self):
+        html = '<h1>a</h1><p>b<br>c</p>text<hr><ul><li><p>x</p></li></ul><img src="x">'
+        blocks = list(iter_blocks(html))
+        assert blocks == [
+            "<h1>a</h1>",
+            "<p>b<br>c</p>",
+            "text<hr>",
+            "<ul><li><p>x</p></li></ul>",
+            '<img src="x">',
+        ]
+        assert "".join(blocks) == html
+
+    def test_roundtrip(self):
+        old = ["<p>a</p>", "<p>b</p>", "<p>c</p>", "<p>d</p>"]
+        new = ["<h1>x</h1>", "<p>a</p>", "<p>c</p>", "<p>d2</p>", "<p>e</p>"]
+        delta = compute_delta(old, new)
+        assert apply_delta(old, delta) == new
+        assert ["=", 1] in delta
+        assert apply_delta(old, json.loads(json.dumps(delta))) == new
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class RevisionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_revisions(self):
+        obj = RevisionedProseEditorModel.objects.create(description=document(50))
+        for i in range(5):
+            obj.description = document(50, changed=i)
+            obj.save()
+        obj.save()  # Unchanged content doesn't create a revision
+
+        revisions = list(obj.revisions.order_by("number"))
+        assert [r.number for r in revisions] == [1, 2, 3, 4, 5, 6]
+        assert revisions[0].snapshot == document(50)
+        assert all(r.snapshot is None for r in revisions[1:])
+
+        # Deltas only contain the changed blocks
+        assert revisions[1].delta == [
+            ["-", 1],
+            ["+", ["<p>Paragraph 0 (changed)</p>"]],
+            ["=", 49],
+        ]
+
+        for i, revision in enumerate(revisions[1:]):
+            fresh = ProseEditorRevision.objects.get(pk=revision.pk)
+            assert fresh.get_content() == document(50, changed=i)
+
+    def test_snapshot_interval(self):
+        obj = RevisionedProseEditorModel.objects.create(description=document(10))
+        for i in range(5):
+            obj.description = document(10, changed=i)
+            record_revision(
+                obj, "description", ProseEditorRevision, snapshot_interval=3
+            )
+
+        assert [r.snapshot is not None for r in obj.revisions.order_by("number")] == [
+            True,
+            False,
+            False,
+            True,
+            False,
+            False,
+        ]
+        last = obj.revisions.order_by("number").last()
+        assert len(last.chain()) == 3
+        assert last.get_content() == document(10, changed=4)
+
+    def test_small_documents_use_snapshots(self):
+        obj = RevisionedProseEditorModel.objects.create(description="<p>a</p>")
+        obj.description = "<p>b</p>"
+        obj.save()
+        assert obj.revisions.get(number=2).snapshot == "<p>b</p>"
+
+    def test_unchanged_content(self):
+        obj = RevisionedProseEditorModel.objects.create(description="<p>a</p>")
+        assert record_revision(obj, "description", ProseEditorRevision) is None
+        assert obj.revisions.count() == 1
+
+    def test_concurrent_revisions(self):
+        obj = RevisionedProseEditorModel.objects.create(description="<p>a</p>")
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ProseEditorRevision.objects.create(
+                parent=obj, field_name="description", number=1, snapshot=""
+            )
+
+        real_record_revision = revisions_module._record_revision
+        calls = []
+
+        def record(*args):
+            if not calls:
+                # Another process stored revision 2 in the meantime
+                calls.append(args)
+                ProseEditorRevision.objects.create(
+                    parent=obj, field_name="description", number=2, snapshot="<p>b</p>"
+                )
+                raise IntegrityError
+            return real_record_revision(*args)
+
+        obj.description = "<p>c</p>"
+        with patch.object(revisions_module, "_record_revision", record):
+            revision = record_revision(obj, "description", ProseEditorRevision)
+
+        assert revision.number == 3
+        assert [r.get_content() for r in obj.revisions.order_by("number")] == [
+            "<p>a</p>",
+            "<p>b</p>",
+            "<p>c</p>",
+        ]
+
+    def test_diff(self):
+        obj = RevisionedProseEditorModel.objects.create(
+            description="<h1>Title</h1><p>a</p><p>b</p>"
+        )
+        obj.description = "<h1>Title</h1><p>b</p><p>c</p>"
+        obj.save()
+        old, new = obj.revisions.order_by("number")
+
+        expected = (
+            "<h1>Title</h1>"
+            '<del class="prose-diff"><p>a</p></del>'
+            "<p>b</p>"
+            '<ins class="prose-diff"><p>c</p></ins>'
+        )
+        assert revision_diff(old, new) == expected
+
+        with self.assertNumQueries(0):
+            assert revision_diff(old, new) == expected
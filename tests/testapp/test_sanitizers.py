@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+from benchmarks.bench_sanitizers import CORPUS, DOCUMENTS, allowlists, conformance
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from django_prose_editor.checks import check_sanitizer_backend
+from django_prose_editor.fields import create_sanitizer
+from django_prose_editor.sanitized import SanitizedProseEditorField
+from django_prose_editor.sanitizers import (
+    LxmlBackend,
+    Nh3Backend,
+    PythonBackend,
+    get_backend,
+)
+
+
+class SanitizerBackendTest(SimpleTestCase):
+    def test_conformance(self):
+        for name, allowlist in allowlists().items():
+            with self.subTest(allowlist=name):
+                # The pure Python backend produces the output of nh3 also for
+                # sloppy and hostile markup
+                assert conformance(allowlist, CORPUS)["python"] == []
+                # lxml repairs misnested markup differently
+                assert conformance(allowlist, DOCUMENTS).get("lxml", []) == []
+
+    def test_hostile_markup(self):
+        html = (
+            '<p onclick="alert(1)">x<script>alert(1)</script></p>'
+            '<a href="javascript:alert(1)">js</a><img src=x onerror=alert(1)>'
+        )
+        expected = '<p>x</p><a rel="noopener noreferrer">js</a><img src="x">'
+        for backend in (Nh3Backend, LxmlBackend, PythonBackend):
+            if backend.available():
+                with self.subTest(backend=backend.name):
+                    assert backend({})(html) == expected
+
+    def test_escapable_raw_text(self):
+        allowlist = {"tags": {"p", "textarea", "title"}}
+        html = "<textarea><p>x</p>&amp;&lt;b&gt;</textarea><title><p>y</p></title>"
+        expected = (
+            "<textarea>&lt;p&gt;x&lt;/p&gt;&amp;&lt;b&gt;</textarea>"
+            "<title>&lt;p&gt;y&lt;/p&gt;</title>"
+        )
+        assert PythonBackend(allowlist)(html) == expected
+        if Nh3Backend.available():
+            assert Nh3Backend(allowlist)(html) == expected
+
+    def test_misnested_markup(self):
+        # The output of the python backend is parsed into the same tree again
+        allowlist = {"tags": {"h1", "h2", "p", "strong", "table"}}
+        for html in [
+            "<p>a<strong>b<p>Next</p></strong></p>",
+            "<h1>One<h2>Two</h2></h1>",
+            "<table>text<p>x</p></table>",
+        ]:
+            with self.subTest(html=html):
+                backend = PythonBackend(allowlist)
+                assert backend(backend(html)) == backend(html)
+                if Nh3Backend.available():
+                    assert backend(html) == Nh3Backend(allowlist)(html)
+
+    def test_deeply_nested(self):
+        html = "<blockquote>" * 2000 + "x" + "</blockquote>" * 2000
+        assert PythonBackend({})(html) == html
+
+    def test_selection(self):
+        assert get_backend({"tags": {"p"}}) is Nh3Backend
+        # Options only supported by nh3
+        assert get_backend({"filter_style_properties": {"color"}}) is Nh3Backend
+
+        with override_settings(DJANGO_PROSE_EDITOR_SANITIZER_BACKEND="python"):
+            assert get_backend({"tags": {"p"}}) is PythonBackend
+            with self.assertRaisesMessage(ImproperlyConfigured, "allowed_classes"):
+                get_backend({"allowed_classes": {"p": {"x"}}})
+
+            sanitize = create_sanitizer({"Bold": True}, transforms=[])
+            assert sanitize("<p><strong>a</strong><em>b</em></p>") == (
+                "<p><strong>a</strong>b</p>"
+            )
+            assert sanitize("<p></p>") == ""
+
+            field = SanitizedProseEditorField()
+            assert field.sanitize('<a href="/" target="_blank">x</a>') == (
+                '<a href="/" target="_blank" rel="noopener noreferrer">x</a>'
+            )
+
+        with override_settings(
+            DJANGO_PROSE_EDITOR_SANITIZER_BACKEND="django_prose_editor.sanitizers.PythonBackend"
+        ):
+            assert get_backend({}) is PythonBackend
+
+    def test_nh3_only_automatic_choice(self):
+        with (
+            patch.object(Nh3Backend, "available", return_value=False),
+            self.assertRaisesMessage(ImportError, "install nh3"),
+        ):
+            get_backend({"tags": {"p"}})
+
+    def test_lxml_untrusted_input_check(self):
+        assert check_sanitizer_backend(None) == []
+        with override_settings(DJANGO_PROSE_EDITOR_SANITIZER_BACKEND="python"):
+            assert check_sanitizer_backend(None) == []
+        with override_settings(DJANGO_PROSE_EDITOR_SANITIZER_BACKEND="lxml"):
+            [warning] = check_sanitizer_backend(None)
+            assert warning.id == "django_prose_editor.W005"
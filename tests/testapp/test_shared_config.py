@@ -0,0 +1,115 @@
+import gzip
+import re
+
+from django import forms
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.forms import formset_factory
+from django.http import HttpResponse
+from django.middleware.gzip import GZipMiddleware
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from django_prose_editor.fields import ProseEditorFormField
+from django_prose_editor.middleware import SharedConfigMiddleware
+from django_prose_editor.widgets import shared_config_scope
+
+
+class Form(forms.Form):
+    content = ProseEditorFormField(extensions={"Bold": True}, sanitize=True)
+    other = ProseEditorFormField(extensions={"Italic": True}, sanitize=True)
+
+
+FormSet = formset_factory(Form, extra=5)
+
+
+def fragment(request):
+    return HttpResponse(str(FormSet()))
+
+
+class SharedConfigTest(SimpleTestCase):
+    def test_inline_without_scope(self):
+        html = str(FormSet())
+        assert html.count('data-django-prose-editor-configurable="{') == 10
+        assert "application/json" not in html
+
+    def test_shared_within_scope(self):
+        with shared_config_scope():
+            html = str(FormSet())
+
+        references = re.findall(
+            r'data-django-prose-editor-configurable="#([-\w]+)"', html
+        )
+        assert len(references) == 10
+        assert len(set(references)) == 2
+
+        scripts = re.findall(r'<script id="([-\w]+)" type="application/json">', html)
+        assert sorted(scripts) == sorted(set(references))
+
+        # The scope is reset afterwards
+        assert "application/json" not in str(Form())
+
+    def test_legacy_and_custom_presets(self):
+        class Form(forms.Form):
+            legacy = ProseEditorFormField()
+            custom = ProseEditorFormField(
+                extensions={"Bold": True}, sanitize=True, preset="custom"
+            )
+
+        with shared_config_scope():
+            html = str(Form())
+
+        assert 'data-django-prose-editor-default="#prose-editor-config-' in html
+        assert 'data-django-prose-editor-custom="{' in html
+
+
+@override_settings(
+    MIDDLEWARE=[
+        "django_prose_editor.middleware.SharedConfigMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+)
+class SharedConfigMiddlewareTest(TestCase):
+    def test_admin(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        response = self.client.get("/admin/testapp/configurableproseeditormodel/add/")
+        self.assertContains(response, 'type="application/json"', count=1)
+        self.assertContains(
+            response, 'data-django-prose-editor-configurable="#prose-editor-config-'
+        )
+
+    def test_fragments_inline_configs(self):
+        def view(request):
+            return HttpResponse(str(FormSet()))
+
+        response = SharedConfigMiddleware(view)(RequestFactory().get("/"))
+        html = response.content.decode()
+        assert 'configurable="#' not in html
+        assert html.count('data-django-prose-editor-configurable="{') == 10
+
+        def page(request):
+            return HttpResponse(f"<!DOCTYPE html>\n<html><body>{Form()}</body></html>")
+
+        html = SharedConfigMiddleware(page)(RequestFactory().get("/")).content.decode()
+        assert html.count('data-django-prose-editor-configurable="#') == 2
+
+    def test_encoded_responses(self):
+        # Compressed and undecodable responses are passed through unchanged
+        request = RequestFactory().get("/", headers={"accept-encoding": "gzip"})
+        response = SharedConfigMiddleware(GZipMiddleware(fragment))(request)
+        assert response["Content-Encoding"] == "gzip"
+        assert b'configurable="#' in gzip.decompress(response.content)
+
+        def latin1(request):
+            response = fragment(request)
+            response.content += b"\xff"
+            return response
+
+        response = SharedConfigMiddleware(latin1)(RequestFactory().get("/"))
+        assert response.content.endswith(b"\xff")
+
+        # Ordered correctly, the fragment is rewritten before compressing it
+        response = GZipMiddleware(SharedConfigMiddleware(fragment))(request)
+        html = gzip.decompress(response.content).decode()
+        assert 'configurable="#' not in html
@@ -0,0 +1,104 @@
+from django.contrib.auth.models import User
+from django.core.checks import Error
+from django.db import models
+from django.db.models import IntegerField
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
+from django.test import SimpleTestCase, TestCase
+
+from django_prose_editor.fields import ProseEditorField
+from django_prose_editor.stats import content_statistics, content_text
+from testapp.models import StatisticsProseEditorModel
+
+
+class ContentStatisticsTest(SimpleTestCase):
+    def test_statistics(self):
+        html = (
+            "<h1>Title</h1><p>Hello <strong>World</strong>, this is"
+            ' <a href="https://example.com">a link</a>.</p>'
+            '<p>Second<br>paragraph</p><img src="/media/a.png" alt="">'
+        )
+        assert content_statistics(html) == {
+            "words": 9,
+            "reading_time": 1,
+            "images": 1,
+            "links": 1,
+        }
+
+    def test_empty(self):
+        assert content_statistics("") == {
+            "words": 0,
+            "reading_time": 0,
+            "images": 0,
+            "links": 0,
+        }
+
+    def test_reading_time(self):
+        html = "<p>" + "word " * 401 + "</p>"
+        assert content_statistics(html)["reading_time"] == 3
+
+    def test_text(self):
+        assert content_text("<p>a</p><p>b &amp; c</p>") == "a b & c"
+
+
+class StatsFieldTest(TestCase):
+    def test_stats_saved(self):
+        m = StatisticsProseEditorModel(description="<p>Hello <a href='/'>World</a></p>")
+        m.full_clean()
+        m.save()
+        m.refresh_from_db()
+        assert m.description_stats == {
+            "words": 2,
+            "reading_time": 1,
+            "images": 0,
+            "links": 1,
+        }
+
+        m.description = "<p>Hello</p>"
+        m.save()
+        m.refresh_from_db()
+        assert m.description_stats["words"] == 1
+        assert m.description_stats["links"] == 0
+
+    def test_ordering(self):
+        for words in [10, 1, 9]:
+            StatisticsProseEditorModel.objects.create(
+                description=f"<p>{' word' * words}</p>"
+            )
+
+        assert [
+            m.description_stats["words"]
+            for m in StatisticsProseEditorModel.objects.order_by(
+                Cast(KT("description_stats__words"), IntegerField())
+            )
+        ] == [1, 9, 10]
+
+    def test_admin_changelist(self):
+        StatisticsProseEditorModel.objects.create(description="<p>Hello World</p>")
+        # Rows saved before the statistics field has been added
+        StatisticsProseEditorModel.objects.create(description="<p>Old</p>")
+        StatisticsProseEditorModel.objects.filter(description="<p>Old</p>").update(
+            description_stats=None
+        )
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        response = self.client.get(
+            "/admin/testapp/statisticsproseeditormodel/", {"o": "2"}
+        )
+        self.assertContains(response, '<td class="field-words">2</td>', html=True)
+
+    def test_check(self):
+        class Model(models.Model):
+            description = ProseEditorField(stats_field="missing")
+
+            class Meta:
+                app_label = "test_app_never_installed"
+
+            def __str__(self):
+                return ""
+
+        errors = Model._meta.get_field("description").check()
+        assert len(errors) == 1
+        assert isinstance(errors[0], Error)
+        assert errors[0].id == "django_prose_editor.E009"
@@ -0,0 +1,147 @@
+from django import forms
+from django.test import SimpleTestCase
+
+from django_prose_editor.fields import (
+    ProseEditorField,
+    ProseEditorFormField,
+    create_sanitizer,
+)
+from django_prose_editor.transforms import (
+    AddLinkRel,
+    HeadingIds,
+    LazyImages,
+    NormalizeNbsp,
+    Transform,
+    TransformPipeline,
+)
+
+
+class CountingTransform(Transform):
+    tags = ("p",)
+
+    def __init__(self):
+        self.calls = 0
+
+    def element(self, element):
+        self.calls += 1
+
+
+class TransformPipelineTest(SimpleTestCase):
+    def test_passthrough(self):
+        html = (
+            '<p class="x">Hello &amp; <strong>World</strong>&nbsp;&#169;</p>'
+            "<!-- comment --><br/><hr>"
+        )
+        assert TransformPipeline([CountingTransform()])(html) == html
+        assert TransformPipeline([])(html) == html
+        assert TransformPipeline([LazyImages()])("") == ""
+
+    def test_link_rel(self):
+        pipeline = TransformPipeline([AddLinkRel()])
+        assert (
+            pipeline('<a href="/?a=1&amp;b=2">x</a>')
+            == '<a href="/?a=1&amp;b=2" rel="noopener">x</a>'
+        )
+        assert (
+            pipeline('<a href="/" rel="nofollow">x</a>')
+            == '<a href="/" rel="nofollow noopener">x</a>'
+        )
+        assert (
+            pipeline('<a rel="noopener" href="/">x</a>')
+            == '<a rel="noopener" href="/">x</a>'
+        )
+
+    def test_lazy_images(self):
+        pipeline = TransformPipeline([LazyImages()])
+        assert pipeline('<img src="a.png">') == '<img src="a.png" loading="lazy">'
+        assert (
+            pipeline('<img src="a.png" loading="eager">')
+            == '<img src="a.png" loading="eager">'
+        )
+
+    def test_heading_ids(self):
+        pipeline = TransformPipeline([HeadingIds()])
+        assert pipeline(
+            "<h1>Hello <em>World</em></h1><p>x</p><h2>Hello World</h2><h2>R&amp;D</h2>"
+        ) == (
+            '<h1 id="hello-world">Hello <em>World</em></h1><p>x</p>'
+            '<h2 id="hello-world-1">Hello World</h2><h2 id="rd">R&amp;D</h2>'
+        )
+        # State isn't shared between documents
+        assert (
+            pipeline("<h1>Hello World</h1>") == '<h1 id="hello-world">Hello World</h1>'
+        )
+
+    def test_nested_elements(self):
+        pipeline = TransformPipeline([AddLinkRel(), HeadingIds()])
+        assert pipeline('<h2>See <a href="/">this</a></h2><!-- <a href="/"> -->') == (
+            '<h2 id="see-this">See <a href="/" rel="noopener">this</a></h2>'
+            '<!-- <a href="/"> -->'
+        )
+
+    def test_nbsp(self):
+        pipeline = TransformPipeline([NormalizeNbsp()])
+        assert pipeline("<p>a&nbsp;b&nbsp;&nbsp;c d&nbsp; e</p>") == (
+            "<p>a b&nbsp;&nbsp;c d&nbsp; e</p>"
+        )
+        # Non-breaking spaces next to other entities are normalized too
+        assert pipeline("<p>R&amp;&nbsp;D&nbsp;&lt;3</p>") == "<p>R&amp; D &lt;3</p>"
+
+    def test_nbsp_raw_text(self):
+        pipeline = TransformPipeline([NormalizeNbsp(), HeadingIds()])
+        assert pipeline(
+            '<p title="a&nbsp;b">a&nbsp;b</p><pre><code>a&nbsp;b</code></pre>'
+            "<p><code>a&nbsp;b</code>c&nbsp;d</p><h2>a&nbsp;<code>b&nbsp;c</code></h2>"
+            "<p>e&nbsp;f</p>"
+        ) == (
+            '<p title="a&nbsp;b">a b</p><pre><code>a&nbsp;b</code></pre>'
+            '<p><code>a&nbsp;b</code>c d</p><h2 id="a-b-c">a <code>b&nbsp;c</code></h2>'
+            "<p>e f</p>"
+        )
+
+    def test_single_pass(self):
+        counting = CountingTransform()
+        pipeline = TransformPipeline(
+            [counting, AddLinkRel(), LazyImages(), HeadingIds(), NormalizeNbsp()]
+        )
+        assert pipeline(
+            '<h1>Title</h1><p><a href="/">a&nbsp;b</a><img src="x.png"></p>'
+        ) == (
+            '<h1 id="title">Title</h1><p><a href="/" rel="noopener">a b</a>'
+            '<img src="x.png" loading="lazy"></p>'
+        )
+        assert counting.calls == 1
+
+
+class TransformIntegrationTest(SimpleTestCase):
+    def test_create_sanitizer(self):
+        sanitize = create_sanitizer(
+            {"Link": True, "Image": True}, transforms=[LazyImages()]
+        )
+        assert (
+            sanitize('<p><img src="a.png" onerror="x"></p>')
+            == '<p><img src="a.png" loading="lazy"></p>'
+        )
+        assert sanitize("<p></p>") == ""
+
+    def test_model_field(self):
+        field = ProseEditorField(
+            extensions={"Heading": True}, sanitize=True, transforms=[HeadingIds()]
+        )
+        assert field.clean("<h1>Hello</h1><script></script>", None) == (
+            '<h1 id="hello">Hello</h1>'
+        )
+
+    def test_form_field(self):
+        class Form(forms.Form):
+            content = ProseEditorFormField(
+                extensions={"Link": True},
+                sanitize=True,
+                transforms=[AddLinkRel("noopener noreferrer")],
+            )
+
+        form = Form({"content": '<p><a href="/">x</a></p>'})
+        assert form.is_valid()
+        assert form.cleaned_data["content"] == (
+            '<p><a href="/" rel="noopener noreferrer">x</a></p>'
+        )
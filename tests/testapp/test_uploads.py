@@ -0,0 +1,204 @@
+import os
+import re
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.files import locks
+from django.core.files.storage import storages
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from django_prose_editor import uploads
+from django_prose_editor.images import image_dimensions
+from testapp.test_images import png
+
+
+class UploadTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.staging = tempfile.mkdtemp()
+        self.settings = override_settings(
+            MEDIA_ROOT=self.media_root,
+            MEDIA_URL="/media/",
+            FILE_UPLOAD_TEMP_DIR=self.staging,
+        )
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.addCleanup(shutil.rmtree, self.staging)
+
+        self.url = reverse("django_prose_editor:upload")
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+    def send(self, data, start, size, *, upload="", name="image.png"):
+        return self.client.post(
+            self.url,
+            data,
+            content_type="application/octet-stream",
+            headers={
+                "Content-Range": f"bytes {start}-{start + len(data) - 1}/{size}",
+                "X-Upload-Id": upload,
+                "X-Upload-Name": name,
+            },
+        )
+
+    def upload(self, content, chunk_size=16, **kwargs):
+        upload = ""
+        for start in range(0, len(content), chunk_size):
+            response = self.send(
+                content[start : start + chunk_size],
+                start,
+                len(content),
+                upload=upload,
+                **kwargs,
+            )
+            if response.status_code != 200:
+                return response
+            upload = response.json()["upload"]
+            assert response.json()["offset"] == min(start + chunk_size, len(content))
+        return response
+
+    def test_chunked_upload(self):
+        content = png(640, 480) + b"\0" * 100
+        response = self.upload(content)
+
+        data = response.json()
+        assert data["width"] == 640
+        assert data["height"] == 480
+        assert re.match(r"/media/prose-editor/\d{4}/\d{2}/image", data["src"])
+
+        path = Path(self.media_root, data["src"].removeprefix("/media/"))
+        assert path.read_bytes() == content
+        # The dimensions are cached, the file isn't read again
+        path.unlink()
+        assert image_dimensions([data["src"]], storage=storages["default"]) == {
+            data["src"]: (640, 480)
+        }
+        # The staging file has been removed
+        assert list(Path(self.staging).rglob("*.*")) == []
+
+    def test_resume(self):
+        content = png(10, 10)
+        first = self.send(content[:10], 0, len(content)).json()
+
+        # Sending the wrong chunk returns the expected offset
+        response = self.send(content[20:], 20, len(content), upload=first["upload"])
+        assert response.status_code == 409
+        assert response.json()["offset"] == 10
+
+        response = self.send(content[10:], 10, len(content), upload=first["upload"])
+        assert response.status_code == 200
+        assert response.json()["width"] == 10
+
+    def test_concurrent_chunks(self):
+        content = png(10, 10)
+        upload = self.send(content[:10], 0, len(content)).json()["upload"]
+        user = User.objects.get()
+
+        def send():
+            request = RequestFactory().post(
+                self.url,
+                content[10:20],
+                content_type="application/octet-stream",
+                headers={
+                    "Content-Range": f"bytes 10-19/{len(content)}",
+                    "X-Upload-Id": upload,
+                    "X-Upload-Name": "image.png",
+                },
+            )
+            request.user = user
+            responses.append(uploads.upload_image(request))
+
+        # The same chunk is sent twice while the staging file is locked
+        responses = []
+        request = RequestFactory().post("/")
+        request.user = user
+        path = uploads._staging_path(request, upload)
+        with path.open("rb") as fp:
+            locks.lock(fp, locks.LOCK_EX)
+            threads = [threading.Thread(target=send) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            locks.unlock(fp)
+        for thread in threads:
+            thread.join()
+
+        assert sorted(response.status_code for response in responses) == [200, 409]
+        assert path.read_bytes() == content[:20]
+
+    def test_uploads_are_bound_to_users(self):
+        content = png(10, 10)
+        first = self.send(content[:10], 0, len(content)).json()
+
+        self.client.force_login(
+            User.objects.create_superuser("other", "other@example.com", "password")
+        )
+        response = self.send(content[10:], 10, len(content), upload=first["upload"])
+        assert response.status_code == 409
+        assert response.json()["offset"] == 0
+
+    def test_rejected_uploads(self):
+        response = self.upload(b"GIF89a" + b"\0" * 20, name="image.svg")
+        assert response.status_code == 400
+
+        response = self.upload(b"not an image", name="image.png")
+        assert response.status_code == 400
+        assert response.json()["error"] == "The file isn't a supported image."
+        assert list(Path(self.media_root).rglob("*.*")) == []
+
+        with override_settings(DJANGO_PROSE_EDITOR_UPLOADS={"max_size": 50}):
+            response = self.upload(png(10, 10) + b"\0" * 100)
+        assert response.status_code == 413
+
+        response = self.client.post(
+            self.url,
+            b"data",
+            content_type="application/octet-stream",
+            headers={"Content-Range": "bytes 5-2/10", "X-Upload-Name": "a.png"},
+        )
+        assert response.status_code == 400
+
+    def test_permissions(self):
+        self.client.force_login(User.objects.create_user("user", password="password"))
+        response = self.upload(png(10, 10))
+        assert response.status_code == 403
+
+        self.client.logout()
+        response = self.upload(png(10, 10))
+        assert response.status_code == 403
+
+        assert self.client.get(self.url).status_code == 405
+
+    def test_thumbnails(self):
+        generated = []
+        done = threading.Event()
+
+        def thumbnail(src, width):
+            generated.append((src, width))
+            if len(generated) == 2:
+                done.set()
+
+        with override_settings(
+            DJANGO_PROSE_EDITOR_RESPONSIVE_IMAGES={"thumbnail": thumbnail},
+            DJANGO_PROSE_EDITOR_UPLOADS={"thumbnail_widths": (200, 400)},
+        ):
+            data = self.upload(png(800, 600)).json()
+
+        assert done.wait(5)
+        assert generated == [(data["src"], 200), (data["src"], 400)]
+
+    def test_stale_uploads_are_removed(self):
+        stale = uploads.staging_directory() / "stale"
+        stale.write_bytes(b"partial")
+        os.utime(stale, (0, 0))
+        current = uploads.staging_directory() / "current"
+        current.write_bytes(b"partial")
+
+        self.upload(png(10, 10))
+        assert not stale.exists()
+        assert current.exists()
@@ -1,9 +1,13 @@
 from django.contrib import admin
 from django.shortcuts import render
-from django.urls import path
+from django.urls import include, path
+
+from testapp import views
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("prose-editor/", include("django_prose_editor.urls")),
     path("editor/", lambda request: render(request, "editor.html")),
+    path("benchmark/", views.benchmark),
 ]
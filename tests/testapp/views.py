@@ -0,0 +1,59 @@
+from django import forms
+from django.shortcuts import render
+from js_asset import importmap
+
+from django_prose_editor.fields import ProseEditorFormField
+
+
+BENCHMARK_EXTENSIONS = {
+    "Bold": True,
+    "Italic": True,
+    "Heading": {"levels": [2, 3]},
+    "Link": True,
+    "BulletList": True,
+    "OrderedList": True,
+    "ListItem": True,
+    "Table": True,
+}
+
+BENCHMARK_BLOCK = (
+    "<h2>Section {i}</h2><p>Lorem ipsum <strong>dolor</strong> sit amet,"
+    ' <a href="https://example.com/{i}">consectetur</a> adipiscing elit, sed'
+    " do <em>eiusmod</em> tempor incididunt ut labore et dolore magna.</p>"
+    "<ul><li><p>One</p></li><li><p>Two</p></li></ul>"
+)
+
+
+def benchmark_document(size):
+    """Return a document of approximately ``size`` characters."""
+    blocks = []
+    length = 0
+    while length < size:
+        blocks.append(BENCHMARK_BLOCK.format(i=len(blocks)))
+        length += len(blocks[-1])
+    return "".join(blocks)
+
+
+def benchmark(request):
+    """
+    Render ``editors`` prose editors containing a document of ``size``
+    characters each, see ``tests/benchmarks/bench_browser.py``
+    """
+    editors = int(request.GET.get("editors", 1))
+    document = benchmark_document(int(request.GET.get("size", 1024)))
+    form_class = type(
+        "BenchmarkForm",
+        (forms.Form,),
+        {
+            f"content_{i}": ProseEditorFormField(extensions=BENCHMARK_EXTENSIONS)
+            for i in range(editors)
+        },
+    )
+    form = form_class(initial={f"content_{i}": document for i in range(editors)})
+    # Accessing the media registers the editor modules in the importmap
+    media = form.media
+    return render(
+        request,
+        "benchmark.html",
+        {"form": form, "media": media, "importmap": importmap},
+    )